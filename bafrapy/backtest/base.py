@@ -1,11 +1,15 @@
 from abc import ABC, ABCMeta, abstractmethod
+from collections import deque
 from dataclasses import InitVar, dataclass, field
 from datetime import datetime
 from decimal import Decimal
 from enum import Enum
-from typing import ClassVar, Dict, List, OrderedDict
+from heapq import heappop, heappush
+from operator import itemgetter
+from typing import ClassVar, Dict, List, OrderedDict, Tuple
 
-from bafrapy.backtest.dataset import OHLCV, DataSet
+from bafrapy.backtest.costs import FeeModel, FeeSchedule, Liquidity, SlippageModel
+from bafrapy.backtest.dataset import ColumnarDataSet, DataSet
 from bafrapy.backtest.exceptions import (
     InvalidStateExecutedSimpleOrder,
     NewOrderNotOpen,
@@ -13,6 +17,8 @@ from bafrapy.backtest.exceptions import (
     NotEnoughQuoteToExecuteMarketOrder,
     OrderAlreadyExists,
 )
+from bafrapy.backtest.intrabar import IntrabarPath
+from bafrapy.backtest.money import OHLCV, EMoney, Normalizer
 from bafrapy.logger import LoguruLogger as log
 
 
@@ -42,6 +48,7 @@ class OrderType(Enum):
     market = 1  #: Represents a market order.
     limit = 2  #: Represents a limit order.
     stop_limit = 3  #: Represents a stop limit order.
+    stop = 4  #: Represents a stop order.
 
 
 class OrderState(Enum):
@@ -80,6 +87,11 @@ class Order(ABC):
     #: State of the order.
     state: OrderState = field(default=OrderState.pending, init=False)
 
+    #: Composite order the order belongs to, e.g. the OCO group of a bracket exit.
+    parent: "CompositeOrder" = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
     def is_open(self):
         """
         Indicates whether the order is currently open.
@@ -188,10 +200,32 @@ class CompositeOrder(Order):
     #: List of children orders.
     children_orders: List[Order] = field(default_factory=list, init=False)
 
-    def cancel_order(self):
+    def add_child(self, order: Order):
+        order.parent = self
+        self.children_orders.append(order)
+
+    def cancel_order(self, time: datetime):
         for order in self.children_orders:
             if order.state == OrderState.pending:
-                order.cancel()
+                order.cancel(time)
+
+
+@dataclass
+class OCOOrder(CompositeOrder):
+    """
+    Class to represent a one-cancels-the-other group, e.g. the take profit and stop loss
+    of a bracket. The children are the pending orders of the broker and the group is never
+    processed itself: once a child is executed, the broker cancels its siblings.
+    """
+
+    def process(self, ohlcv: OHLCV, **kwargs) -> "ResultOrder":
+        return None
+
+    def siblings(self, order: Order) -> List[Order]:
+        """
+        Get the children of the group other than ``order``.
+        """
+        return [child for child in self.children_orders if child is not order]
 
 
 class OrderExecutionCriteria(Enum):
@@ -270,9 +304,22 @@ class LimitOrder(SimpleOrder):
     def __post_init__(self):
         if self.price < 0:
             raise ValueError("price cannot be negative")
+        if self.take_profit < 0 or self.stop_loss < 0:
+            raise ValueError("take profit and stop loss cannot be negative")
+        sign = 1 if self.side == Side.buy else -1
+        if self.take_profit > 0 and sign * (self.take_profit - self.price) <= 0:
+            raise ValueError("take profit must be beyond the price on the side of profit")
+        if self.stop_loss > 0 and sign * (self.price - self.stop_loss) <= 0:
+            raise ValueError("stop loss must be beyond the price on the side of loss")
 
         log().debug(f"limit order {self.order_id} created: {self.create_time}")
 
+    def has_bracket(self) -> bool:
+        """
+        Indicates whether the execution of the order opens take profit or stop loss orders.
+        """
+        return self.take_profit > 0 or self.stop_loss > 0
+
     @property
     def required_money(self) -> Decimal:
         """
@@ -299,6 +346,83 @@ class LimitOrder(SimpleOrder):
         )
 
 
+@dataclass
+class StopOrder(SimpleOrder):
+    """
+    Class to represent a stop order. It is executed as a market order once the candle
+    reaches the stop price: a buy stop when the high is at or over it and a sell stop
+    when the low is at or under it. The execution price is the stop price, or the open
+    when the candle opens beyond it.
+    """
+
+    #: Price that triggers the order.
+    stop_price: Decimal = field(default=Decimal(0))
+
+    def __post_init__(self):
+        if self.quantity <= 0:
+            raise ValueError("ammount to buy/sell must be greater than 0")
+        if self.stop_price <= 0:
+            raise ValueError("stop price must be greater than 0")
+
+        log().debug(f"{type(self).__name__} {self.order_id} created: {self.create_time}")
+
+    def is_triggered(self, ohlcv: OHLCV) -> bool:
+        """
+        Indicates whether the candle reaches the stop price.
+        """
+        if self.side == Side.buy:
+            return ohlcv.high >= self.stop_price
+        return ohlcv.low <= self.stop_price
+
+    def required_money(self, current_ohlcv: OHLCV) -> Decimal:
+        return self.quantity * self.stop_price
+
+    def process(self, ohlcv: OHLCV, **kwargs) -> "ResultOrder":
+        if not self.is_triggered(ohlcv):
+            return None
+
+        if self.side == Side.buy:
+            executed_price = max(ohlcv.open, self.stop_price)
+        else:
+            executed_price = min(ohlcv.open, self.stop_price)
+        self.state = OrderState.executed
+        return ResultOrder(
+            trade=Trade(self, self.quantity, executed_price, ohlcv.timestamp)
+        )
+
+
+@dataclass
+class StopLimitOrder(StopOrder):
+    """
+    Class to represent a stop limit order. Once the candle reaches the stop price, the
+    order is executed by opening a limit order at its price. The limit order has no id
+    until the broker registers it.
+    """
+
+    #: Price of the limit order opened by the stop.
+    price: Decimal = field(default=Decimal(0))
+
+    def __post_init__(self):
+        if self.price <= 0:
+            raise ValueError("price must be greater than 0")
+        super().__post_init__()
+
+    def required_money(self, current_ohlcv: OHLCV) -> Decimal:
+        return self.quantity * self.price
+
+    def process(self, ohlcv: OHLCV, **kwargs) -> "ResultOrder":
+        if not self.is_triggered(ohlcv):
+            return None
+
+        self.state = OrderState.executed
+        self.executed_time = ohlcv.timestamp
+        return ResultOrder(
+            order=LimitOrder(
+                None, ohlcv.timestamp, self.side, self.quantity, self.price
+            )
+        )
+
+
 @dataclass
 class Trade:
     """
@@ -310,6 +434,9 @@ class Trade:
     executed_price: Decimal
     executed_time: datetime
 
+    #: Fee paid in quote by the broker for the trade.
+    fee: Decimal = field(default=Decimal(0))
+
     def __post_init__(self):
         if (
             self.order.state != OrderState.executed
@@ -476,6 +603,17 @@ class Position:
 
         self._check_close_position()
 
+    def notify_cancel(self, order: Order):
+        """
+        Release the quantity reserved by a canceled order of the position.
+        """
+        if order not in self.orders:
+            raise ValueError("order not related to position")
+        if self._is_side_reverse(order.side):
+            self.reserved_quantity -= order.quantity
+
+        self._check_close_position()
+
     def pending_orders(self) -> List[Order]:
         """
         Get the pending orders related to the position.
@@ -519,12 +657,136 @@ class Position:
         )
 
 
+@dataclass
+class PendingOrderBook:
+    """
+    Index of the pending orders of a broker by the price that triggers them. Orders that
+    a candle triggers by reaching down to their price, buy limits and sell stops, are kept
+    in a max heap and those triggered by reaching up to it, sell limits and buy stops, in a
+    min heap. A candle only pops the orders it can trigger, in O(log n) per order, however
+    many protective stops are resting. Any other order is returned on every candle.
+    """
+
+    #: Heap of orders triggered at or over the low of a candle as (-price, sequence, order).
+    _below: List[Tuple[Decimal, int, Order]] = field(default_factory=list, init=False)
+
+    #: Heap of orders triggered at or under the high of a candle as (price, sequence, order).
+    _above: List[Tuple[Decimal, int, Order]] = field(default_factory=list, init=False)
+
+    #: Orders without a price index, e.g. market orders, by sequence.
+    _unindexed: Dict[int, Order] = field(default_factory=dict, init=False)
+
+    #: Sequence of every order in the book by order id. Heap entries of orders missing
+    #: here, or with another sequence, were discarded and are skipped when popped.
+    _sequences: Dict[int, int] = field(default_factory=dict, init=False)
+
+    #: Next sequence given to an added order.
+    _next_sequence: int = field(default=0, init=False)
+
+    def __len__(self) -> int:
+        return len(self._sequences)
+
+    def add(self, order: Order, sequence: int = None) -> None:
+        """
+        Add an order to the book. Orders given back after ``triggered`` must keep their
+        sequence.
+        """
+        if sequence is None:
+            sequence = self._next_sequence
+            self._next_sequence += 1
+        self._sequences[order.order_id] = sequence
+        if isinstance(order, LimitOrder):
+            price, below = order.price, order.side == Side.buy
+        elif isinstance(order, StopOrder):
+            price, below = order.stop_price, order.side == Side.sell
+        else:
+            self._unindexed[sequence] = order
+            return
+        if below:
+            heappush(self._below, (-price, sequence, order))
+        else:
+            heappush(self._above, (price, sequence, order))
+
+    def discard(self, order: Order) -> None:
+        """
+        Remove an order from the book, e.g. once it was processed.
+        """
+        sequence = self._sequences.pop(order.order_id, None)
+        if sequence is not None:
+            self._unindexed.pop(sequence, None)
+
+    def _is_live(self, sequence: int, order: Order) -> bool:
+        return self._sequences.get(order.order_id) == sequence
+
+    def _drop_stale(self, heap: List[Tuple[Decimal, int, Order]]) -> None:
+        while heap and not self._is_live(heap[0][1], heap[0][2]):
+            heappop(heap)
+
+    def only_indexed_orders(self) -> bool:
+        """
+        Indicates whether every order in the book is indexed by its trigger price.
+        """
+        return not self._unindexed
+
+    def bounds(self) -> Tuple[Decimal, Decimal]:
+        """
+        Highest price triggered from below and lowest price triggered from above, None for
+        an empty side. Only a candle with its low at or under the first or its high at or
+        over the second can trigger an order of the book.
+        """
+        self._drop_stale(self._below)
+        self._drop_stale(self._above)
+        highest = -self._below[0][0] if self._below else None
+        lowest = self._above[0][0] if self._above else None
+        return highest, lowest
+
+    def triggered(
+        self, ohlcv: OHLCV, path: IntrabarPath = None
+    ) -> List[Tuple[int, Order]]:
+        """
+        Take out of the book the orders that the candle may fill, with their sequence. They
+        come in the order they were added or, given an intrabar ``path``, in the order the
+        path reaches their prices, ties and unindexed orders by sequence. Each of them must
+        then be either discarded or given back with ``add``.
+        """
+        triggered = list(self._unindexed.items())
+        self._unindexed.clear()
+        prices, below = [], []
+        while self._below and -self._below[0][0] >= ohlcv.low:
+            price, sequence, order = heappop(self._below)
+            if self._is_live(sequence, order):
+                triggered.append((sequence, order))
+                prices.append(-price)
+                below.append(True)
+        while self._above and self._above[0][0] <= ohlcv.high:
+            price, sequence, order = heappop(self._above)
+            if self._is_live(sequence, order):
+                triggered.append((sequence, order))
+                prices.append(price)
+                below.append(False)
+        if path is None or not prices:
+            triggered.sort(key=itemgetter(0))
+            return triggered
+
+        unindexed = len(triggered) - len(prices)
+        times = [0.0] * unindexed + path.touch_times(ohlcv, prices, below).tolist()
+        order = sorted(range(len(triggered)), key=lambda i: (times[i], triggered[i][0]))
+        return [triggered[i] for i in order]
+
+
 @dataclass
 class VBrokerConfig:
     initial_money: Decimal = field(default=Decimal(0))
     initial_quote: Decimal = field(default=Decimal(0))
     fee: Decimal = field(default=Decimal(0))
     data: DataSet = field(default=None)
+    #: Fees charged on every fill. A flat ``fee`` for makers and takers without one.
+    fees: FeeModel = field(default=None)
+    #: Slippage of the fills at the market, none without one.
+    slippage: SlippageModel = field(default=None)
+    #: Route of the price within a candle that decides which of the orders it triggers
+    #: fills first. Orders are filled in the order they were added without one.
+    intrabar_path: IntrabarPath = field(default=None)
 
 
 @dataclass
@@ -550,6 +812,12 @@ class VBroker:
     #: Fee to be applied to the broker.
     fee: Decimal = field(default=Decimal(0), init=False)
 
+    #: Fees charged on every fill, see ``VBrokerConfig.fees``.
+    fees: FeeModel = field(default=None, init=False)
+
+    #: Slippage of the fills at the market, see ``VBrokerConfig.slippage``.
+    slippage: SlippageModel = field(default=None, init=False)
+
     #: List of all the orders in the broker.
     orders: List[Order] = field(default_factory=list, init=False)
 
@@ -571,6 +839,13 @@ class VBroker:
         default_factory=OrderedDict, init=False
     )
 
+    #: Price index of the pending orders, so every candle only processes the orders it
+    #: may fill.
+    order_book: PendingOrderBook = field(default_factory=PendingOrderBook, init=False)
+
+    #: Route of the price within a candle, see ``VBrokerConfig.intrabar_path``.
+    intrabar_path: IntrabarPath = field(default=None, init=False)
+
     #: List of all cancelled orders in the broker.
     canceled_orders: OrderedDict[int, Order] = field(
         default_factory=OrderedDict, init=False
@@ -613,6 +888,11 @@ class VBroker:
         self.available_money = config.initial_money
         self.available_quote = config.initial_quote
         self.fee = config.fee
+        self.fees = config.fees
+        if self.fees is None:
+            self.fees = FeeSchedule.flat(self.fee)
+        self.slippage = config.slippage
+        self.intrabar_path = config.intrabar_path
         self._next_data()
 
     @property
@@ -658,6 +938,8 @@ class VBroker:
         """
         if commission < 0:
             raise ValueError("broker commissions cannot be negative")
+        self.fee = commission
+        self.fees = FeeSchedule.flat(commission)
 
     def set_dataset(self, data: DataSet):
         """
@@ -673,11 +955,42 @@ class VBroker:
 
         self.last_exceptions.clear()
         self._next_data()
-        self.pending_orders.update(self.created_orders)
-        self.created_orders.clear()
-        self._process_orders(self.pending_orders)
+        self._open_created_orders()
+        if self._current_data is not None:
+            self._process_orders()
         return self._current_data
 
+    def fast_forward(self, until: datetime = None) -> OHLCV:
+        """
+        Like ``next_data`` but jumps over the candles that cannot fill any pending order, to
+        the first candle that may fill one or, when it comes first, the first candle at or
+        after ``until``, e.g. the next candle the strategy subscribed to. The search runs on
+        the low and high columns of the dataset, and the fills are the same as stepping
+        candle by candle. When an order is not a limit or stop order, the dataset is not
+        columnar or there is neither a pending order nor ``until``, this is just
+        ``next_data``.
+        """
+        self._open_created_orders()
+        if self.order_book.only_indexed_orders() and isinstance(
+            self._data, ColumnarDataSet
+        ):
+            highest_buy, lowest_sell = self.order_book.bounds()
+            # An empty book with no ``until`` would skip the whole dataset.
+            if highest_buy is None and lowest_sell is None and until is None:
+                return self.next_data()
+            if self._data.skip_to_touch(highest_buy, lowest_sell, until) > 0:
+                self._current_data = self._data.get_current_data()
+        return self.next_data()
+
+    def _open_created_orders(self):
+        """
+        Move the created orders to the pending orders and the order book.
+        """
+        for order_id, order in self.created_orders.items():
+            self.pending_orders[order_id] = order
+            self.order_book.add(order)
+        self.created_orders.clear()
+
     def current_data(self) -> OHLCV:
         """
         Get the current data in the broker.
@@ -728,9 +1041,24 @@ class VBroker:
         # self.pending_orders[order.order_id]=order
         self.created_orders[order.order_id] = order
 
-    def cancel_order(self, order_id: str) -> bool:
-        if order_id not in self.pending_orders:
+    def cancel_order(self, order_id: int) -> bool:
+        """
+        Cancel a created or pending order.
+
+        Returns:
+            bool: True if the order was canceled, False if it is not open.
+        """
+        order = self.pending_orders.get(order_id) or self.created_orders.get(order_id)
+        if order is None or not order.cancel(self.current_time):
             return False
+        self.pending_orders.pop(order_id, None)
+        self.created_orders.pop(order_id, None)
+        self.order_book.discard(order)
+        self.canceled_orders[order_id] = order
+        if self.open_position is not None and order in self.open_position.orders:
+            self.open_position.notify_cancel(order)
+            self._archive_closed_position()
+        return True
 
     def create_order(
         self,
@@ -760,77 +1088,200 @@ class VBroker:
         self.executed_orders[order.order_id] = self.pending_orders.pop(order.order_id)
         self.trades.append(trade)
 
-    def _process_orders(self, pending_orders: OrderedDict[int, Order]):
+    def _process_orders(self):
         """
-        Process all pending orders. This method is called within next_data method.
-        Tries to execute all pending orders. As a pending order could generate a new order,
-        it is processed recursively but only with children orders in every new iteration.
-
-        There are several issues to consider:
-        - There are orders unchecked, so they must be canceled.
-        - The reserved money for market orders is unknown.
+        Process the pending orders that the current candle may fill, as taken from the order
+        book. This method is called within next_data method. Orders are filled in the order
+        the intrabar path reaches their prices, unindexed orders such as market orders
+        first, or in the order they were added without a path. The orders an order spawns,
+        e.g. the limit order of a triggered stop limit or the exits of a bracket, are
+        registered for the next candle, and the orders the candle does not fill go back to
+        the book. A market or stop order the account cannot pay for is rejected.
         """
 
-        log().debug(f"number of orders to process: {len(pending_orders)}")
+        triggered = deque(
+            self.order_book.triggered(self._current_data, self.intrabar_path)
+        )
+        log().debug(
+            f"number of orders to process: {len(triggered)} of {len(self.pending_orders)}"
+        )
         processed_orders = []
-        new_orders = []  # Orders as result from composite orders
-        for order_id in self.pending_orders.keys():
-            order = self.pending_orders[order_id]
-            log().debug(f"order to process: {type(order)} - {order.order_id}")
-            if self.pending_orders[order_id].state != OrderState.pending:
-                raise NewOrderNotOpen(order.order_id)
-
-            result = order.process(self._current_data)
-            if result is None:
-                continue
-
-            if result.is_trade():  # That means the order is simple
-                if self.open_position is not None:
-                    self.open_position.notify_trade(result.trade)
-                # If there is no open position, create a new one
-                else:
-                    self.open_position = Position(self._next_position_id, result.trade)
-                    self._next_position_id += 1
-                # In both cases we have a position with a trade notified
-
-                self.trades.append(result.trade)
-
-                # Adjust money and quote according to the order side
-                order = result.trade.order  # type: SimpleOrder
-                if order.side == Side.buy:
-                    # If the order is a market order, the reserved money is not known
-                    if isinstance(order, MarketOrder):
-                        if self.available_money < result.trade.money_traded():
+        try:
+            while triggered:
+                sequence, order = triggered[0]
+                order_id = order.order_id
+                if order_id not in self.pending_orders:  # Canceled by a sibling
+                    triggered.popleft()
+                    continue
+                log().debug(f"order to process: {type(order)} - {order.order_id}")
+                if order.state != OrderState.pending:
+                    raise NewOrderNotOpen(order.order_id)
+
+                result = order.process(self._current_data)
+                if result is None:
+                    triggered.popleft()
+                    self.order_book.add(order, sequence)
+                    continue
+
+                if result.is_trade():  # That means the order is simple
+                    order = result.trade.order  # type: SimpleOrder
+                    # Market and stop orders do not reserve money nor quote
+                    at_market = isinstance(order, (MarketOrder, StopOrder))
+                    price, notional, fee = self._costs(result.trade, at_market)
+                    # Funds are checked before the fill is recorded, so a rejected one
+                    # leaves no trade, position, price or traded volume behind.
+                    if at_market and order.side == Side.buy:
+                        if self.available_money < result.trade.quantity * price + fee:
+                            self._reject(order)
                             raise NotEnoughMoneyToExecuteMarketOrder(order.order_id)
-                        self.available_money -= result.trade.money_traded()
+                    elif at_market and self.available_quote < result.trade.quantity:
+                        self._reject(order)
+                        raise NotEnoughQuoteToExecuteMarketOrder(order.order_id)
+                    self._charge_costs(result.trade, price, notional, fee)
+
+                    if self.open_position is not None:
+                        if result.trade.order not in self.open_position.orders:
+                            # The order was opened before the position
+                            self.open_position.orders.append(result.trade.order)
+                        self.open_position.notify_trade(result.trade)
+                    # If there is no open position, create a new one
                     else:
-                        self.reserved_money -= result.trade.money_traded()
-                    self.available_quote += result.trade.quantity
-
-                else:  # Side.sell
-                    if isinstance(order, MarketOrder):
-                        if self.available_quote < result.trade.quantity:
-                            order.state = OrderState.rejected
-                            raise NotEnoughQuoteToExecuteMarketOrder(order.order_id)
-                        self.available_quote -= result.trade.quantity
-                    else:
-                        self.reserved_quote -= result.trade.quantity
-                    self.available_money += result.trade.money_traded()
-                processed_orders.append(order_id)
+                        self.open_position = Position(
+                            self._next_position_id, result.trade
+                        )
+                        self._next_position_id += 1
+                    # In both cases we have a position with a trade notified
+
+                    self.trades.append(result.trade)
+
+                    # Adjust money and quote according to the order side
+                    if order.side == Side.buy:
+                        if at_market:
+                            self.available_money -= result.trade.money_traded() + fee
+                        else:
+                            self.reserved_money -= result.trade.money_traded()
+                            self.available_money -= fee
+                        self.available_quote += result.trade.quantity
+
+                    else:  # Side.sell
+                        if at_market:
+                            self.available_quote -= result.trade.quantity
+                        else:
+                            self.reserved_quote -= result.trade.quantity
+                        self.available_money += result.trade.money_traded() - fee
+                    processed_orders.append(order_id)
+
+                    if order.parent is not None:
+                        order.parent.state = OrderState.executed
+                        for sibling in order.parent.siblings(order):
+                            self.cancel_order(sibling.order_id)
+                    if isinstance(order, LimitOrder) and order.has_bracket():
+                        self._open_bracket(order)
+                    self._archive_closed_position()
+
+                elif result.is_order():
+                    self._register_child(result.order)
+                    processed_orders.append(order_id)
+                else:
+                    raise ValueError("result must contain an order or a trade")
+
+                _, order = triggered.popleft()
+                self.order_book.discard(order)
+        finally:
+            # Orders left by an exception stay pending
+            for sequence, order in triggered:
+                if order.order_id in self.pending_orders:
+                    self.order_book.add(order, sequence)
+            for order_id in processed_orders:
+                self.executed_orders[order_id] = self.pending_orders.pop(order_id)
+
+    def _reject(self, order: Order):
+        """
+        Move a pending order that cannot be filled to the rejected orders.
+        """
+        order.reject()
+        self.pending_orders.pop(order.order_id, None)
+        self.order_book.discard(order)
+        self.rejected_orders[order.order_id] = order
+
+    def _costs(self, trade: Trade, at_market: bool) -> Tuple[Decimal, EMoney, Decimal]:
+        """
+        Fill price of a trade after the slippage of a fill at the market, its notional at
+        that price and its fee, without changing the trade nor counting the notional as
+        traded volume. Prices and money are the scaled integers of the candle, so both are
+        computed as ``EMoney`` in its quote decimals.
+        """
+        ohlcv = self._current_data
+        price = trade.executed_price
+        if at_market and self.slippage is not None:
+            # The slipped price is an integer of the candle's quote decimals, rounded
+            # against the fill, so it keeps the precision of the candle prices.
+            price = self.slippage.price(
+                Normalizer.normalize_decimal(Decimal(price), 0),
+                Normalizer.normalize_decimal(Decimal(trade.money_traded()), 0),
+                ohlcv,
+                trade.side == Side.buy,
+            )
+        notional = EMoney.trusted(
+            Normalizer.normalize_decimal(Decimal(trade.quantity * price), 0),
+            ohlcv.quote,
+            ohlcv.quote_decimals,
+        )
+        liquidity = Liquidity.taker if at_market else Liquidity.maker
+        return price, notional, Decimal(self.fees.quote(notional, liquidity).value)
+
+    def _charge_costs(
+        self, trade: Trade, price: Decimal, notional: EMoney, fee: Decimal
+    ) -> None:
+        """
+        Set the price and fee of an executed trade and count its notional as traded volume.
+        """
+        trade.executed_price = price
+        trade.fee = fee
+        self.fees.count(notional)
 
-            elif result.is_order():
-                new_orders.append(result.order)
-                processed_orders.append(order_id)
-            else:
-                raise ValueError("result must contain an order or a trade")
+    def _new_order_id(self) -> int:
+        order_id = self._next_order_id
+        self._next_order_id += 1
+        return order_id
+
+    def _register_child(self, order: Order):
+        """
+        Open an order spawned by another one, e.g. the limit order of a triggered stop limit
+        or the exits of a bracket. It gets its id and goes straight to the pending orders
+        and the order book, so it is processed from the next candle on: the order of the
+        prices within the current candle is unknown.
+        """
+        order.order_id = self._new_order_id()
+        self.orders.append(order)
+        self.pending_orders[order.order_id] = order
+        self.order_book.add(order)
+        if self.open_position is not None:
+            self.open_position.add_order(order)
 
-        for order_id in processed_orders:
-            self.pending_orders.pop(order_id)
-        for order in new_orders:
-            self._add_order(order)
+    def _open_bracket(self, order: LimitOrder):
+        """
+        Open the take profit and stop loss of an executed limit order as an OCO group.
+        """
+        time = self._current_data.timestamp
+        exit_side = Side.sell if order.side == Side.buy else Side.buy
+        group = OCOOrder(self._new_order_id(), time)
+        self.orders.append(group)
+        if order.take_profit > 0:
+            group.add_child(
+                LimitOrder(None, time, exit_side, order.quantity, order.take_profit)
+            )
+        if order.stop_loss > 0:
+            group.add_child(
+                StopOrder(None, time, exit_side, order.quantity, order.stop_loss)
+            )
+        for child in group.children_orders:
+            self._register_child(child)
 
-        if len(new_orders) > 0:
-            self._process_orders(new_orders)
+    def _archive_closed_position(self):
+        if self.open_position is not None and self.open_position.is_closed():
+            self.closed_positions.append(self.open_position)
+            self.open_position = None
 
     def add_market_order(self, side: Side, quantity: Decimal) -> Order:
         """
@@ -841,12 +1292,52 @@ class VBroker:
         self._next_order_id += 1
         return order
 
-    def add_limit_order(self, side: Side, quantity: Decimal, price: Decimal) -> Order:
+    def add_limit_order(
+        self,
+        side: Side,
+        quantity: Decimal,
+        price: Decimal,
+        take_profit: Decimal = Decimal(0),
+        stop_loss: Decimal = Decimal(0),
+    ) -> Order:
         """
-        Add a limit order to the broker.
+        Add a limit order to the broker. With a take profit or a stop loss, the execution
+        of the order opens them as a bracket: the first one executed cancels the other.
         """
         order = LimitOrder(
-            self._next_order_id, self.current_time, side, quantity, price
+            self._next_order_id,
+            self.current_time,
+            side,
+            quantity,
+            price,
+            take_profit,
+            stop_loss,
+        )
+        self._add_order(order)
+        self._next_order_id += 1
+        return order
+
+    def add_stop_order(
+        self, side: Side, quantity: Decimal, stop_price: Decimal
+    ) -> Order:
+        """
+        Add a stop order to the broker.
+        """
+        order = StopOrder(
+            self._next_order_id, self.current_time, side, quantity, stop_price
+        )
+        self._add_order(order)
+        self._next_order_id += 1
+        return order
+
+    def add_stop_limit_order(
+        self, side: Side, quantity: Decimal, stop_price: Decimal, price: Decimal
+    ) -> Order:
+        """
+        Add a stop limit order to the broker.
+        """
+        order = StopLimitOrder(
+            self._next_order_id, self.current_time, side, quantity, stop_price, price
         )
         self._add_order(order)
         self._next_order_id += 1
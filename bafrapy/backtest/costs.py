@@ -0,0 +1,178 @@
+from abc import ABC, abstractmethod
+from bisect import bisect_right
+from decimal import ROUND_CEILING, Decimal
+from enum import Enum
+
+from attrs import define, field
+
+from bafrapy.backtest.money import OHLCV, Currency, EMoney, Ratio
+from bafrapy.backtest.money.emoney import pow10
+
+
+class Liquidity(Enum):
+    """
+    Side of the book a fill takes its liquidity from.
+    """
+
+    maker = 1  #: Resting order filled at its own price, e.g. a limit order.
+    taker = 2  #: Order filled at the market, e.g. a market or stop order.
+
+
+def _rate(n: int | float | Decimal | Ratio) -> Ratio:
+    return Ratio.from_number(Decimal(n) if isinstance(n, int) else n)
+
+
+def _assert_rate(ratio: Ratio, name: str) -> None:
+    if ratio.numerator < 0:
+        raise ValueError(f"{name} cannot be negative: {ratio.decimal}")
+
+
+class FeeModel(ABC):
+    """
+    Fee charged on every fill, in the quote currency of the traded notional.
+    """
+
+    @abstractmethod
+    def quote(self, notional: EMoney, liquidity: Liquidity) -> EMoney:
+        """
+        Fee a fill of ``notional`` would pay, without counting it as traded volume.
+        """
+
+    def count(self, notional: EMoney) -> None:
+        """
+        Count a fill of ``notional`` as traded volume, once it is actually executed.
+        """
+
+    def fee(self, notional: EMoney, liquidity: Liquidity) -> EMoney:
+        """
+        Fee of a fill of ``notional``, which is then counted as traded volume.
+        """
+        fee = self.quote(notional, liquidity)
+        self.count(notional)
+        return fee
+
+
+class SlippageModel(ABC):
+    """
+    Price actually paid or received by a fill at the market.
+    """
+
+    @abstractmethod
+    def price(self, price: int, notional: int, ohlcv: OHLCV, buy: bool) -> int:
+        """
+        Fill price of a ``notional`` bought or sold at ``price`` during ``ohlcv``, both in the scaled integers
+        of the candle's quote decimals.
+        """
+
+
+@define(frozen=True, slots=True)
+class FeeTier:
+    #: Traded quote volume from which the tier applies.
+    volume: Decimal = field(converter=Decimal)
+    maker: Ratio = field(converter=_rate)
+    taker: Ratio = field(converter=_rate)
+
+    def __attrs_post_init__(self) -> None:
+        if self.volume < 0:
+            raise ValueError(f"Fee tier volume cannot be negative: {self.volume}")
+        _assert_rate(self.maker, "Maker fee")
+        _assert_rate(self.taker, "Taker fee")
+
+
+@define
+class FeeSchedule(FeeModel):
+    """
+    Maker and taker rates by tier of quote volume traded so far in the run. Rates are compiled to integer ratios
+    and tier thresholds to scaled integers, and fees are rounded up to the smallest unit of the notional. Traded
+    volume only grows, so the current tier only moves forward and a fill costs the same with any number of
+    tiers.
+    """
+
+    tiers: tuple[FeeTier, ...] = field(converter=tuple)
+    #: Traded volume in the scaled integers of the most decimals seen in a notional.
+    _traded: int = field(default=0, init=False)
+    _traded_decimals: int = field(default=0, init=False)
+    _currency: Currency = field(default=None, init=False)
+    _tier: int = field(default=0, init=False)
+    #: Volume from which each tier but the first applies, in the scaled integers of the traded volume.
+    _thresholds: list[int] = field(factory=list, init=False)
+
+    def __attrs_post_init__(self) -> None:
+        if not self.tiers:
+            raise ValueError("Fee schedule needs at least one tier")
+        volumes = [tier.volume for tier in self.tiers]
+        if volumes[0] != 0:
+            raise ValueError(f"First fee tier must start at volume 0: {volumes[0]}")
+        if any(a >= b for a, b in zip(volumes, volumes[1:])):
+            raise ValueError("Fee tier volumes must be increasing")
+
+    @classmethod
+    def flat(cls, maker: int | float | Decimal, taker: int | float | Decimal | None = None) -> "FeeSchedule":
+        return cls([FeeTier(0, maker, maker if taker is None else taker)])
+
+    @property
+    def traded(self) -> EMoney | None:
+        if self._currency is None:
+            return None
+        return EMoney.trusted(self._traded, self._currency, self._traded_decimals)
+
+    @property
+    def tier(self) -> FeeTier:
+        return self.tiers[self._tier]
+
+    def _rescale(self, decimals: int) -> None:
+        self._traded *= pow10(decimals - self._traded_decimals)
+        self._traded_decimals = decimals
+        # Rounded up, so a scaled volume reaches a threshold exactly when the unscaled one does.
+        self._thresholds = [
+            int((tier.volume * pow10(decimals)).to_integral_value(ROUND_CEILING)) for tier in self.tiers[1:]
+        ]
+
+    def _count(self, notional: EMoney) -> None:
+        if self._currency is None:
+            self._currency = notional.currency
+            self._rescale(notional.decimals)
+        elif notional.currency is not self._currency:
+            raise TypeError(f"Invalid notional currency: {notional.currency} != {self._currency}")
+        elif notional.decimals > self._traded_decimals:
+            self._rescale(notional.decimals)
+        self._traded += notional.value * pow10(self._traded_decimals - notional.decimals)
+
+    def quote(self, notional: EMoney, liquidity: Liquidity) -> EMoney:
+        tier = self.tiers[self._tier]
+        rate = tier.maker if liquidity is Liquidity.maker else tier.taker
+        fee = -(-notional.value * rate.numerator // rate.denominator)
+        return EMoney.trusted(fee, notional.currency, notional.decimals)
+
+    def count(self, notional: EMoney) -> None:
+        if notional.currency is self._currency and notional.decimals == self._traded_decimals:
+            self._traded += notional.value
+        else:
+            self._count(notional)
+        if self._tier < len(self._thresholds) and self._traded >= self._thresholds[self._tier]:
+            self._tier = bisect_right(self._thresholds, self._traded, lo=self._tier)
+
+
+@define(frozen=True, slots=True)
+class VolumeSlippage(SlippageModel):
+    """
+    Price moved against the fill by ``impact`` times its participation, the share of the candle's quote volume
+    it takes, and by at most ``max_impact`` of the price. A candle without volume moves it by ``max_impact``.
+    """
+
+    impact: Ratio = field(converter=_rate)
+    max_impact: Ratio = field(converter=_rate)
+
+    def __attrs_post_init__(self) -> None:
+        _assert_rate(self.impact, "Slippage impact")
+        _assert_rate(self.max_impact, "Maximum slippage impact")
+
+    def price(self, price: int, notional: int, ohlcv: OHLCV, buy: bool) -> int:
+        # Impact of ``impact * notional / quote_volume`` as the fraction numerator / denominator.
+        numerator = self.impact.numerator * notional
+        denominator = self.impact.denominator * ohlcv.quote_volume
+        cap = self.max_impact
+        if denominator == 0 or numerator * cap.denominator > cap.numerator * denominator:
+            numerator, denominator = cap.numerator, cap.denominator
+        slippage = -(-price * numerator // denominator)
+        return price + slippage if buy else max(price - slippage, 0)
@@ -1,6 +1,36 @@
-from bafrapy.backtest.dataset.base import DataSet
+from bafrapy.backtest.dataset.base import ColumnarDataSet, DataSet
+from bafrapy.backtest.dataset.cache import CacheKey, CacheStats, OHLCVCache
+from bafrapy.backtest.dataset.columns import OHLCVColumns
 from bafrapy.backtest.dataset.ducklake import DucklakeDataSet
+from bafrapy.backtest.dataset.multi import (
+    MissingBarPolicy,
+    MultiPairDataSet,
+    OHLCVBundle,
+)
 from bafrapy.backtest.dataset.pandas import PandasDataSet
 from bafrapy.backtest.dataset.polars import PolarsDataSet
+from bafrapy.backtest.dataset.resampled import ResampledDataSet
+from bafrapy.backtest.dataset.shared import ArrowDataSet, DataSetShard
+from bafrapy.backtest.dataset.validation import OHLCVValidation, validate_ohlcv_frame
+from bafrapy.backtest.dataset.window import LookbackWindow
 
-__all__ = ["DataSet", "DucklakeDataSet", "PandasDataSet", "PolarsDataSet"]
+__all__ = [
+    "ArrowDataSet",
+    "CacheKey",
+    "CacheStats",
+    "ColumnarDataSet",
+    "DataSet",
+    "DataSetShard",
+    "DucklakeDataSet",
+    "LookbackWindow",
+    "MissingBarPolicy",
+    "MultiPairDataSet",
+    "OHLCVBundle",
+    "OHLCVCache",
+    "OHLCVColumns",
+    "OHLCVValidation",
+    "PandasDataSet",
+    "PolarsDataSet",
+    "ResampledDataSet",
+    "validate_ohlcv_frame",
+]
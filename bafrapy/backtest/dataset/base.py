@@ -1,19 +1,86 @@
 from abc import ABC, abstractmethod
+from collections.abc import Iterator
+from copy import copy
+from datetime import date
+from decimal import Decimal
+from typing import Any, Self
 
 from attrs import define, field
 
+from bafrapy.backtest.dataset.columns import OHLCVColumns
+from bafrapy.backtest.dataset.window import LookbackWindow
 from bafrapy.backtest.money import OHLCV, Pair
 
 
+def _split_bounds(length: int, n: int) -> list[tuple[int, int]]:
+    if n <= 0 or n > length:
+        raise ValueError(f"Cannot split {length} bars in {n} parts")
+    size, extra = divmod(length, n)
+    bounds = []
+    start = 0
+    for i in range(n):
+        stop = start + size + (1 if i < extra else 0)
+        bounds.append((start, stop))
+        start = stop
+    return bounds
+
+
+def _window_bounds(length: int, size: int, step: int) -> Iterator[tuple[int, int]]:
+    if size <= 0 or step <= 0:
+        raise ValueError(f"Window size and step must be greater than 0: {size}, {step}")
+    for start in range(0, length - size + 1, step):
+        yield start, start + size
+
+
 @define(kw_only=True)
 class DataSet(ABC):
     pair: Pair
     resolution: int
+    #: Number of past bars kept in ``window``. 0 disables the window.
+    lookback: int = 0
+    #: Rescale the series to common decimals when it is loaded, so every bar uses the same integer scale.
+    common_scale: bool = False
+    #: Target decimals of the common scale. None uses the largest decimals of the series.
+    quote_decimals: int | None = None
+    base_decimals: int | None = None
     current_data: OHLCV | None = field(default=None, init=False)
+    _window: LookbackWindow | None = field(default=None, init=False)
+
+    def __attrs_post_init__(self) -> None:
+        if self.lookback < 0:
+            raise ValueError(f"Lookback cannot be negative: {self.lookback}")
+        if self.lookback > 0:
+            self._window = LookbackWindow(self.lookback)
+
+    @property
+    def window(self) -> LookbackWindow:
+        if self._window is None:
+            raise ValueError("Dataset was created without lookback")
+        return self._window
 
     def get_current_data(self) -> OHLCV | None:
         return self.current_data
 
+    def _scale(self, columns: OHLCVColumns) -> OHLCVColumns:
+        if not self.common_scale:
+            return columns
+        return columns.normalize(self.quote_decimals, self.base_decimals)
+
+    def _require_scale_targets(self) -> None:
+        if self.common_scale and (self.quote_decimals is None or self.base_decimals is None):
+            raise ValueError("Streamed datasets need explicit quote_decimals and base_decimals for a common scale")
+
+    def _serve(self, columns: OHLCVColumns, index: int) -> OHLCV:
+        self.current_data = columns.ohlcv(index, self.pair)
+        if self._window is not None:
+            self._window.push(columns.time[index], columns.values[index])
+        return self.current_data
+
+    def _reset(self) -> None:
+        self.current_data = None
+        if self._window is not None:
+            self._window.clear()
+
     @abstractmethod
     def next_data(self) -> OHLCV | None:
         pass
@@ -21,3 +88,121 @@ class DataSet(ABC):
     @abstractmethod
     def has_data(self) -> bool:
         pass
+
+    @abstractmethod
+    def seek(self, timestamp: date) -> None:
+        """
+        Move the dataset so the next bar served is the first one at or after ``timestamp``. The current data and
+        the lookback window are reset.
+        """
+
+    @abstractmethod
+    def slice(self, start: date, end: date) -> "DataSet":
+        """
+        New independent dataset with the bars between ``start`` and ``end``, both included.
+        """
+
+
+@define(kw_only=True)
+class ColumnarDataSet(DataSet):
+    _columns: OHLCVColumns = field(init=False)
+    _row_index: int = field(default=0, init=False)
+    _sorted: bool = field(default=False, init=False)
+
+    def __attrs_post_init__(self) -> None:
+        super().__attrs_post_init__()
+        self._columns = self._scale(self._load_columns())
+
+    @abstractmethod
+    def _load_columns(self) -> OHLCVColumns:
+        pass
+
+    @abstractmethod
+    def _slice_data(self, start: int, stop: int) -> Any:
+        pass
+
+    @property
+    def columns(self) -> OHLCVColumns:
+        return self._columns
+
+    def _search(self, timestamp: date, side: str) -> int:
+        if not self._sorted:
+            if not self._columns.is_sorted():
+                raise ValueError("Dataset time column must be sorted to seek or slice")
+            self._sorted = True
+        return self._columns.search(timestamp, side)
+
+    def next_data(self) -> OHLCV | None:
+        index = self._row_index
+        if index >= len(self._columns):
+            return None
+        self._row_index += 1
+        return self._serve(self._columns, index)
+
+    def has_data(self) -> bool:
+        return self._row_index < len(self._columns)
+
+    def iter_batches(self, n: int) -> Iterator[OHLCVColumns]:
+        if n <= 0:
+            raise ValueError(f"Batch size must be greater than 0: {n}")
+
+        while self._row_index < len(self._columns):
+            yield self._skip_rows(min(self._row_index + n, len(self._columns)))
+
+    def _skip_rows(self, stop: int) -> OHLCVColumns:
+        """
+        Move the cursor to ``stop`` without serving the bars in between, leaving ``current_data`` and the
+        window as if they had been served.
+        """
+        start = self._row_index
+        self._row_index = stop
+        skipped = self._columns.slice(start, stop)
+        if stop > start:
+            self.current_data = self._columns.ohlcv(stop - 1, self.pair)
+            if self._window is not None:
+                self._window.extend(skipped)
+        return skipped
+
+    def skip_to_touch(self, below: int | Decimal | None, above: int | Decimal | None, until: date | None = None) -> int:
+        """
+        Skip the bars before the first one whose low is at or under ``below`` or whose high is at or over
+        ``above``, see ``OHLCVColumns.first_touch``, so it is the next bar served. With ``until`` the skip
+        also stops before the first bar at or after it. Returns the number of skipped bars.
+        """
+        start = self._row_index
+        stop = len(self._columns)
+        if until is not None:
+            stop = max(start, self._search(until, "left"))
+        self._skip_rows(self._columns.first_touch(start, stop, below, above))
+        return self._row_index - start
+
+    def seek(self, timestamp: date) -> None:
+        self._row_index = self._search(timestamp, "left")
+        self._reset()
+
+    def slice(self, start: date, end: date) -> Self:
+        first = self._search(start, "left")
+        return self._slice_rows(first, max(first, self._search(end, "right")))
+
+    def _slice_rows(self, start: int, stop: int) -> Self:
+        dataset = copy(self)
+        dataset.data = self._slice_data(start, stop)
+        dataset._columns = self._columns.slice(start, stop)
+        dataset._row_index = 0
+        dataset._window = LookbackWindow(self.lookback) if self.lookback > 0 else None
+        dataset.current_data = None
+        return dataset
+
+    def split(self, n: int) -> list[Self]:
+        """
+        ``n`` consecutive datasets of (almost) the same length. They are views of this dataset's columns.
+        """
+        return [self._slice_rows(start, stop) for start, stop in _split_bounds(len(self._columns), n)]
+
+    def windows(self, size: int, step: int) -> Iterator[Self]:
+        """
+        Datasets of ``size`` bars starting every ``step`` bars, as used by walk-forward folds. Only complete
+        windows are yielded and all of them are views of this dataset's columns.
+        """
+        for start, stop in _window_bounds(len(self._columns), size, step):
+            yield self._slice_rows(start, stop)
@@ -0,0 +1,126 @@
+import hashlib
+import os
+
+from collections.abc import Iterator
+from datetime import date
+from pathlib import Path
+from threading import Lock
+
+import polars as pl
+import pyarrow as pa
+
+from attrs import define, field
+
+
+@define(frozen=True, slots=True)
+class CacheKey:
+    exchange: str
+    symbol: str
+    resolution: int
+    start: date
+    end: date
+    snapshot: int
+
+    def digest(self) -> str:
+        raw = f"{self.exchange}|{self.symbol}|{self.resolution}|{self.start}|{self.end}|{self.snapshot}"
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+
+@define(frozen=True, slots=True)
+class CacheStats:
+    hits: int
+    misses: int
+    evictions: int
+    size_bytes: int
+
+
+@define
+class OHLCVCache:
+    """
+    On-disk cache of warehouse OHLCV ranges stored as uncompressed Arrow IPC files, so cached ranges are
+    opened with memory mapping instead of being read into memory. Keys include the DuckLake snapshot, so a
+    new warehouse write never serves stale data. Files are evicted least recently used first once the
+    directory grows over ``max_bytes``.
+    """
+
+    directory: Path = field(converter=Path)
+    max_bytes: int = 10 * 1024**3
+    _hits: int = field(default=0, init=False)
+    _misses: int = field(default=0, init=False)
+    _evictions: int = field(default=0, init=False)
+    _lock: Lock = field(factory=Lock, init=False)
+
+    def __attrs_post_init__(self) -> None:
+        if self.max_bytes <= 0:
+            raise ValueError(f"Cache size must be greater than 0: {self.max_bytes}")
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, key: CacheKey) -> Path:
+        return self.directory / f"{key.digest()}.arrow"
+
+    def _files(self) -> list[Path]:
+        return list(self.directory.glob("*.arrow"))
+
+    def stats(self) -> CacheStats:
+        return CacheStats(
+            hits=self._hits,
+            misses=self._misses,
+            evictions=self._evictions,
+            size_bytes=sum(path.stat().st_size for path in self._files()),
+        )
+
+    def get(self, key: CacheKey) -> pl.DataFrame | None:
+        path = self._path(key)
+        with self._lock:
+            try:
+                os.utime(path)
+            except FileNotFoundError:
+                self._misses += 1
+                return None
+            self._hits += 1
+        with pa.memory_map(str(path)) as source:
+            return pl.from_arrow(pa.ipc.open_file(source).read_all())
+
+    def store(self, key: CacheKey, chunks: Iterator[pl.DataFrame]) -> Iterator[pl.DataFrame]:
+        """
+        Pass ``chunks`` through while appending them to a temporary IPC file, which becomes the cached entry
+        only if the stream is consumed to the end. Memory stays bounded by a single chunk.
+        """
+        path = self._path(key)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        writer: pa.RecordBatchFileWriter | None = None
+        completed = False
+        try:
+            for chunk in chunks:
+                table = chunk.to_arrow()
+                if writer is None:
+                    writer = pa.ipc.new_file(str(tmp), table.schema)
+                writer.write_table(table)
+                yield chunk
+            completed = True
+        finally:
+            if writer is not None:
+                writer.close()
+                if completed:
+                    os.replace(tmp, path)
+                    self._evict(keep=path)
+                else:
+                    tmp.unlink(missing_ok=True)
+
+    def _evict(self, keep: Path) -> None:
+        with self._lock:
+            files = sorted(self._files(), key=lambda path: path.stat().st_mtime)
+            total = sum(path.stat().st_size for path in files)
+            for path in files:
+                if total <= self.max_bytes:
+                    break
+                if path == keep:
+                    continue
+                total -= path.stat().st_size
+                path.unlink(missing_ok=True)
+                self._evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            for path in self._files():
+                path.unlink(missing_ok=True)
@@ -0,0 +1,278 @@
+from datetime import date, datetime, timezone, tzinfo
+from decimal import Decimal
+from math import ceil, floor
+from zoneinfo import ZoneInfo
+
+import numpy as np
+import pandas as pd
+import polars as pl
+import pyarrow as pa
+
+from attrs import define, field
+
+from bafrapy.backtest.dataset.validation import validate_ohlcv_frame
+from bafrapy.backtest.money import OHLCV, Pair, SeriesBar, SeriesMeta
+
+OHLCV_VALUE_COLUMNS = (
+    "resolution",
+    "base_decimals",
+    "quote_decimals",
+    "open",
+    "high",
+    "low",
+    "close",
+    "volume",
+    "quote_volume",
+)
+
+_BASE_DECIMALS = OHLCV_VALUE_COLUMNS.index("base_decimals")
+_QUOTE_DECIMALS = OHLCV_VALUE_COLUMNS.index("quote_decimals")
+_VOLUME = OHLCV_VALUE_COLUMNS.index("volume")
+_HIGH = OHLCV_VALUE_COLUMNS.index("high")
+_LOW = OHLCV_VALUE_COLUMNS.index("low")
+#: Bars compared by the first block of ``first_touch``; every following block is four times larger.
+_TOUCH_BLOCK = 256
+#: Columns expressed with ``quote_decimals``.
+_QUOTE_SCALED = [OHLCV_VALUE_COLUMNS.index(c) for c in ("open", "high", "low", "close", "quote_volume")]
+_INT64_MAX = np.iinfo(np.int64).max
+
+
+def _rescale(values: np.ndarray, decimals: np.ndarray, target: int, name: str) -> np.ndarray:
+    shift = target - decimals
+    if (shift < 0).any():
+        raise ValueError(f"Cannot rescale to {target} {name}, the series has up to {int(decimals.max())}")
+    if shift.max() > 18:
+        raise OverflowError(f"Cannot rescale {int(decimals.min())} {name} to {target} without overflowing int64")
+    factor = np.power(10, shift, dtype=np.int64)
+    limit = (_INT64_MAX // factor).reshape(-1, *([1] * (values.ndim - 1)))
+    if (values > limit).any() or (values < -limit).any():
+        raise OverflowError(f"Rescaling to {target} {name} overflows int64")
+    return values * factor.reshape(limit.shape)
+
+
+def to_utc_datetime64(timestamp: date) -> np.datetime64:
+    """
+    Naive UTC ``datetime64[us]`` of a date or datetime, the representation used by the column arrays.
+    """
+    if isinstance(timestamp, datetime) and timestamp.tzinfo is not None:
+        timestamp = timestamp.astimezone(timezone.utc).replace(tzinfo=None)
+    return np.datetime64(timestamp, "us")
+
+
+@define(frozen=True, slots=True)
+class OHLCVColumns:
+    """
+    Contiguous column arrays of an OHLCV series. Values are stored as a C-ordered int64 matrix with one row
+    per bar (in ``OHLCV_VALUE_COLUMNS`` order) and times as naive UTC ``datetime64[us]``. The ``from_*``
+    constructors validate the whole series once, so bars are then built through ``OHLCV.trusted``.
+    """
+
+    time: np.ndarray = field()
+    values: np.ndarray = field()
+    time_zone: tzinfo | None = field(default=None)
+
+    @classmethod
+    def from_polars(cls, data: pl.DataFrame) -> "OHLCVColumns":
+        missing = [c for c in ("time", *OHLCV_VALUE_COLUMNS) if c not in data.columns]
+        if missing:
+            raise ValueError(f"Missing OHLCV columns: {missing}")
+
+        frame = data.select("time", *OHLCV_VALUE_COLUMNS)
+        nulls = [c for c, n in zip(frame.columns, frame.null_count().row(0)) if n > 0]
+        if nulls:
+            raise ValueError(f"OHLCV columns contain nulls: {nulls}")
+
+        time = frame.get_column("time")
+        if not isinstance(time.dtype, pl.Datetime):
+            raise TypeError(f"Unsupported time type: {time.dtype}")
+        time_zone = ZoneInfo(time.dtype.time_zone) if time.dtype.time_zone is not None else None
+        if time_zone is not None:
+            time = time.dt.convert_time_zone("UTC").dt.replace_time_zone(None)
+
+        values = frame.select(pl.col(c).cast(pl.Int64, strict=True) for c in OHLCV_VALUE_COLUMNS)
+        validate_ohlcv_frame(values).raise_for_failures()
+        return cls(
+            time=time.cast(pl.Datetime("us")).to_numpy(),
+            values=np.ascontiguousarray(values.to_numpy(), dtype=np.int64),
+            time_zone=time_zone,
+        )
+
+    @classmethod
+    def from_pandas(cls, data: pd.DataFrame) -> "OHLCVColumns":
+        missing = [c for c in ("time", *OHLCV_VALUE_COLUMNS) if c not in data.columns]
+        if missing:
+            raise ValueError(f"Missing OHLCV columns: {missing}")
+
+        frame = data[["time", *OHLCV_VALUE_COLUMNS]]
+        nulls = [c for c, n in frame.isna().any().items() if n]
+        if nulls:
+            raise ValueError(f"OHLCV columns contain nulls: {nulls}")
+
+        time = frame["time"]
+        if not pd.api.types.is_datetime64_any_dtype(time):
+            raise TypeError(f"Unsupported time type: {time.dtype}")
+        time_zone = time.dt.tz
+        if time_zone is not None:
+            time = time.dt.tz_convert("UTC").dt.tz_localize(None)
+
+        values = np.ascontiguousarray(frame[list(OHLCV_VALUE_COLUMNS)].to_numpy(dtype=np.int64))
+        validate_ohlcv_frame(pl.from_numpy(values, schema=list(OHLCV_VALUE_COLUMNS), orient="row")).raise_for_failures()
+        return cls(time=time.to_numpy(dtype="datetime64[us]"), values=values, time_zone=time_zone)
+
+    @classmethod
+    def from_ohlcv(cls, bars: list[OHLCV]) -> "OHLCVColumns":
+        if not bars:
+            raise ValueError("Cannot build OHLCV columns from an empty list")
+
+        time_zone = bars[0].timestamp.tzinfo
+        values = [
+            (
+                bar.resolution,
+                bar.base_decimals,
+                bar.quote_decimals,
+                bar.open,
+                bar.high,
+                bar.low,
+                bar.close,
+                bar.volume,
+                bar.quote_volume,
+            )
+            for bar in bars
+        ]
+        return cls(
+            time=np.array([to_utc_datetime64(bar.timestamp) for bar in bars], dtype="datetime64[us]"),
+            values=np.array(values, dtype=np.int64),
+            time_zone=time_zone,
+        )
+
+    @classmethod
+    def concat(cls, columns: list["OHLCVColumns"]) -> "OHLCVColumns":
+        return cls(
+            time=np.concatenate([c.time for c in columns]),
+            values=np.concatenate([c.values for c in columns]),
+            time_zone=columns[0].time_zone,
+        )
+
+    def to_polars(self) -> pl.DataFrame:
+        """
+        Frame with a naive UTC ``time`` column followed by ``OHLCV_VALUE_COLUMNS``. The original time zone is
+        kept in ``time_zone``.
+        """
+        return pl.from_numpy(self.values, schema=list(OHLCV_VALUE_COLUMNS), orient="row").insert_column(
+            0, pl.Series("time", self.time)
+        )
+
+    def to_arrow(self) -> pa.Table:
+        """
+        Table with the naive UTC ``time`` and the value matrix as a fixed size list column, so both stay single
+        contiguous buffers. The time zone is kept in the schema metadata.
+        """
+        values = pa.FixedSizeListArray.from_arrays(pa.array(self.values.reshape(-1)), len(OHLCV_VALUE_COLUMNS))
+        metadata = {"time_zone": str(self.time_zone)} if self.time_zone is not None else None
+        return pa.table({"time": pa.array(self.time), "values": values}, metadata=metadata)
+
+    @classmethod
+    def from_arrow(cls, table: pa.Table) -> "OHLCVColumns":
+        """
+        Columns viewing the buffers of a table written by ``to_arrow``, without copying or validating again.
+        """
+        table = table.combine_chunks()
+        metadata = table.schema.metadata or {}
+        time_zone = ZoneInfo(metadata[b"time_zone"].decode()) if b"time_zone" in metadata else None
+        values = table.column("values").chunk(0).flatten().to_numpy(zero_copy_only=True)
+        return cls(
+            time=table.column("time").chunk(0).to_numpy(zero_copy_only=True),
+            values=values.reshape(-1, len(OHLCV_VALUE_COLUMNS)),
+            time_zone=time_zone,
+        )
+
+    def __len__(self) -> int:
+        return self.values.shape[0]
+
+    def slice(self, start: int, stop: int) -> "OHLCVColumns":
+        return OHLCVColumns(time=self.time[start:stop], values=self.values[start:stop], time_zone=self.time_zone)
+
+    def normalize(self, quote_decimals: int | None = None, base_decimals: int | None = None) -> "OHLCVColumns":
+        """
+        Rescale every bar to the same ``quote_decimals``/``base_decimals``, the largest ones of the series by
+        default, so prices and volumes can be compared as plain integers. Raises ValueError if a target would
+        drop decimals and OverflowError if a value would not fit in int64.
+        """
+        if len(self) == 0:
+            return self
+        quote = self.values[:, _QUOTE_DECIMALS]
+        base = self.values[:, _BASE_DECIMALS]
+        quote_target = int(quote.max()) if quote_decimals is None else quote_decimals
+        base_target = int(base.max()) if base_decimals is None else base_decimals
+        if (quote == quote_target).all() and (base == base_target).all():
+            return self
+
+        values = self.values.copy()
+        values[:, _QUOTE_SCALED] = _rescale(values[:, _QUOTE_SCALED], quote, quote_target, "quote decimals")
+        values[:, _VOLUME] = _rescale(values[:, _VOLUME], base, base_target, "base decimals")
+        values[:, _QUOTE_DECIMALS] = quote_target
+        values[:, _BASE_DECIMALS] = base_target
+        return OHLCVColumns(time=self.time, values=values, time_zone=self.time_zone)
+
+    def is_sorted(self) -> bool:
+        return bool(np.all(self.time[1:] >= self.time[:-1]))
+
+    def search(self, timestamp: date, side: str = "left") -> int:
+        """
+        Binary search of ``timestamp`` in the time column, which must be sorted. ``left`` returns the index of
+        the first bar at or after it, ``right`` the index of the first bar after it.
+        """
+        return int(np.searchsorted(self.time, to_utc_datetime64(timestamp), side=side))
+
+    def first_touch(
+        self, start: int, stop: int, below: int | Decimal | None = None, above: int | Decimal | None = None
+    ) -> int:
+        """
+        Index of the first bar in ``[start, stop)`` whose low is at or under ``below`` or whose high is at or
+        over ``above``, or ``stop`` when there is none. Prices are compared in the scaled integers of the
+        series. Blocks of growing size are scanned, so a touch close to ``start`` does not cost a scan of the
+        whole range.
+        """
+        low = self.values[:, _LOW]
+        high = self.values[:, _HIGH]
+        below = None if below is None else floor(below)
+        above = None if above is None else ceil(above)
+        size = _TOUCH_BLOCK
+        while start < stop:
+            end = min(start + size, stop)
+            touched = np.zeros(end - start, dtype=bool)
+            if below is not None:
+                touched |= low[start:end] <= below
+            if above is not None:
+                touched |= high[start:end] >= above
+            if touched.any():
+                return start + int(touched.argmax())
+            start, size = end, size * 4
+        return stop
+
+    def timestamp(self, index: int) -> datetime:
+        timestamp = self.time[index].item()
+        if self.time_zone is not None:
+            return timestamp.replace(tzinfo=timezone.utc).astimezone(self.time_zone)
+        return timestamp
+
+    def ohlcv(self, index: int, pair: Pair) -> OHLCV:
+        resolution, base_decimals, quote_decimals, *prices = self.values[index].tolist()
+        return OHLCV.trusted(pair, resolution, base_decimals, quote_decimals, self.timestamp(index), *prices)
+
+    def series_bars(self, pair: Pair) -> list[SeriesBar]:
+        """
+        Every bar as a ``SeriesBar`` sharing one ``SeriesMeta``. The resolution and decimals must be the same
+        for the whole series, see ``normalize``.
+        """
+        if len(self) == 0:
+            return []
+        shared = self.values[:, : _QUOTE_DECIMALS + 1]
+        if (shared != shared[0]).any():
+            raise ValueError("Series bars need the same resolution and decimals on every row")
+        resolution, base_decimals, quote_decimals = shared[0].tolist()
+        meta = SeriesMeta(pair=pair, resolution=resolution, base_decimals=base_decimals, quote_decimals=quote_decimals)
+        return [
+            SeriesBar.trusted(meta, self.timestamp(i), *prices)
+            for i, prices in enumerate(self.values[:, _QUOTE_DECIMALS + 1 :].tolist())
+        ]
@@ -1,10 +1,14 @@
 from collections.abc import Iterator
 from datetime import date
-from itertools import chain
 
-from attrs import define, field
+import polars as pl
+
+from attrs import define, evolve, field
 
 from bafrapy.backtest.dataset.base import DataSet
+from bafrapy.backtest.dataset.cache import CacheKey, OHLCVCache
+from bafrapy.backtest.dataset.columns import OHLCVColumns
+from bafrapy.backtest.dataset.prefetch import Prefetcher
 from bafrapy.backtest.money import OHLCV
 from bafrapy.datawarehouse.base import OHLCVRepository
 
@@ -16,46 +20,90 @@ class DucklakeDataSet(DataSet):
     start: date
     end: date
     chunk_size: int = 100_000
-    _ohlcv: Iterator[OHLCV] = field(init=False)
-    _peek: OHLCV | None = field(default=None, init=False)
+    #: Number of chunks fetched and converted ahead on a background thread. 0 fetches lazily on the caller.
+    prefetch: int = 0
+    #: Local cache of fetched ranges. Requires the repository to report its current snapshot.
+    cache: OHLCVCache | None = None
+    _chunks: Iterator[OHLCVColumns] = field(init=False)
+    _chunk: OHLCVColumns | None = field(default=None, init=False)
+    _chunk_index: int = field(default=0, init=False)
 
     def __attrs_post_init__(self) -> None:
-        chunks = self.repository.get_ohlcv_stream(
-            self.exchange,
-            f"{self.pair.base.symbol}{self.pair.quote.symbol}",
-            self.resolution,
-            self.start,
-            self.end,
-            self.chunk_size,
+        super().__attrs_post_init__()
+        if self.prefetch < 0:
+            raise ValueError(f"Prefetch depth cannot be negative: {self.prefetch}")
+        self._require_scale_targets()
+        self._chunks = self._open_chunks()
+
+    def _open_chunks(self) -> Iterator[OHLCVColumns]:
+        columns = (
+            self._scale(OHLCVColumns.from_polars(chunk)) for chunk in self._chunk_stream() if not chunk.is_empty()
+        )
+        return Prefetcher(columns, self.prefetch) if self.prefetch > 0 else columns
+
+    def _chunk_stream(self) -> Iterator[pl.DataFrame]:
+        symbol = f"{self.pair.base.symbol}{self.pair.quote.symbol}"
+        if self.cache is None:
+            return self.repository.get_ohlcv_stream(
+                self.exchange, symbol, self.resolution, self.start, self.end, self.chunk_size
+            )
+
+        key = CacheKey(
+            exchange=self.exchange,
+            symbol=symbol,
+            resolution=self.resolution,
+            start=self.start,
+            end=self.end,
+            snapshot=self.repository.current_snapshot(),
         )
-        rows = chain.from_iterable(chunk.iter_rows(named=True) for chunk in chunks if not chunk.is_empty())
-        self._ohlcv = map(self._row_to_ohlcv, rows)
-
-    def _row_to_ohlcv(self, row: dict) -> OHLCV:
-        return OHLCV(
-            pair=self.pair,
-            resolution=int(row["resolution"]),
-            base_decimals=int(row["base_decimals"]),
-            quote_decimals=int(row["quote_decimals"]),
-            timestamp=row["time"],
-            open=int(row["open"]),
-            high=int(row["high"]),
-            low=int(row["low"]),
-            close=int(row["close"]),
-            volume=int(row["volume"]),
-            quote_volume=int(row["quote_volume"]),
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached.iter_slices(self.chunk_size)
+        return self.cache.store(
+            key,
+            self.repository.get_ohlcv_stream(
+                self.exchange, symbol, self.resolution, self.start, self.end, self.chunk_size
+            ),
         )
 
+    def _current_chunk(self) -> OHLCVColumns | None:
+        while self._chunk is None or self._chunk_index >= len(self._chunk):
+            self._chunk = next(self._chunks, None)
+            self._chunk_index = 0
+            if self._chunk is None:
+                # Stops the prefetch thread as soon as the stream is exhausted.
+                self.close()
+                return None
+        return self._chunk
+
     def next_data(self) -> OHLCV | None:
-        if self._peek is not None:
-            self.current_data = self._peek
-            self._peek = None
-            return self.current_data
-        self.current_data = next(self._ohlcv, None)
-        return self.current_data
+        chunk = self._current_chunk()
+        if chunk is None:
+            self.current_data = None
+            return None
+        index = self._chunk_index
+        self._chunk_index += 1
+        return self._serve(chunk, index)
 
     def has_data(self) -> bool:
-        if self._peek is not None:
-            return True
-        self._peek = next(self._ohlcv, None)
-        return self._peek is not None
+        return self._current_chunk() is not None
+
+    def close(self) -> None:
+        if isinstance(self._chunks, Prefetcher):
+            self._chunks.close()
+        self._chunks = iter(())
+        self._chunk = None
+
+    def seek(self, timestamp: date) -> None:
+        """
+        Restart the stream at ``timestamp``. The new start is pushed down to the repository query, so the
+        skipped bars are never fetched.
+        """
+        self.close()
+        self.start = timestamp
+        self._chunks = self._open_chunks()
+        self._chunk_index = 0
+        self._reset()
+
+    def slice(self, start: date, end: date) -> "DucklakeDataSet":
+        return evolve(self, start=start, end=end)
@@ -0,0 +1,126 @@
+from datetime import datetime
+from enum import Enum
+from heapq import heapify, heappop, heappush
+
+from attrs import define, field
+
+from bafrapy.backtest.dataset.base import DataSet
+from bafrapy.backtest.money import OHLCV, Pair
+
+
+class MissingBarPolicy(Enum):
+    """
+    What a MultiPairDataSet does with a timestamp where some pairs have no bar.
+    """
+
+    skip = 1  #: The timestamp is not emitted unless every pair has a bar.
+    #: A flat bar at the last close of the pair with zero volume, so no price that did not trade is reached.
+    #: None before its first bar.
+    forward_fill = 2
+    mark = 3  #: The bar of the pair is None.
+
+
+@define(frozen=True, slots=True)
+class OHLCVBundle:
+    timestamp: datetime
+    pairs: tuple[Pair, ...]
+    #: Bars aligned with ``pairs``.
+    bars: tuple[OHLCV | None, ...]
+    _index: dict[Pair, int] = field(alias="index", eq=False, repr=False)
+
+    def __getitem__(self, pair: Pair) -> OHLCV | None:
+        return self.bars[self._index[pair]]
+
+    def missing(self) -> list[Pair]:
+        return [pair for pair, bar in zip(self.pairs, self.bars) if bar is None]
+
+
+@define
+class MultiPairDataSet:
+    """
+    Merges several single pair datasets by timestamp with a heap keyed by each dataset's next bar, so every
+    bar costs O(log k) for k datasets. One OHLCVBundle is emitted per distinct timestamp.
+    """
+
+    datasets: list[DataSet]
+    policy: MissingBarPolicy = MissingBarPolicy.mark
+    current_data: OHLCVBundle | None = field(default=None, init=False)
+    _pairs: tuple[Pair, ...] = field(init=False)
+    _index: dict[Pair, int] = field(init=False)
+    _heap: list[tuple[datetime, int, OHLCV]] = field(init=False)
+    _last: list[OHLCV | None] = field(init=False)
+    _peek: OHLCVBundle | None = field(default=None, init=False)
+
+    def __attrs_post_init__(self) -> None:
+        if not self.datasets:
+            raise ValueError("At least one dataset is required")
+        self._pairs = tuple(dataset.pair for dataset in self.datasets)
+        if len(set(self._pairs)) != len(self._pairs):
+            raise ValueError(f"Datasets must have different pairs: {self._pairs}")
+        resolutions = {dataset.resolution for dataset in self.datasets}
+        if len(resolutions) != 1:
+            raise ValueError(f"Datasets must share the same resolution: {sorted(resolutions)}")
+
+        self._index = {pair: i for i, pair in enumerate(self._pairs)}
+        self._last = [None] * len(self.datasets)
+        self._heap = []
+        for i, dataset in enumerate(self.datasets):
+            bar = dataset.next_data()
+            if bar is not None:
+                self._heap.append((bar.timestamp, i, bar))
+        heapify(self._heap)
+
+    @property
+    def pairs(self) -> tuple[Pair, ...]:
+        return self._pairs
+
+    def get_current_data(self) -> OHLCVBundle | None:
+        return self.current_data
+
+    def _advance(self) -> OHLCVBundle | None:
+        heap = self._heap
+        while heap:
+            timestamp = heap[0][0]
+            bars: list[OHLCV | None] = [None] * len(self._pairs)
+            while heap and heap[0][0] == timestamp:
+                _, i, bar = heappop(heap)
+                bars[i] = bar
+                self._last[i] = bar
+                following = self.datasets[i].next_data()
+                if following is not None:
+                    heappush(heap, (following.timestamp, i, following))
+
+            if self.policy is MissingBarPolicy.skip and None in bars:
+                continue
+            if self.policy is MissingBarPolicy.forward_fill:
+                for i, bar in enumerate(bars):
+                    if bar is None and self._last[i] is not None:
+                        bars[i] = self._fill(self._last[i], timestamp)
+            return OHLCVBundle(timestamp=timestamp, pairs=self._pairs, bars=tuple(bars), index=self._index)
+        return None
+
+    @staticmethod
+    def _fill(last: OHLCV, timestamp: datetime) -> OHLCV:
+        return OHLCV.trusted(
+            last.pair,
+            last.resolution,
+            last.base_decimals,
+            last.quote_decimals,
+            timestamp,
+            last.close,
+            last.close,
+            last.close,
+            last.close,
+        )
+
+    def next_data(self) -> OHLCVBundle | None:
+        if self._peek is not None:
+            self.current_data, self._peek = self._peek, None
+        else:
+            self.current_data = self._advance()
+        return self.current_data
+
+    def has_data(self) -> bool:
+        if self._peek is None:
+            self._peek = self._advance()
+        return self._peek is not None
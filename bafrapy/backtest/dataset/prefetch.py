@@ -0,0 +1,116 @@
+import weakref
+
+from collections.abc import Iterator
+from queue import Empty, Full, Queue
+from threading import Event, Thread, current_thread
+from typing import Generic, TypeVar
+
+from attrs import define, field
+
+T = TypeVar("T")
+
+
+@define(frozen=True, slots=True)
+class _Failure:
+    exception: Exception
+
+
+_END = object()
+
+
+def _put(queue: Queue, stop: Event, item: object) -> bool:
+    while not stop.is_set():
+        try:
+            queue.put(item, timeout=0.1)
+            return True
+        except Full:
+            continue
+    return False
+
+
+def _produce(source: Iterator, queue: Queue, stop: Event) -> None:
+    # Runs without a reference to the Prefetcher, so an abandoned one can be collected and stop this thread.
+    end = _END
+    try:
+        for item in source:
+            if not _put(queue, stop, item):
+                return
+    except Exception as exc:
+        end = _Failure(exc)
+    finally:
+        close = getattr(source, "close", None)
+        if close is not None:
+            close()
+    _put(queue, stop, end)
+
+
+def _shutdown(stop: Event, thread: Thread) -> None:
+    stop.set()
+    if thread is not current_thread():
+        thread.join()
+
+
+@define
+class Prefetcher(Generic[T]):
+    """
+    Iterator that consumes ``source`` on a background thread, keeping at most ``depth`` items ready ahead of
+    the consumer. At any time there are no more than ``depth + 2`` items alive: the one being consumed, the
+    queued ones and the one the producer is building. The thread stops and closes ``source`` on ``close``, at
+    the end of a ``with`` block or when the prefetcher is garbage collected.
+    """
+
+    source: Iterator[T]
+    depth: int
+    _queue: Queue = field(init=False)
+    _stop: Event = field(factory=Event, init=False)
+    _thread: Thread = field(init=False)
+    _finalizer: weakref.finalize = field(init=False)
+    _done: bool = field(default=False, init=False)
+
+    def __attrs_post_init__(self) -> None:
+        if self.depth <= 0:
+            raise ValueError(f"Prefetch depth must be greater than 0: {self.depth}")
+        self._queue = Queue(maxsize=self.depth)
+        self._thread = Thread(
+            target=_produce, args=(self.source, self._queue, self._stop), name="dataset-prefetch", daemon=True
+        )
+        self._thread.start()
+        self._finalizer = weakref.finalize(self, _shutdown, self._stop, self._thread)
+
+    def __iter__(self) -> "Prefetcher[T]":
+        return self
+
+    def __enter__(self) -> "Prefetcher[T]":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def _get(self) -> object:
+        while True:
+            try:
+                return self._queue.get(timeout=0.1)
+            except Empty:
+                # The producer died without an end marker, e.g. on a SystemExit raised by the source.
+                if not self._thread.is_alive() and self._queue.empty():
+                    raise RuntimeError("Prefetch thread stopped before the end of its source") from None
+
+    def __next__(self) -> T:
+        if self._done:
+            raise StopIteration
+        try:
+            item = self._get()
+        except RuntimeError:
+            self._done = True
+            raise
+        if item is _END:
+            self._done = True
+            raise StopIteration
+        if isinstance(item, _Failure):
+            self._done = True
+            raise item.exception
+        return item
+
+    def close(self) -> None:
+        self._done = True
+        self._finalizer()
@@ -0,0 +1,160 @@
+from datetime import date, datetime, time, timedelta, timezone
+
+import numpy as np
+import polars as pl
+
+from attrs import Factory, define, evolve, field
+
+from bafrapy.backtest.dataset.base import ColumnarDataSet, DataSet
+from bafrapy.backtest.dataset.columns import OHLCVColumns
+from bafrapy.backtest.money import OHLCV, Pair
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+PRICE_COLUMNS = ("open", "high", "low", "close", "quote_volume")
+
+
+@define(kw_only=True)
+class ResampledDataSet(DataSet):
+    """
+    Streams bars of ``resolution`` built from a finer ``source`` dataset. Buckets are aligned to the epoch
+    (``group_by_dynamic`` windows), so 1d bars start at 00:00 UTC and 4h bars at 00:00, 04:00, ... UTC.
+
+    Source bars are pulled ``batch_size`` at a time and only the rows of the last, still open bucket are
+    kept between pulls, so memory does not depend on the length of the series. Bars inside a bucket may use
+    different decimals; they are rescaled to the largest ``quote_decimals``/``base_decimals`` of the bucket
+    before aggregating, so no precision is lost.
+    """
+
+    source: DataSet
+    pair: Pair = field(default=Factory(lambda self: self.source.pair, takes_self=True))
+    batch_size: int = 10_000
+    _pending: OHLCVColumns | None = field(default=None, init=False)
+    _exhausted: bool = field(default=False, init=False)
+    _bars: OHLCVColumns | None = field(default=None, init=False)
+    _bar_index: int = field(default=0, init=False)
+
+    def __attrs_post_init__(self) -> None:
+        super().__attrs_post_init__()
+        if self.pair != self.source.pair:
+            raise ValueError(f"Resampled pair {self.pair} does not match source pair {self.source.pair}")
+        if self.resolution <= self.source.resolution or self.resolution % self.source.resolution != 0:
+            raise ValueError(
+                f"Resolution {self.resolution} must be a multiple of source resolution {self.source.resolution}"
+            )
+        if self.batch_size <= 0:
+            raise ValueError(f"Batch size must be greater than 0: {self.batch_size}")
+        self._require_scale_targets()
+
+    @property
+    def _every(self) -> str:
+        return f"{self.resolution}s"
+
+    def _bucket_floor(self, timestamp: date) -> tuple[datetime, bool]:
+        if not isinstance(timestamp, datetime):
+            timestamp = datetime.combine(timestamp, time(), tzinfo=timezone.utc)
+        elif timestamp.tzinfo is None:
+            timestamp = timestamp.replace(tzinfo=timezone.utc)
+        offset = (timestamp - _EPOCH) % timedelta(seconds=self.resolution)
+        return timestamp - offset, bool(offset)
+
+    def _bucket_ceil(self, timestamp: date) -> datetime:
+        bucket, inside = self._bucket_floor(timestamp)
+        return bucket + timedelta(seconds=self.resolution) if inside else bucket
+
+    def _pull(self) -> OHLCVColumns | None:
+        if isinstance(self.source, ColumnarDataSet):
+            return next(self.source.iter_batches(self.batch_size), None)
+
+        bars: list[OHLCV] = []
+        while len(bars) < self.batch_size and (bar := self.source.next_data()) is not None:
+            bars.append(bar)
+        return OHLCVColumns.from_ohlcv(bars) if bars else None
+
+    def _aggregate(self, columns: OHLCVColumns) -> OHLCVColumns:
+        frame = (
+            columns.to_polars()
+            .with_columns(pl.col("time").dt.truncate(self._every).alias("bucket"))
+            .with_columns(
+                pl.col("quote_decimals").max().over("bucket").alias("bucket_quote_decimals"),
+                pl.col("base_decimals").max().over("bucket").alias("bucket_base_decimals"),
+            )
+            .with_columns(
+                *[
+                    pl.col(c) * pl.lit(10, pl.Int64).pow(pl.col("bucket_quote_decimals") - pl.col("quote_decimals"))
+                    for c in PRICE_COLUMNS
+                ],
+                pl.col("volume") * pl.lit(10, pl.Int64).pow(pl.col("bucket_base_decimals") - pl.col("base_decimals")),
+            )
+            .group_by_dynamic("time", every=self._every, closed="left", label="left")
+            .agg(
+                pl.col("open").first(),
+                pl.col("high").max(),
+                pl.col("low").min(),
+                pl.col("close").last(),
+                pl.col("volume").sum(),
+                pl.col("quote_volume").sum(),
+                pl.col("bucket_base_decimals").first().alias("base_decimals"),
+                pl.col("bucket_quote_decimals").first().alias("quote_decimals"),
+            )
+            .with_columns(pl.lit(self.resolution, pl.Int64).alias("resolution"))
+        )
+        return self._scale(evolve(OHLCVColumns.from_polars(frame), time_zone=columns.time_zone))
+
+    def _next_bars(self) -> OHLCVColumns | None:
+        while not self._exhausted:
+            batch = self._pull()
+            if batch is None:
+                self._exhausted = True
+                break
+
+            if self._pending is not None:
+                batch = OHLCVColumns.concat([self._pending, batch])
+            last_time = int(batch.time[-1].astype("int64"))
+            last_bucket = np.datetime64(last_time - last_time % (self.resolution * 1_000_000), "us")
+            split = int(batch.time.searchsorted(last_bucket, side="left"))
+            self._pending = batch.slice(split, len(batch))
+            if split > 0:
+                return self._aggregate(batch.slice(0, split))
+
+        pending, self._pending = self._pending, None
+        return self._aggregate(pending) if pending is not None else None
+
+    def _current_bars(self) -> OHLCVColumns | None:
+        while self._bars is None or self._bar_index >= len(self._bars):
+            self._bars = self._next_bars()
+            self._bar_index = 0
+            if self._bars is None:
+                return None
+        return self._bars
+
+    def next_data(self) -> OHLCV | None:
+        bars = self._current_bars()
+        if bars is None:
+            self.current_data = None
+            return None
+        index = self._bar_index
+        self._bar_index += 1
+        return self._serve(bars, index)
+
+    def has_data(self) -> bool:
+        return self._current_bars() is not None
+
+    def seek(self, timestamp: date) -> None:
+        """
+        Move to the first bucket starting at or after ``timestamp``, so the next bar is always complete.
+        """
+        self.source.seek(self._bucket_ceil(timestamp))
+        self._pending = None
+        self._exhausted = False
+        self._bars = None
+        self._bar_index = 0
+        self._reset()
+
+    def slice(self, start: date, end: date) -> "ResampledDataSet":
+        """
+        Buckets starting between ``start`` and ``end``, both included, built from complete source buckets.
+        """
+        last, _ = self._bucket_floor(end)
+        last += timedelta(seconds=self.resolution) - timedelta(microseconds=1)
+        return evolve(self, source=self.source.slice(self._bucket_ceil(start), last))
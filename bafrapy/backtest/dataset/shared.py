@@ -0,0 +1,73 @@
+from collections.abc import Iterator
+from pathlib import Path
+
+import pyarrow as pa
+
+from attrs import define, evolve, field
+
+from bafrapy.backtest.dataset.base import ColumnarDataSet, _split_bounds, _window_bounds
+from bafrapy.backtest.dataset.columns import OHLCVColumns
+from bafrapy.backtest.money import Pair
+
+
+@define(kw_only=True)
+class ArrowDataSet(ColumnarDataSet):
+    """
+    Dataset over a table laid out by ``OHLCVColumns.to_arrow``. The columns are views of the table buffers, so
+    a memory mapped table is never copied into the process.
+    """
+
+    data: pa.Table
+
+    def _load_columns(self) -> OHLCVColumns:
+        return OHLCVColumns.from_arrow(self.data)
+
+    def _slice_data(self, start: int, stop: int) -> pa.Table:
+        return self.data.slice(start, stop - start)
+
+
+@define(frozen=True, slots=True)
+class DataSetShard:
+    """
+    Picklable reference to the rows ``[start, stop)`` of an OHLCV IPC file written by ``share``. Sending a
+    shard to a worker costs a few bytes instead of the whole series; ``open`` memory maps the file, so all
+    the processes of a host read the same pages. Place the file under ``/dev/shm`` to keep it in shared memory.
+    """
+
+    path: Path = field(converter=Path)
+    pair: Pair
+    resolution: int
+    start: int
+    stop: int
+
+    @classmethod
+    def share(cls, dataset: ColumnarDataSet, path: Path | str) -> "DataSetShard":
+        """
+        Write the columns of ``dataset`` to an uncompressed IPC file at ``path`` and return a shard over all
+        its rows.
+        """
+        path = Path(path)
+        table = dataset.columns.to_arrow()
+        with pa.OSFile(str(path), "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+        return cls(path=path, pair=dataset.pair, resolution=dataset.resolution, start=0, stop=len(table))
+
+    def __len__(self) -> int:
+        return self.stop - self.start
+
+    def split(self, n: int) -> list["DataSetShard"]:
+        return [evolve(self, start=self.start + a, stop=self.start + b) for a, b in _split_bounds(len(self), n)]
+
+    def windows(self, size: int, step: int) -> Iterator["DataSetShard"]:
+        for a, b in _window_bounds(len(self), size, step):
+            yield evolve(self, start=self.start + a, stop=self.start + b)
+
+    def open(self, lookback: int = 0) -> ArrowDataSet:
+        with pa.memory_map(str(self.path)) as source:
+            table = pa.ipc.open_file(source).read_all()
+        return ArrowDataSet(
+            pair=self.pair,
+            resolution=self.resolution,
+            lookback=lookback,
+            data=table.slice(self.start, len(self)),
+        )
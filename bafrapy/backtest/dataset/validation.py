@@ -0,0 +1,49 @@
+import polars as pl
+
+from attrs import define
+
+from bafrapy.backtest.exceptions import InvalidOHLCVData
+
+OHLCV_CHECKS = {
+    "negative_values": pl.min_horizontal("open", "high", "low", "close", "volume", "quote_volume") < 0,
+    "high_below_low": pl.col("high") < pl.col("low"),
+    "close_out_of_range": (pl.col("close") < pl.col("low")) | (pl.col("close") > pl.col("high")),
+    "invalid_decimals": (pl.col("base_decimals") < 0) | (pl.col("quote_decimals") < 0),
+    "invalid_resolution": pl.col("resolution") <= 0,
+}
+
+
+@define(frozen=True, slots=True)
+class OHLCVValidation:
+    #: One row per failing bar: its ``row`` index in the validated frame and a boolean column per check.
+    failures: pl.DataFrame
+
+    @property
+    def is_valid(self) -> bool:
+        return self.failures.is_empty()
+
+    @property
+    def rows(self) -> list[int]:
+        return self.failures.get_column("row").to_list()
+
+    @property
+    def failed_checks(self) -> list[str]:
+        return [check for check in OHLCV_CHECKS if self.failures.get_column(check).any()]
+
+    def raise_for_failures(self) -> None:
+        if not self.is_valid:
+            raise InvalidOHLCVData(self.rows, self.failed_checks)
+
+
+def validate_ohlcv_frame(data: pl.DataFrame) -> OHLCVValidation:
+    """
+    Check every bar of an integer OHLCV frame with the same rules ``OHLCV`` applies per instance, in a single
+    Polars pass. Bars of a frame that passes can be built with ``OHLCV.trusted``.
+    """
+    failures = (
+        data.lazy()
+        .select(pl.int_range(pl.len(), dtype=pl.UInt32).alias("row"), **OHLCV_CHECKS)
+        .filter(pl.any_horizontal(*OHLCV_CHECKS))
+        .collect()
+    )
+    return OHLCVValidation(failures=failures)
@@ -0,0 +1,112 @@
+import numpy as np
+
+from attrs import define, field
+
+from bafrapy.backtest.dataset.columns import (
+    OHLCV_VALUE_COLUMNS,
+    OHLCVColumns,
+    to_utc_datetime64,
+)
+from bafrapy.backtest.money import OHLCV
+
+_OPEN, _HIGH, _LOW, _CLOSE, _VOLUME, _QUOTE_VOLUME = (
+    OHLCV_VALUE_COLUMNS.index(c) for c in ("open", "high", "low", "close", "volume", "quote_volume")
+)
+
+
+@define(slots=True)
+class LookbackWindow:
+    """
+    Fixed capacity ring buffer with the last bars of a dataset stored column by column.
+
+    Every bar is written twice, at ``i`` and ``i + capacity``, so the last ``n`` bars are always a contiguous
+    slice. Appending is O(1) and the accessors return NumPy views instead of copies. Views alias the buffer,
+    so they are only valid until the next append; copy them to keep the values.
+    """
+
+    capacity: int
+    _time: np.ndarray = field(init=False)
+    _values: np.ndarray = field(init=False)
+    _position: int = field(default=0, init=False)
+    _size: int = field(default=0, init=False)
+
+    def __attrs_post_init__(self) -> None:
+        if self.capacity <= 0:
+            raise ValueError(f"Window capacity must be greater than 0: {self.capacity}")
+        self._time = np.zeros(2 * self.capacity, dtype="datetime64[us]")
+        self._values = np.zeros((len(OHLCV_VALUE_COLUMNS), 2 * self.capacity), dtype=np.int64)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def push(self, time: np.datetime64, values: np.ndarray) -> None:
+        """
+        Append one bar given as a naive UTC time and a row ordered as ``OHLCV_VALUE_COLUMNS``.
+        """
+        position = self._position
+        mirror = position + self.capacity
+        self._time[position] = self._time[mirror] = time
+        self._values[:, position] = self._values[:, mirror] = values
+        self._position = position + 1 if position + 1 < self.capacity else 0
+        if self._size < self.capacity:
+            self._size += 1
+
+    def append(self, bar: OHLCV) -> None:
+        self.push(
+            to_utc_datetime64(bar.timestamp),
+            np.array(
+                (
+                    bar.resolution,
+                    bar.base_decimals,
+                    bar.quote_decimals,
+                    bar.open,
+                    bar.high,
+                    bar.low,
+                    bar.close,
+                    bar.volume,
+                    bar.quote_volume,
+                ),
+                dtype=np.int64,
+            ),
+        )
+
+    def extend(self, columns: OHLCVColumns) -> None:
+        count = min(len(columns), self.capacity)
+        for i in range(len(columns) - count, len(columns)):
+            self.push(columns.time[i], columns.values[i])
+
+    def clear(self) -> None:
+        self._position = 0
+        self._size = 0
+
+    def _slice(self, n: int | None) -> slice:
+        if n is None:
+            n = self._size
+        if n < 0 or n > self._size:
+            raise ValueError(f"Window holds {self._size} bars, cannot view {n}")
+        end = self._position + self.capacity
+        return slice(end - n, end)
+
+    def time(self, n: int | None = None) -> np.ndarray:
+        return self._time[self._slice(n)]
+
+    def values(self, column: str, n: int | None = None) -> np.ndarray:
+        return self._values[OHLCV_VALUE_COLUMNS.index(column), self._slice(n)]
+
+    def open(self, n: int | None = None) -> np.ndarray:
+        return self._values[_OPEN, self._slice(n)]
+
+    def high(self, n: int | None = None) -> np.ndarray:
+        return self._values[_HIGH, self._slice(n)]
+
+    def low(self, n: int | None = None) -> np.ndarray:
+        return self._values[_LOW, self._slice(n)]
+
+    def close(self, n: int | None = None) -> np.ndarray:
+        return self._values[_CLOSE, self._slice(n)]
+
+    def volume(self, n: int | None = None) -> np.ndarray:
+        return self._values[_VOLUME, self._slice(n)]
+
+    def quote_volume(self, n: int | None = None) -> np.ndarray:
+        return self._values[_QUOTE_VOLUME, self._slice(n)]
@@ -75,3 +75,14 @@ class InvalidStateExecutedCompositeOrder(OrderException):
 
     def __str__(self):
         return f"InvalidStateExecutedCompositeOrder: order with {self.order_id} was executed but its state is invalid"
+
+
+class InvalidOHLCVData(ValueError):
+    def __init__(self, rows: list[int], checks: list[str]):
+        self.rows = rows
+        self.checks = checks
+
+    def __str__(self):
+        shown = ", ".join(str(row) for row in self.rows[:10])
+        more = f" and {len(self.rows) - 10} more" if len(self.rows) > 10 else ""
+        return f"InvalidOHLCVData: rows {shown}{more} failed checks {self.checks}"
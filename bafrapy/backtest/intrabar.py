@@ -0,0 +1,118 @@
+from abc import ABC, abstractmethod
+from datetime import timedelta
+
+import numpy as np
+
+from attrs import define, field
+
+from bafrapy.backtest.dataset.columns import OHLCV_VALUE_COLUMNS, OHLCVColumns
+from bafrapy.backtest.money import OHLCV
+
+_PRICES = [OHLCV_VALUE_COLUMNS.index(c) for c in ("open", "high", "low", "close")]
+
+
+def touch_times(waypoints: np.ndarray, prices: np.ndarray, below: np.ndarray) -> np.ndarray:
+    """
+    Distance travelled along the straight lines joining ``waypoints`` when the price first reaches each of
+    ``prices``: going down to it where ``below`` is set, going up to it elsewhere. ``inf`` when the path never
+    reaches the price. Every price is resolved with one binary search over the running extremes.
+    """
+    waypoints = np.asarray(waypoints, dtype=np.float64)
+    prices = np.asarray(prices, dtype=np.float64)
+    below = np.asarray(below, dtype=bool)
+    elapsed = np.concatenate(([0.0], np.cumsum(np.abs(np.diff(waypoints)))))
+    times = np.full(len(prices), np.inf)
+
+    for side, running, sign in ((below, np.minimum, -1.0), (~below, np.maximum, 1.0)):
+        if not side.any():
+            continue
+        # ``sign * extreme`` is non-decreasing, so the first waypoint reaching a price is a binary search.
+        extreme = sign * running.accumulate(waypoints)
+        target = sign * prices[side]
+        index = np.searchsorted(extreme, target, side="left")
+        reached = index < len(waypoints)
+        index = np.minimum(index, len(waypoints) - 1)
+        before = np.maximum(index - 1, 0)
+        # Travel from the waypoint before the one that reaches the price, or none when the open already does.
+        travel = np.where(index > 0, target - sign * waypoints[before], 0.0)
+        times[side] = np.where(reached, np.where(index > 0, elapsed[before], 0.0) + travel, np.inf)
+    return times
+
+
+class IntrabarPath(ABC):
+    """
+    Deterministic route of the price within a candle, given as waypoints from the open to the close joined by
+    straight lines. It decides which of the orders triggered by a candle is reached first.
+    """
+
+    @abstractmethod
+    def route(self, open: np.ndarray, high: np.ndarray, low: np.ndarray, close: np.ndarray) -> np.ndarray:
+        """
+        Waypoints of ``n`` candles given column by column, one row per candle.
+        """
+
+    def waypoints(self, ohlcv: OHLCV) -> np.ndarray:
+        return self.route(*(np.array([v]) for v in (ohlcv.open, ohlcv.high, ohlcv.low, ohlcv.close)))[0]
+
+    def touch_times(self, ohlcv: OHLCV, prices: np.ndarray, below: np.ndarray) -> np.ndarray:
+        """
+        When the path of ``ohlcv`` first reaches each of ``prices``, see ``touch_times``.
+        """
+        return touch_times(self.waypoints(ohlcv), prices, below)
+
+
+@define(frozen=True)
+class OHLCPath(IntrabarPath):
+    """
+    Open, high, low and close.
+    """
+
+    def route(self, open: np.ndarray, high: np.ndarray, low: np.ndarray, close: np.ndarray) -> np.ndarray:
+        return np.stack([open, high, low, close], axis=1)
+
+
+@define(frozen=True)
+class OLHCPath(IntrabarPath):
+    """
+    Open, low, high and close.
+    """
+
+    def route(self, open: np.ndarray, high: np.ndarray, low: np.ndarray, close: np.ndarray) -> np.ndarray:
+        return np.stack([open, low, high, close], axis=1)
+
+
+@define(frozen=True)
+class NearestExtremePath(IntrabarPath):
+    """
+    Open, the extreme nearest to the open, the other extreme and close. Ties go to the low first, the
+    pessimistic order for a long position.
+    """
+
+    def route(self, open: np.ndarray, high: np.ndarray, low: np.ndarray, close: np.ndarray) -> np.ndarray:
+        high_first = (high - open) < (open - low)
+        first = np.where(high_first, high, low)
+        second = np.where(high_first, low, high)
+        return np.stack([open, first, second, close], axis=1)
+
+
+@define(frozen=True)
+class SubBarPath(IntrabarPath):
+    """
+    Route through the candles of a lower resolution series, e.g. minute bars for hourly candles, each of them
+    routed by ``path``. Candles without sub-bars fall back to ``path``. Sub-bars must use the same quote
+    decimals as the candles.
+    """
+
+    #: Lower resolution series, sorted by time.
+    columns: OHLCVColumns
+    path: IntrabarPath = field(factory=NearestExtremePath)
+
+    def waypoints(self, ohlcv: OHLCV) -> np.ndarray:
+        start = self.columns.search(ohlcv.timestamp, "left")
+        stop = self.columns.search(ohlcv.timestamp + timedelta(seconds=ohlcv.resolution), "left")
+        if start == stop:
+            return self.path.waypoints(ohlcv)
+        return self.path.route(*self.columns.values[start:stop, _PRICES].T).ravel()
+
+    def route(self, open: np.ndarray, high: np.ndarray, low: np.ndarray, close: np.ndarray) -> np.ndarray:
+        return self.path.route(open, high, low, close)
@@ -1,7 +1,26 @@
+from bafrapy.backtest.money.array import EMoneyArray
+from bafrapy.backtest.money.conversion import ConversionGraph
 from bafrapy.backtest.money.currency import Currency
-from bafrapy.backtest.money.emoney import EMoney, Normalizer
-from bafrapy.backtest.money.ohlcv import OHLCV, Pair
+from bafrapy.backtest.money.emoney import EMoney, Normalizer, Ratio
+from bafrapy.backtest.money.ledger import Ledger
+from bafrapy.backtest.money.ohlcv import OHLCV, Pair, SeriesBar, SeriesMeta
 from bafrapy.backtest.money.rate import ERate
-from bafrapy.backtest.money.wallet import SpotWallet, Wallet
+from bafrapy.backtest.money.wallet import FastSpotWallet, SpotWallet, Wallet
 
-__all__ = ["EMoney", "Currency", "ERate", "Wallet", "SpotWallet", "Normalizer", "OHLCV", "Pair"]
+__all__ = [
+    "EMoney",
+    "EMoneyArray",
+    "Currency",
+    "ConversionGraph",
+    "ERate",
+    "Wallet",
+    "Ledger",
+    "SpotWallet",
+    "FastSpotWallet",
+    "Normalizer",
+    "Ratio",
+    "OHLCV",
+    "Pair",
+    "SeriesBar",
+    "SeriesMeta",
+]
@@ -0,0 +1,445 @@
+from collections.abc import Iterator
+from decimal import Decimal
+
+import numpy as np
+import polars as pl
+
+from attrs import define, field, validators
+
+from bafrapy.backtest.money.currency import Currency
+from bafrapy.backtest.money.emoney import EMoney, Normalizer, Ratio
+
+_INT64_MIN, _INT64_MAX = np.iinfo(np.int64).min, np.iinfo(np.int64).max
+
+
+def _as_values(values: object) -> np.ndarray:
+    array = np.asarray(values)
+    if array.dtype.kind in "iu":
+        if array.dtype == np.uint64 and array.size and array.max() > _INT64_MAX:
+            return array.astype(object)
+        return array.astype(np.int64, copy=False)
+    if array.dtype.kind == "f" and not isinstance(values, np.ndarray):
+        # numpy infers float64 for Python ints mixing int64 values with values beyond it.
+        array = np.array(values, dtype=object)
+    if array.dtype == object:
+        if not all(isinstance(v, int) and not isinstance(v, bool) for v in array.flat):
+            raise TypeError("Unsupported value type: object arrays must only hold int")
+        return _compact(array)
+    raise TypeError(f"Unsupported value type: {array.dtype}")
+
+
+def _compact(values: np.ndarray) -> np.ndarray:
+    """
+    Back to int64 when every value of an object array fits, so overflow only costs while it lasts.
+    """
+    if values.dtype != object:
+        return values
+    if values.size == 0 or (_INT64_MIN <= min(values.flat) and max(values.flat) <= _INT64_MAX):
+        return values.astype(np.int64)
+    return values
+
+
+def _is_wide(*arrays: np.ndarray) -> bool:
+    return any(a.dtype == object for a in arrays)
+
+
+def _add(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    if not _is_wide(a, b):
+        result = a + b
+        if not (((a ^ result) & (b ^ result)) < 0).any():
+            return result
+    return _compact(a.astype(object) + b.astype(object))
+
+
+def _mul(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    if not _is_wide(a, b) and not (b == _INT64_MIN).any():
+        limit = _INT64_MAX // np.maximum(np.abs(b), 1)
+        if ((a <= limit) & (a >= -limit)).all():
+            return a * b
+    return _compact(a.astype(object) * b.astype(object))
+
+
+def _scale(values: np.ndarray, decimals: int) -> np.ndarray:
+    if decimals == 0:
+        return values
+    return _mul(values, _int_scalar(10**decimals))
+
+
+def _div_round_half_even(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    """
+    Integer ``numerator / denominator`` rounded half to even, the rounding of ``EMoney.__mul__``. The
+    denominator must be positive.
+    """
+    quotient = numerator // denominator
+    remainder = numerator % denominator
+    twice = _mul(remainder, np.asarray(2))
+    up = (twice > denominator) | ((twice == denominator) & (quotient % 2 == 1))
+    return _add(quotient, up.astype(np.int64))
+
+
+def _fits_sum(values: np.ndarray) -> bool:
+    if values.dtype == object:
+        return False
+    bound = _INT64_MAX // max(values.size, 1)
+    return not ((values > bound) | (values < -bound)).any()
+
+
+def _int_scalar(value: int) -> np.ndarray:
+    return np.asarray(value, dtype=np.int64 if _INT64_MIN <= value <= _INT64_MAX else object)
+
+
+def _reduce_decimal(numerators: np.ndarray, exponents: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    ``numerators / 10**exponents`` in lowest terms, for exponents between 0 and 18. The only common factors with a
+    power of ten are twos and fives, so they are counted instead of running a gcd.
+    """
+    lowest_bit = numerators & -numerators
+    twos = np.where(numerators == 0, exponents, np.minimum(np.log2(lowest_bit | (numerators == 0)), exponents))
+    numerators = numerators >> twos.astype(np.int64)
+    fives = np.zeros_like(exponents)
+    pending = np.flatnonzero((numerators % 5 == 0) & (exponents > 0))
+    while pending.size:
+        numerators[pending] //= 5
+        fives[pending] += 1
+        pending = pending[(numerators[pending] % 5 == 0) & (fives[pending] < exponents[pending])]
+    denominators = np.left_shift(np.power(5, exponents - fives), exponents - twos.astype(np.int64))
+    return numerators, denominators
+
+
+def _float_ratios(multiplier: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Numerators and denominators of ``Decimal(str(m))`` for a float64 array, and a mask of the floats resolved.
+    Polars prints Float64 with its shortest representation, the digits ``repr`` prints, so the digits of every
+    float are parsed in bulk. Floats printed in scientific notation, non finite ones and ratios beyond int64 are
+    left unresolved.
+    """
+    strings = pl.Series(multiplier.ravel()).cast(pl.String)
+    parsed = strings.to_frame("v").select(
+        # The sign stays in the digits and plain floats are always printed with a dot: "-1.25" is -125 / 10**2.
+        digits=pl.col("v").str.replace(".", "", literal=True).cast(pl.Int64, strict=False),
+        exponent=pl.col("v").str.len_bytes().cast(pl.Int64) - pl.col("v").str.find(".", literal=True) - 1,
+    )
+    resolved = (parsed["digits"].is_not_null() & (parsed["exponent"] <= 18)).fill_null(False).to_numpy()
+    digits = np.where(resolved, parsed["digits"].fill_null(0).to_numpy(), 0)
+    exponents = np.where(resolved, parsed["exponent"].fill_null(0).to_numpy(), 0)
+    numerators, denominators = _reduce_decimal(digits, exponents)
+    shape = multiplier.shape
+    return numerators.reshape(shape), denominators.reshape(shape), resolved.reshape(shape)
+
+
+def _ratios(multiplier: float | Decimal | Ratio | np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Exact numerators and denominators of decimal multipliers read as ``Decimal(str(m))``, like ``EMoney``.
+    Float64 arrays are resolved in bulk; only non finite floats and ratios beyond int64 are read one by one.
+    """
+    if isinstance(multiplier, (float, Decimal, Ratio)):
+        ratio = Ratio.from_number(multiplier)
+        return _int_scalar(ratio.numerator), _int_scalar(ratio.denominator)
+    if multiplier.dtype == np.float64:
+        numerators, denominators, resolved = _float_ratios(multiplier)
+        if resolved.all():
+            return numerators, denominators
+        rest = np.nonzero(~resolved)
+        ratios = [Decimal(str(m)).as_integer_ratio() for m in multiplier[rest].tolist()]
+        rest_numerators = _as_values([n for n, _ in ratios])
+        rest_denominators = _as_values([d for _, d in ratios])
+        if _is_wide(rest_numerators, rest_denominators):
+            numerators, denominators = numerators.astype(object), denominators.astype(object)
+        numerators[rest], denominators[rest] = rest_numerators, rest_denominators
+        return numerators, denominators
+    ratios = [Decimal(str(m)).as_integer_ratio() for m in multiplier.flat]
+    numerators = _as_values([n for n, _ in ratios]).reshape(multiplier.shape)
+    denominators = _as_values([d for _, d in ratios]).reshape(multiplier.shape)
+    return numerators, denominators
+
+
+def _mul_ratio_wrapping(
+    values: np.ndarray, numerators: np.ndarray, denominators: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    ``values * numerators / denominators`` rounded half to even in int64 where the product overflows but the result
+    does not, and a mask of the elements computed. With ``n = a * d + b``, the quotient of ``|v| * b / d`` is
+    estimated with floats to within two units below 2**52, so its remainder ``|v| * b - q * d`` stays within int64
+    and is exact in wrapping int64 arithmetic, which corrects the estimate.
+    """
+    magnitudes = np.abs(values)
+    whole, fraction = np.divmod(numerators, denominators)
+    with np.errstate(over="ignore", invalid="ignore"):
+        estimates = np.floor(magnitudes * (fraction / denominators))
+    done = (
+        (values != _INT64_MIN)
+        & (denominators <= 2**60)
+        & (estimates < 2.0**52)
+        & (magnitudes <= 2**62 // np.maximum(np.abs(whole), 1))
+    )
+    quotients = np.where(done, estimates, 0).astype(np.int64)
+    magnitudes, whole = np.where(done, magnitudes, 0), np.where(done, whole, 0)
+    # Overflows wrap around, and the true remainder is within int64, so it comes out exact.
+    remainders = magnitudes * fraction - quotients * denominators
+    correction = remainders // denominators
+    quotients += magnitudes * whole + correction
+    remainders -= correction * denominators
+    twice = remainders * 2
+    up = (twice > denominators) | ((twice == denominators) & (quotients % 2 == 1))
+    return np.where(values < 0, -(quotients + up), quotients + up), done
+
+
+def _mul_ratio_int64(
+    values: np.ndarray, numerators: np.ndarray, denominators: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    limit = _INT64_MAX // np.maximum(np.abs(numerators), 1)
+    fits = (values <= limit) & (values >= -limit) & (numerators != _INT64_MIN)
+    if fits.all():
+        return _div_round_half_even(values * numerators, denominators), fits
+    result = np.zeros(values.shape, dtype=np.int64)
+    result[fits] = _div_round_half_even(values[fits] * numerators[fits], denominators[fits])
+    wide = ~fits
+    result[wide], fits[wide] = _mul_ratio_wrapping(values[wide], numerators[wide], denominators[wide])
+    return result, fits
+
+
+def _mul_ratio(values: np.ndarray, numerators: np.ndarray, denominators: np.ndarray) -> np.ndarray:
+    """
+    ``values * numerators / denominators`` rounded half to even. Elements whose product fits int64 stay on the
+    int64 path, the others whose result fits too are computed with wrapping int64 arithmetic, and only the rest
+    with Python ints.
+    """
+    values, numerators, denominators = np.broadcast_arrays(values, numerators, denominators)
+    if not _is_wide(values, numerators, denominators):
+        result, done = _mul_ratio_int64(values, numerators, denominators)
+        if done.all():
+            return result
+        result = result.astype(object)
+    else:
+        result = np.empty(values.shape, dtype=object)
+        done = np.ones(values.shape, dtype=bool)
+        for array in (values, numerators, denominators):
+            if array.dtype == object:
+                done &= (array >= _INT64_MIN) & (array <= _INT64_MAX)
+        narrow = np.nonzero(done)
+        result[narrow], done[narrow] = _mul_ratio_int64(
+            values[narrow].astype(np.int64), numerators[narrow].astype(np.int64), denominators[narrow].astype(np.int64)
+        )
+    rest = ~done
+    result[rest] = _div_round_half_even(
+        values[rest].astype(object) * numerators[rest].astype(object), denominators[rest].astype(object)
+    )
+    return _compact(result)
+
+
+def _mul_float(values: np.ndarray, multiplier: np.ndarray) -> np.ndarray:
+    """
+    ``_mul_ratio`` by a float64 array read as ``Decimal(str(m))``. The floats resolved in bulk are multiplied in
+    int64, so only the few left, and the values already beyond int64, widen to Python ints.
+    """
+    values, multiplier = np.broadcast_arrays(values, multiplier)
+    if values.dtype == object:
+        return _mul_ratio(values, *_ratios(multiplier))
+    numerators, denominators, done = _float_ratios(multiplier)
+    result = np.zeros(values.shape, dtype=np.int64)
+    resolved = np.nonzero(done)
+    result[resolved], done[resolved] = _mul_ratio_int64(values[resolved], numerators[resolved], denominators[resolved])
+    if done.all():
+        return result
+    rest = np.nonzero(~done)
+    wide = _mul_ratio(values[rest], *_ratios(multiplier[rest]))
+    if wide.dtype == object:
+        result = result.astype(object)
+    result[rest] = wide
+    return result
+
+
+def _powers_of_ten(exponents: np.ndarray) -> np.ndarray:
+    if exponents.size == 0 or exponents.max() <= 18:
+        return np.power(10, exponents, dtype=np.int64)
+    return np.array([10 ** int(e) for e in exponents], dtype=object)
+
+
+def money_columns(amounts: list[EMoney]) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Values and decimals of ``amounts`` as aligned arrays, values in int64 or in Python ints when they do not
+    fit, like ``EMoneyArray.values``. Currencies are not checked.
+    """
+    if not amounts:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    values = _as_values([m.value for m in amounts])
+    return values, np.array([m.decimals for m in amounts], dtype=np.int64)
+
+
+def convert_columns(
+    amount_values: np.ndarray,
+    amount_decimals: np.ndarray,
+    rate_values: np.ndarray,
+    rate_decimals: np.ndarray,
+    target_decimals: int,
+) -> np.ndarray:
+    """
+    ``a * r * 10**t // 10**(da + dr)`` over aligned columns, the floor division of ``ERate.convert``, widened
+    to Python ints only when the products overflow int64.
+    """
+    # The common powers of ten are cancelled to keep values small.
+    shift = target_decimals - (amount_decimals + rate_decimals)
+    values = _mul(_mul(amount_values, rate_values), _powers_of_ten(np.maximum(shift, 0)))
+    return _compact(values // _powers_of_ten(np.maximum(-shift, 0)))
+
+
+@define(frozen=True, slots=True, eq=False)
+class EMoneyArray:
+    """
+    Vector of amounts of one currency with shared decimals. Values are int64 and silently switch to Python
+    ints in an object array when a result does not fit, so results are always exact. Arithmetic follows
+    ``EMoney``: operands are aligned to the highest decimals, comparisons against plain ints use the raw
+    values and products are rounded half to even.
+    """
+
+    values: np.ndarray = field(converter=_as_values)
+    currency: Currency = field(validator=validators.instance_of(Currency))
+    decimals: int = field(validator=validators.instance_of(int))
+
+    def __attrs_post_init__(self) -> None:
+        Normalizer.assert_decimals(self.decimals)
+
+    @classmethod
+    def zeros(cls, size: int, currency: Currency, decimals: int = 0) -> "EMoneyArray":
+        return cls(values=np.zeros(size, dtype=np.int64), currency=currency, decimals=decimals)
+
+    @classmethod
+    def from_emoney(cls, amounts: list[EMoney], currency: Currency, decimals: int | None = None) -> "EMoneyArray":
+        """
+        Array of ``amounts`` aligned to ``decimals``, the highest decimals of the amounts by default.
+        """
+        if any(not isinstance(m, EMoney) or m.currency is not currency for m in amounts):
+            raise TypeError(f"Amounts must all be EMoney of {currency}")
+        if decimals is None:
+            decimals = max((m.decimals for m in amounts), default=0)
+        if any(m.decimals > decimals for m in amounts):
+            raise ValueError(f"Cannot align amounts to {decimals} decimals without losing precision")
+        values = [m.value * 10 ** (decimals - m.decimals) for m in amounts]
+        return cls(values=np.array(values, dtype=object), currency=currency, decimals=decimals)
+
+    @classmethod
+    def from_polars(cls, series: pl.Series, currency: Currency, decimals: int) -> "EMoneyArray":
+        """
+        Array over an integer series. Int64 series without nulls are not copied.
+        """
+        if series.null_count():
+            raise ValueError(f"Series {series.name} contains nulls")
+        if series.dtype == pl.Int64:
+            return cls(values=series.to_numpy(allow_copy=False), currency=currency, decimals=decimals)
+        if series.dtype.is_integer():
+            return cls(values=series.cast(pl.Int64, strict=True).to_numpy(), currency=currency, decimals=decimals)
+        if isinstance(series.dtype, pl.Decimal) and series.dtype.scale == 0:
+            return cls(values=np.array([int(v) for v in series], dtype=object), currency=currency, decimals=decimals)
+        raise TypeError(f"Unsupported series type: {series.dtype}")
+
+    def to_polars(self, name: str = "") -> pl.Series:
+        """
+        Int64 series sharing the buffer of the array, or Decimal(38, 0) when the values overflowed int64.
+        """
+        if self.values.dtype == object:
+            return pl.Series(name, [Decimal(v) for v in self.values.tolist()], dtype=pl.Decimal(38, 0))
+        return pl.Series(name, self.values)
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def __iter__(self) -> Iterator[EMoney]:
+        for value in self.values.tolist():
+            yield EMoney(value=value, currency=self.currency, decimals=self.decimals)
+
+    def __getitem__(self, index: int | slice | np.ndarray) -> "EMoney | EMoneyArray":
+        values = self.values[index]
+        if isinstance(values, np.ndarray):
+            return EMoneyArray(values=values, currency=self.currency, decimals=self.decimals)
+        return EMoney(value=int(values), currency=self.currency, decimals=self.decimals)
+
+    def _assert_same_currency(self, m: "EMoneyArray | EMoney") -> None:
+        if not isinstance(m, (EMoneyArray, EMoney)):
+            raise TypeError(f"Unsupported type: {type(m)}")
+        if self.currency is not m.currency:
+            raise TypeError(f"Cannot operate on assets with different currencies: {self.currency} != {m.currency}")
+
+    def _aligned_values(self, m: "EMoneyArray | EMoney") -> tuple[np.ndarray, np.ndarray, int]:
+        self._assert_same_currency(m)
+        other = m.values if isinstance(m, EMoneyArray) else _int_scalar(m.value)
+        decimals = max(self.decimals, m.decimals)
+        return _scale(self.values, decimals - self.decimals), _scale(other, decimals - m.decimals), decimals
+
+    def _compared(self, other: "EMoneyArray | EMoney | int") -> tuple[np.ndarray, np.ndarray]:
+        if isinstance(other, int) and not isinstance(other, bool):
+            return self.values, _int_scalar(other)
+        self_values, other_values, _ = self._aligned_values(other)
+        return self_values, other_values
+
+    def __eq__(self, other: "EMoneyArray | EMoney | int") -> np.ndarray:  # type: ignore[override]
+        a, b = self._compared(other)
+        return np.asarray(a == b, dtype=bool)
+
+    def __ne__(self, other: "EMoneyArray | EMoney | int") -> np.ndarray:  # type: ignore[override]
+        a, b = self._compared(other)
+        return np.asarray(a != b, dtype=bool)
+
+    def __lt__(self, other: "EMoneyArray | EMoney | int") -> np.ndarray:
+        a, b = self._compared(other)
+        return np.asarray(a < b, dtype=bool)
+
+    def __le__(self, other: "EMoneyArray | EMoney | int") -> np.ndarray:
+        a, b = self._compared(other)
+        return np.asarray(a <= b, dtype=bool)
+
+    def __gt__(self, other: "EMoneyArray | EMoney | int") -> np.ndarray:
+        a, b = self._compared(other)
+        return np.asarray(a > b, dtype=bool)
+
+    def __ge__(self, other: "EMoneyArray | EMoney | int") -> np.ndarray:
+        a, b = self._compared(other)
+        return np.asarray(a >= b, dtype=bool)
+
+    def __add__(self, m: "EMoneyArray | EMoney") -> "EMoneyArray":
+        self_values, m_values, decimals = self._aligned_values(m)
+        return EMoneyArray(values=_add(self_values, m_values), currency=self.currency, decimals=decimals)
+
+    def __radd__(self, m: EMoney) -> "EMoneyArray":
+        return self.__add__(m)
+
+    def __neg__(self) -> "EMoneyArray":
+        values = self.values
+        if values.dtype != object and (values == _INT64_MIN).any():
+            values = values.astype(object)
+        return EMoneyArray(values=-values, currency=self.currency, decimals=self.decimals)
+
+    def __sub__(self, m: "EMoneyArray | EMoney") -> "EMoneyArray":
+        return self.__add__(-m)
+
+    def __rsub__(self, m: EMoney) -> "EMoneyArray":
+        return (-self).__add__(m)
+
+    def __mul__(self, multiplier: int | float | Decimal | Ratio | np.ndarray) -> "EMoneyArray":
+        if isinstance(multiplier, bool) or (isinstance(multiplier, np.ndarray) and multiplier.dtype == bool):
+            raise TypeError(f"Unsupported number type: {type(multiplier)}")
+        if isinstance(multiplier, int):
+            values = _mul(self.values, _int_scalar(multiplier))
+        elif isinstance(multiplier, (float, Decimal, Ratio)):
+            numerator, denominator = _ratios(multiplier)
+            values = _mul_ratio(self.values, numerator, denominator)
+        elif isinstance(multiplier, np.ndarray) and multiplier.dtype.kind in "iu":
+            values = _mul(self.values, _as_values(multiplier))
+        elif isinstance(multiplier, np.ndarray) and multiplier.dtype == np.float64:
+            values = _mul_float(self.values, multiplier)
+        elif isinstance(multiplier, np.ndarray) and multiplier.dtype.kind in "fO":
+            numerators, denominators = _ratios(multiplier)
+            values = _mul_ratio(self.values, numerators, denominators)
+        else:
+            raise TypeError(f"Unsupported number type: {type(multiplier)}")
+        return EMoneyArray(values=values, currency=self.currency, decimals=self.decimals)
+
+    def __rmul__(self, multiplier: int | float | Decimal | Ratio | np.ndarray) -> "EMoneyArray":
+        return self.__mul__(multiplier)
+
+    def sum(self) -> EMoney:
+        total = int(self.values.sum()) if _fits_sum(self.values) else sum(self.values.tolist())
+        return EMoney(value=total, currency=self.currency, decimals=self.decimals)
+
+    def cumsum(self) -> "EMoneyArray":
+        values = self.values if _fits_sum(self.values) else self.values.astype(object)
+        return EMoneyArray(values=np.cumsum(values), currency=self.currency, decimals=self.decimals)
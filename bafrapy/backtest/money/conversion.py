@@ -0,0 +1,100 @@
+from collections import deque
+from collections.abc import Iterable
+
+from attrs import define, field
+
+from bafrapy.backtest.money.currency import Currency
+from bafrapy.backtest.money.emoney import EMoney, Normalizer, pow10
+from bafrapy.backtest.money.ohlcv import OHLCV, Pair
+
+#: One conversion step: the pair and whether it is walked from quote to base.
+Hop = tuple[Pair, bool]
+
+
+@define
+class ConversionGraph:
+    """
+    Currencies linked by the pairs seen so far, each pair valued at its latest close. Paths with the fewest
+    hops are found with a breadth first search and memoized per (source, target); they are only searched
+    again when a new pair appears, while a new bar of a known pair just replaces its rate. Converting along a
+    path multiplies the exact hop ratios and floors once, so one forward hop gives the same result as
+    ``ERate.convert``.
+    """
+
+    #: Latest close and quote decimals of every pair.
+    _rates: dict[Pair, tuple[int, int]] = field(factory=dict, init=False)
+    _edges: dict[Currency, list[tuple[Currency, Hop]]] = field(factory=dict, init=False)
+    _paths: dict[tuple[Currency, Currency], tuple[Hop, ...] | None] = field(factory=dict, init=False)
+
+    def update(self, bar: OHLCV) -> None:
+        pair = bar.pair
+        if pair not in self._rates:
+            self._edges.setdefault(pair.base, []).append((pair.quote, (pair, False)))
+            self._edges.setdefault(pair.quote, []).append((pair.base, (pair, True)))
+            self._paths.clear()
+        self._rates[pair] = (bar.close, bar.quote_decimals)
+
+    def update_many(self, bars: Iterable[OHLCV | None]) -> None:
+        for bar in bars:
+            if bar is not None:
+                self.update(bar)
+
+    def path(self, source: Currency, target: Currency) -> tuple[Hop, ...]:
+        key = (source, target)
+        if key not in self._paths:
+            self._paths[key] = self._search(source, target)
+        path = self._paths[key]
+        if path is None:
+            raise ValueError(f"No conversion path from {source.symbol} to {target.symbol}")
+        return path
+
+    def _search(self, source: Currency, target: Currency) -> tuple[Hop, ...] | None:
+        if source is target:
+            return ()
+        previous: dict[Currency, tuple[Currency, Hop] | None] = {source: None}
+        queue = deque([source])
+        while queue:
+            currency = queue.popleft()
+            for neighbour, hop in self._edges.get(currency, ()):
+                if neighbour in previous:
+                    continue
+                previous[neighbour] = (currency, hop)
+                if neighbour is target:
+                    hops = []
+                    while (step := previous[neighbour]) is not None:
+                        neighbour, hop = step
+                        hops.append(hop)
+                    return tuple(reversed(hops))
+                queue.append(neighbour)
+        return None
+
+    def ratio(self, source: Currency, target: Currency) -> tuple[int, int]:
+        """
+        Exact ``numerator / denominator`` of one unit of ``source`` in units of ``target``.
+        """
+        numerator, denominator = 1, 1
+        for pair, inverse in self.path(source, target):
+            close, decimals = self._rates[pair]
+            if inverse:
+                if close == 0:
+                    raise ZeroDivisionError(f"Cannot invert a zero close of {pair.base.symbol}{pair.quote.symbol}")
+                numerator, denominator = numerator * pow10(decimals), denominator * close
+            else:
+                numerator, denominator = numerator * close, denominator * pow10(decimals)
+        return numerator, denominator
+
+    def convert(self, amount: EMoney, target: Currency, target_decimals: int) -> EMoney:
+        Normalizer.assert_decimals(target_decimals)
+        numerator, denominator = self.ratio(amount.currency, target)
+        value = amount.value * numerator * pow10(target_decimals) // (denominator * pow10(amount.decimals))
+        return EMoney.trusted(value, target, target_decimals)
+
+    def value(self, balances: Iterable[EMoney], target: Currency, target_decimals: int) -> EMoney:
+        """
+        Total of ``balances`` in ``target``, e.g. the balances of a wallet. Each balance is converted and
+        floored on its own.
+        """
+        total = 0
+        for balance in balances:
+            total += self.convert(balance, target, target_decimals).value
+        return EMoney.trusted(total, target, target_decimals)
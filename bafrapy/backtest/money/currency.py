@@ -1,6 +1,40 @@
-from attrs import define
+from attrs import define, field
 
+from bafrapy.backtest.money.registry import Registry
 
-@define(frozen=True, slots=True)
+_set = object.__setattr__
+
+
+@define(frozen=True, slots=True, eq=False)
 class Currency:
+    """
+    Interned: ``Currency("BTC") is Currency("BTC")``, so equality and hashing are identity checks. Each currency
+    gets a small ``id`` that fits in a uint16 column.
+    """
+
     symbol: str
+    _id: int = field(init=False, repr=False)
+
+    def __new__(cls, symbol: str) -> "Currency":
+        return _CURRENCIES.intern(symbol, lambda id: _create(cls, symbol, id))
+
+    def __reduce__(self) -> tuple:
+        return Currency, (self.symbol,)
+
+    @property
+    def id(self) -> int:
+        return self._id
+
+    @classmethod
+    def from_id(cls, id: int) -> "Currency":
+        return _CURRENCIES.get(id)
+
+
+def _create(cls: type[Currency], symbol: str, id: int) -> Currency:
+    currency = object.__new__(cls)
+    _set(currency, "symbol", symbol)
+    _set(currency, "_id", id)
+    return currency
+
+
+_CURRENCIES: Registry[Currency] = Registry("currency")
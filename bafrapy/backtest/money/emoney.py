@@ -1,9 +1,91 @@
-from decimal import ROUND_HALF_EVEN, Decimal
+from decimal import ROUND_HALF_EVEN, Decimal, getcontext
+
+import polars as pl
+import pyarrow as pa
 
 from attrs import define, field, validators
 
 from bafrapy.backtest.money.currency import Currency
 
+_new = object.__new__
+
+_NUMBER_PATTERN = r"^(?<sign>[+-]?)(?<integer>\d*)(?:\.(?<fraction>\d*))?(?:[eE](?<exponent>[+-]?\d+))?$"
+
+_POW10 = tuple(10**n for n in range(64))
+
+
+def pow10(n: int) -> int:
+    return _POW10[n] if n < 64 else 10**n
+
+
+def _round_half_even(numerator: int, denominator: int) -> int:
+    quotient, remainder = divmod(numerator, denominator)
+    twice = 2 * remainder
+    if twice > denominator or (twice == denominator and quotient & 1):
+        return quotient + 1
+    return quotient
+
+
+@define(frozen=True, slots=True)
+class Ratio:
+    """
+    Float or Decimal factor compiled once to ``numerator / denominator``, exactly as read by ``Decimal(str(x))``,
+    so EMoney can multiply and divide by it with integer arithmetic only.
+    """
+
+    numerator: int
+    denominator: int
+    #: Coefficient of the decimal form. Bounds the precision the replaced Decimal operation would need.
+    coefficient: int
+    #: ``Decimal(str(x))``, used when the Decimal operation would round and the integer path cannot match it.
+    decimal: Decimal
+
+    @classmethod
+    def from_number(cls, n: "float | Decimal | Ratio") -> "Ratio":
+        if isinstance(n, Ratio):
+            return n
+        if not isinstance(n, (float, Decimal)):
+            raise TypeError(f"Unsupported number type: {type(n)}")
+        return _compile_ratio(n)
+
+
+_RATIO_CACHE_SIZE = 4096
+_ratio_cache: dict[tuple, Ratio] = {}
+
+
+def _ratio_key(n: float | Decimal) -> tuple:
+    """
+    Exact key of a number. Keying on the number itself would share one entry among equal numbers of different
+    types or digits, e.g. ``1``, ``1.0`` and ``Decimal("1.00")``, whose ratios keep different coefficients.
+    """
+    if isinstance(n, float):
+        # The exact binary value, -0.0 and non finite values included.
+        return (float, n.hex())
+    return (Decimal, n.as_tuple())
+
+
+def _compile_ratio(n: float | Decimal) -> Ratio:
+    key = _ratio_key(n)
+    ratio = _ratio_cache.get(key)
+    if ratio is None:
+        if len(_ratio_cache) >= _RATIO_CACHE_SIZE:
+            _ratio_cache.clear()
+        ratio = _ratio_cache[key] = _build_ratio(n)
+    return ratio
+
+
+def _build_ratio(n: float | Decimal) -> Ratio:
+    value = Decimal(str(n))
+    sign, digits, exponent = value.as_tuple()
+    if not isinstance(exponent, int):
+        raise ValueError(f"Cannot compile a non finite number: {n}")
+    coefficient = int("".join(map(str, digits)) or "0")
+    if sign:
+        coefficient = -coefficient
+    if exponent >= 0:
+        return Ratio(numerator=coefficient * pow10(exponent), denominator=1, coefficient=coefficient, decimal=value)
+    return Ratio(numerator=coefficient, denominator=pow10(-exponent), coefficient=coefficient, decimal=value)
+
 
 @define(frozen=True, slots=True)
 class Normalizer:
@@ -57,6 +139,113 @@ class Normalizer:
 
         return float(Normalizer.to_decimal(value, decimals))
 
+    @staticmethod
+    def _parsed(expr: pl.Expr) -> pl.Expr:
+        return expr.str.strip_chars().str.extract_groups(_NUMBER_PATTERN)
+
+    @staticmethod
+    def decimal_places_expr(expr: pl.Expr) -> pl.Expr:
+        """
+        Decimal places of every value of a string expression, as ``decimal_places`` on ``Decimal(value)``.
+        Values that are not numbers give null.
+        """
+        parsed = Normalizer._parsed(expr)
+        places = parsed.struct.field("fraction").fill_null("").str.len_chars().cast(pl.Int32) - parsed.struct.field(
+            "exponent"
+        ).fill_null("0").cast(pl.Int32)
+        valid = (parsed.struct.field("integer") + parsed.struct.field("fraction").fill_null("")).str.len_chars() > 0
+        return pl.when(valid).then(places.clip(lower_bound=0))
+
+    @staticmethod
+    def normalize_expr(expr: pl.Expr, decimals: int | None = None) -> pl.Expr:
+        """
+        Scaled Int64 values of a string expression with ``decimals`` decimals, rounded half to even like
+        ``normalize_decimal``. ``decimals`` defaults to the largest decimal places of the column, so nothing
+        is rounded. Values that are not numbers or do not fit in Int64 give null.
+        """
+        if decimals is not None:
+            Normalizer.assert_decimals(decimals)
+        parsed = Normalizer._parsed(expr)
+        fraction = parsed.struct.field("fraction").fill_null("")
+        digits = (parsed.struct.field("integer") + fraction).str.strip_chars_start("0")
+        exponent = parsed.struct.field("exponent").fill_null("0").cast(pl.Int32)
+        places = fraction.str.len_chars().cast(pl.Int32) - exponent
+        target = pl.lit(decimals, pl.Int32) if decimals is not None else places.clip(lower_bound=0).max()
+        shift = target - places
+        length = digits.str.len_chars().cast(pl.Int32)
+        magnitude = pl.when(length > 0).then(digits).otherwise(pl.lit("0")).cast(pl.Int128, strict=False)
+
+        ten = pl.lit(10, pl.Int128)
+        scaled_up = magnitude * ten.pow(shift.clip(0, 38).cast(pl.UInt32))
+        power = ten.pow((-shift).clip(0, 38).cast(pl.UInt32))
+        quotient = magnitude // power
+        remainder = magnitude % power
+        rounds_up = (remainder > power - remainder) | ((remainder == power - remainder) & (quotient % 2 == 1))
+        scaled_down = quotient + rounds_up.cast(pl.Int128)
+
+        value = (
+            pl.when(shift >= 0)
+            .then(pl.when(length + shift <= 19).then(scaled_up))
+            .when(-shift > 38)
+            .then(pl.lit(0, pl.Int128))
+            .otherwise(scaled_down)
+        )
+        valid = (parsed.struct.field("integer") + fraction).str.len_chars() > 0
+        value = value.cast(pl.Int64, strict=False)
+        signed = pl.when(parsed.struct.field("sign") == "-").then(-value).otherwise(value)
+        return pl.when(valid).then(signed)
+
+    @staticmethod
+    def _as_strings(column: "pl.Series | pa.Array | pa.ChunkedArray") -> pl.Series:
+        if not isinstance(column, pl.Series):
+            column = pl.Series(column)
+        if column.dtype == pl.String:
+            return column
+        if column.dtype.is_float():
+            # Float64 is printed with its shortest representation, the digits of Decimal(str(value)).
+            return column.cast(pl.Float64).cast(pl.String)
+        if column.dtype.is_integer() or isinstance(column.dtype, pl.Decimal):
+            return column.cast(pl.String)
+        raise TypeError(f"Unsupported column type: {column.dtype}")
+
+    @staticmethod
+    def _failed_rows(column: pl.Series, result: pl.Series) -> str | None:
+        failed = (result.is_null() & column.is_not_null()).arg_true()
+        if not len(failed):
+            return None
+        return ", ".join(str(i) for i in failed.head(10).to_list())
+
+    @staticmethod
+    def decimal_places_column(column: "pl.Series | pa.Array | pa.ChunkedArray") -> pl.Series:
+        """
+        Inferred decimal places per row of a string, float, integer or decimal column.
+        """
+        strings = Normalizer._as_strings(column)
+        places = strings.to_frame("v").select(Normalizer.decimal_places_expr(pl.col("v"))).to_series()
+        if (rows := Normalizer._failed_rows(strings, places)) is not None:
+            raise ValueError(f"Invalid numbers in rows {rows} of column {strings.name!r}")
+        return places.alias(strings.name)
+
+    @staticmethod
+    def normalize_column(
+        column: "pl.Series | pa.Array | pa.ChunkedArray", decimals: int | None = None
+    ) -> tuple[pl.Series, pl.Series]:
+        """
+        ``normalize_decimal`` over a whole string, float, integer or decimal column without Python level
+        Decimal work; floats give the same values as ``normalize_float``. Returns the Int64 scaled values and
+        the inferred decimal places of every row, nulls are kept.
+        """
+        strings = Normalizer._as_strings(column)
+        frame = strings.to_frame("v").select(
+            value=Normalizer.normalize_expr(pl.col("v"), decimals),
+            places=Normalizer.decimal_places_expr(pl.col("v")),
+        )
+        if (rows := Normalizer._failed_rows(strings, frame["places"])) is not None:
+            raise ValueError(f"Invalid numbers in rows {rows} of column {strings.name!r}")
+        if (rows := Normalizer._failed_rows(strings, frame["value"])) is not None:
+            raise OverflowError(f"Rows {rows} of column {strings.name!r} do not fit in Int64")
+        return frame["value"].alias(strings.name), frame["places"].alias(strings.name)
+
 
 @define(frozen=True, slots=True)
 class EMoney:
@@ -67,14 +256,25 @@ class EMoney:
     def __attrs_post_init__(self) -> None:
         Normalizer.assert_decimals(self.decimals)
 
+    @classmethod
+    def trusted(cls, value: int, currency: Currency, decimals: int) -> "EMoney":
+        """
+        Build an EMoney without running the validators. Only meant for results of operations on valid amounts.
+        """
+        money = _new(cls)
+        _set_value(money, value)
+        _set_currency(money, currency)
+        _set_decimals(money, decimals)
+        return money
+
     def _assert_is_valid_emoney(self, m: "EMoney") -> None:
         if not isinstance(m, EMoney):
             raise TypeError(f"Unsupported type: {type(m)}")
-        if self.currency != m.currency:
+        if self.currency is not m.currency:
             raise TypeError(f"Cannot operate on assets with different currencies: {self.currency} != {m.currency}")
 
-    def _assert_is_number(self, n: int | float | Decimal) -> None:
-        if not isinstance(n, (int, float, Decimal)) or isinstance(n, bool):
+    def _assert_is_number(self, n: int | float | Decimal | Ratio) -> None:
+        if not isinstance(n, (int, float, Decimal, Ratio)) or isinstance(n, bool):
             raise TypeError(f"Unsupported number type: {type(n)}")
 
     def _is_integer(self, other: object) -> bool:
@@ -82,10 +282,12 @@ class EMoney:
 
     def _aligned_values(self, m: "EMoney") -> tuple[int, int, int]:
         self._assert_is_valid_emoney(m)
+        if self.decimals == m.decimals:
+            return self.value, m.value, self.decimals
         decimals = max(self.decimals, m.decimals)
         return (
-            self.value * (10 ** (decimals - self.decimals)),
-            m.value * (10 ** (decimals - m.decimals)),
+            self.value * pow10(decimals - self.decimals),
+            m.value * pow10(decimals - m.decimals),
             decimals,
         )
 
@@ -160,62 +362,82 @@ class EMoney:
 
     def __add__(self, m: "EMoney") -> "EMoney":
         self_value, m_value, decimals = self._aligned_values(m)
-        return EMoney(
-            value=self_value + m_value,
-            currency=self.currency,
-            decimals=decimals,
-        )
+        return EMoney.trusted(self_value + m_value, self.currency, decimals)
 
     def __neg__(self) -> "EMoney":
-        return EMoney(
-            value=-self.value,
-            currency=self.currency,
-            decimals=self.decimals,
-        )
+        return EMoney.trusted(-self.value, self.currency, self.decimals)
 
     def __sub__(self, m: "EMoney") -> "EMoney":
         self_value, m_value, decimals = self._aligned_values(m)
-        return EMoney(
-            value=self_value - m_value,
-            currency=self.currency,
-            decimals=decimals,
-        )
-
-    def __mul__(self, multiplier: int | float | Decimal) -> "EMoney":
+        return EMoney.trusted(self_value - m_value, self.currency, decimals)
+
+    def _scaled_by(self, ratio: Ratio) -> int | None:
+        """
+        Exact ``value * ratio`` rounded half to even, or None when ``Decimal`` would have rounded the product
+        to the context precision first and the result could differ.
+        """
+        product = self.value * ratio.coefficient
+        precision = getcontext().prec
+        if precision < 64 and -_POW10[precision] < product < _POW10[precision]:
+            return _round_half_even(self.value * ratio.numerator, ratio.denominator)
+        return None
+
+    def _divided_by(self, ratio: Ratio) -> int | None:
+        """
+        Exact ``value / ratio`` rounded half to even, or None when the rounding of the ``Decimal`` quotient to
+        the context precision could move it across a half and change the result.
+        """
+        if ratio.numerator == 0:
+            return None
+        numerator, denominator = self.value * ratio.denominator, ratio.numerator
+        if denominator < 0:
+            numerator, denominator = -numerator, -denominator
+        quotient, remainder = divmod(numerator, denominator)
+        # With at most 18 integer digits the Decimal quotient keeps 10 or more fractional digits.
+        if getcontext().prec < 28 or not -_POW10[18] < quotient < _POW10[18]:
+            return None
+        twice = 2 * remainder
+        if twice == denominator:
+            return quotient + 1 if quotient & 1 else quotient
+        if abs(twice - denominator) * _POW10[10] <= denominator:
+            return None
+        return quotient + 1 if twice > denominator else quotient
+
+    def __mul__(self, multiplier: int | float | Decimal | Ratio) -> "EMoney":
         self._assert_is_number(multiplier)
 
         if isinstance(multiplier, int):
-            return EMoney(
-                value=self.value * int(multiplier),
-                currency=self.currency,
-                decimals=self.decimals,
-            )
+            return EMoney.trusted(self.value * int(multiplier), self.currency, self.decimals)
 
-        if isinstance(multiplier, (float, Decimal)):
-            scaled = (Decimal(self.value) * Decimal(str(multiplier))).quantize(Decimal("1"), rounding=ROUND_HALF_EVEN)
-            return EMoney(value=int(scaled), currency=self.currency, decimals=self.decimals)
+        if isinstance(multiplier, (float, Decimal, Ratio)):
+            ratio = multiplier if isinstance(multiplier, Ratio) else _compile_ratio(multiplier)
+            value = self._scaled_by(ratio)
+            if value is None:
+                scaled = (Decimal(self.value) * ratio.decimal).quantize(Decimal("1"), rounding=ROUND_HALF_EVEN)
+                value = int(scaled)
+            return EMoney.trusted(value, self.currency, self.decimals)
 
         raise ValueError(f"Unsupported multiplier type: {type(multiplier)}")
 
-    def __rmul__(self, multiplier: int | float | Decimal) -> "EMoney":
+    def __rmul__(self, multiplier: int | float | Decimal | Ratio) -> "EMoney":
         return self.__mul__(multiplier)
 
-    def __truediv__(self, divisor: int | float | Decimal) -> "EMoney":
+    def __truediv__(self, divisor: int | float | Decimal | Ratio) -> "EMoney":
         self._assert_is_number(divisor)
 
         if isinstance(divisor, int):
-            return EMoney(
-                value=self.value // int(divisor),
-                currency=self.currency,
-                decimals=self.decimals,
-            )
-
-        if isinstance(divisor, (float, Decimal)):
-            scaled = (Decimal(self.value) / Decimal(str(divisor))).quantize(Decimal("1"), rounding=ROUND_HALF_EVEN)
-            return EMoney(
-                value=int(scaled),
-                currency=self.currency,
-                decimals=self.decimals,
-            )
+            return EMoney.trusted(self.value // int(divisor), self.currency, self.decimals)
+
+        if isinstance(divisor, (float, Decimal, Ratio)):
+            ratio = divisor if isinstance(divisor, Ratio) else _compile_ratio(divisor)
+            value = self._divided_by(ratio)
+            if value is None:
+                scaled = (Decimal(self.value) / ratio.decimal).quantize(Decimal("1"), rounding=ROUND_HALF_EVEN)
+                value = int(scaled)
+            return EMoney.trusted(value, self.currency, self.decimals)
 
         raise ValueError(f"Unsupported divisor type: {type(divisor)}")
+
+
+# Slot descriptors of the frozen class, faster than object.__setattr__ for ``EMoney.trusted``.
+_set_value, _set_currency, _set_decimals = (EMoney.__dict__[name].__set__ for name in ("value", "currency", "decimals"))
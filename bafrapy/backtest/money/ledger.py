@@ -0,0 +1,137 @@
+from datetime import datetime, timezone
+
+import numpy as np
+import polars as pl
+
+from attrs import define, field
+
+from bafrapy.backtest.money.array import EMoneyArray
+from bafrapy.backtest.money.currency import Currency
+from bafrapy.backtest.money.emoney import EMoney, pow10
+
+_INT64_MIN, _INT64_MAX = np.iinfo(np.int64).min, np.iinfo(np.int64).max
+
+
+def _to_datetime64(timestamp: datetime) -> np.datetime64:
+    if timestamp.tzinfo is not None:
+        timestamp = timestamp.astimezone(timezone.utc).replace(tzinfo=None)
+    return np.datetime64(timestamp, "us")
+
+
+@define
+class Ledger:
+    """
+    Append-only record of balance mutations stored column by column in arrays that double when full. Entries
+    must be recorded in timestamp order; a past balance is then the cumulative sum of the currency's deltas up
+    to a binary searched position. Timestamps are stored as naive UTC.
+    """
+
+    capacity: int = 1024
+    _time: np.ndarray = field(init=False)
+    _currency: np.ndarray = field(init=False)
+    _value: np.ndarray = field(init=False)
+    _decimals: np.ndarray = field(init=False)
+    _reason: np.ndarray = field(init=False)
+    _size: int = field(default=0, init=False)
+    _reasons: list[str] = field(factory=list, init=False)
+    _reason_ids: dict[str, int] = field(factory=dict, init=False)
+    #: Per currency id: ledger size when built, times and cumulative sums at the highest decimals.
+    _sums: dict[int, tuple[int, np.ndarray, np.ndarray, int]] = field(factory=dict, init=False)
+
+    def __attrs_post_init__(self) -> None:
+        if self.capacity <= 0:
+            raise ValueError(f"Ledger capacity must be greater than 0: {self.capacity}")
+        self._time = np.empty(self.capacity, dtype="datetime64[us]")
+        self._currency = np.empty(self.capacity, dtype=np.uint16)
+        self._value = np.empty(self.capacity, dtype=np.int64)
+        self._decimals = np.empty(self.capacity, dtype=np.uint8)
+        self._reason = np.empty(self.capacity, dtype=np.uint16)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _grow(self) -> None:
+        self.capacity *= 2
+        for name in ("_time", "_currency", "_value", "_decimals", "_reason"):
+            old = getattr(self, name)
+            new = np.empty(self.capacity, dtype=old.dtype)
+            new[: self._size] = old[: self._size]
+            setattr(self, name, new)
+
+    def record(self, timestamp: datetime, delta: EMoney, reason: str = "") -> None:
+        time = _to_datetime64(timestamp)
+        if self._size and time < self._time[self._size - 1]:
+            raise ValueError(f"Ledger entries must be recorded in order: {timestamp} is before the last entry")
+        if not _INT64_MIN <= delta.value <= _INT64_MAX:
+            raise OverflowError(f"Ledger delta does not fit in int64: {delta.value}")
+        if delta.decimals > 255:
+            raise ValueError(f"Ledger decimals must fit in uint8: {delta.decimals}")
+        if self._size == self.capacity:
+            self._grow()
+
+        reason_id = self._reason_ids.get(reason)
+        if reason_id is None:
+            reason_id = self._reason_ids[reason] = len(self._reasons)
+            self._reasons.append(reason)
+
+        i = self._size
+        self._time[i] = time
+        self._currency[i] = delta.currency.id
+        self._value[i] = delta.value
+        self._decimals[i] = delta.decimals
+        self._reason[i] = reason_id
+        self._size += 1
+
+    def _cumulative(self, currency: Currency) -> tuple[np.ndarray, np.ndarray, int]:
+        cached = self._sums.get(currency.id)
+        if cached is not None and cached[0] == self._size:
+            return cached[1], cached[2], cached[3]
+
+        rows = np.flatnonzero(self._currency[: self._size] == currency.id)
+        decimals = int(self._decimals[rows].max()) if len(rows) else 0
+        factors = np.array([pow10(decimals - d) for d in range(decimals + 1)], dtype=object)
+        scale = factors[self._decimals[rows]]
+        values = self._value[rows]
+        if decimals <= 18 and len(rows) and np.abs(values).max() <= _INT64_MAX // (len(rows) * pow10(decimals)):
+            sums = np.cumsum(values * scale.astype(np.int64))
+        else:
+            sums = np.cumsum(values.astype(object) * scale)
+        times = self._time[rows]
+        self._sums[currency.id] = (self._size, times, sums, decimals)
+        return times, sums, decimals
+
+    def balance(self, currency: Currency, timestamp: datetime | None = None) -> EMoney:
+        """
+        Balance of ``currency`` after every entry at or before ``timestamp``, or after all of them.
+        """
+        times, sums, decimals = self._cumulative(currency)
+        position = len(sums) if timestamp is None else int(np.searchsorted(times, _to_datetime64(timestamp), "right"))
+        value = int(sums[position - 1]) if position else 0
+        return EMoney.trusted(value, currency, decimals)
+
+    def balances(self, currency: Currency, timestamps: np.ndarray) -> EMoneyArray:
+        """
+        Balances of ``currency`` at each of the naive UTC ``datetime64`` ``timestamps``, e.g. the bar times of
+        an equity curve.
+        """
+        times, sums, decimals = self._cumulative(currency)
+        positions = np.searchsorted(times, np.asarray(timestamps, dtype="datetime64[us]"), "right")
+        padded = np.concatenate([np.zeros(1, dtype=sums.dtype), sums])
+        return EMoneyArray(values=padded[positions], currency=currency, decimals=decimals)
+
+    def to_polars(self) -> pl.DataFrame:
+        size = self._size
+        currencies = self._currency[:size]
+        symbols = np.empty(int(currencies.max()) + 1 if size else 0, dtype=object)
+        for i in np.unique(currencies):
+            symbols[i] = Currency.from_id(int(i)).symbol
+        return pl.DataFrame(
+            {
+                "time": self._time[:size],
+                "currency": symbols[currencies],
+                "value": self._value[:size],
+                "decimals": self._decimals[:size],
+                "reason": np.array(self._reasons, dtype=object)[self._reason[:size]],
+            },
+            schema_overrides={"currency": pl.Categorical, "reason": pl.Categorical},
+        )
@@ -1,9 +1,26 @@
+import numpy as np
+
 from attrs import define, field, validators
 
+from bafrapy.backtest.money.array import EMoneyArray, convert_columns, money_columns
 from bafrapy.backtest.money.currency import Currency
 from bafrapy.backtest.money.emoney import EMoney, Normalizer
 
 
+def _columns(
+    amounts: "EMoneyArray | list[EMoney] | EMoney", currency: Currency, name: str
+) -> tuple[np.ndarray, np.ndarray]:
+    if isinstance(amounts, EMoney):
+        amounts = [amounts]
+    if isinstance(amounts, EMoneyArray):
+        if amounts.currency is not currency:
+            raise TypeError(f"Invalid {name} currency: {amounts.currency} != {currency}")
+        return amounts.values, np.full(len(amounts), amounts.decimals, dtype=np.int64)
+    if any(not isinstance(m, EMoney) or m.currency is not currency for m in amounts):
+        raise TypeError(f"Every {name} must be an EMoney of {currency}")
+    return money_columns(amounts)
+
+
 @define(frozen=True, slots=True)
 class ERate:
     source: Currency = field(validator=validators.instance_of(Currency))
@@ -17,12 +34,12 @@ class ERate:
     ) -> EMoney:
         if not isinstance(amount, EMoney):
             raise TypeError(f"Unsupported amount type: {type(amount)}")
-        if amount.currency != self.source:
+        if amount.currency is not self.source:
             raise TypeError(f"Invalid amount currency: {amount.currency} != {self.source}")
 
         if not isinstance(rate, EMoney):
             raise TypeError(f"Unsupported rate type: {type(rate)}")
-        if rate.currency != self.target:
+        if rate.currency is not self.target:
             raise TypeError(f"Invalid rate currency: {rate.currency} != {self.target}")
 
         if target_decimals is None:
@@ -37,3 +54,32 @@ class ERate:
             currency=self.target,
             decimals=target_decimals,
         )
+
+    def convert_array(
+        self,
+        amounts: EMoneyArray | list[EMoney],
+        rates: EMoneyArray | list[EMoney] | EMoney,
+        target_decimals: int | None = None,
+    ) -> EMoneyArray:
+        """
+        ``convert`` over aligned amounts and rates with integer array operations, so every element is the same
+        floor division as the scalar version. Lists may mix decimals; a single rate EMoney applies to every
+        amount. ``target_decimals`` defaults to the rates' decimals and is required when they differ.
+        """
+        amount_values, amount_decimals = _columns(amounts, self.source, "amount")
+        rate_values, rate_decimals = _columns(rates, self.target, "rate")
+        if len(rate_values) == 1 and len(amount_values) != 1:
+            rate_values = np.broadcast_to(rate_values, amount_values.shape)
+            rate_decimals = np.broadcast_to(rate_decimals, amount_values.shape)
+        if len(rate_values) != len(amount_values):
+            raise ValueError(f"Amounts and rates must be aligned: {len(amount_values)} != {len(rate_values)}")
+
+        if target_decimals is None:
+            decimals = np.unique(rate_decimals)
+            if len(decimals) > 1:
+                raise ValueError("Rates with mixed decimals need explicit target_decimals")
+            target_decimals = int(decimals[0]) if len(decimals) else 0
+        Normalizer.assert_decimals(target_decimals)
+
+        values = convert_columns(amount_values, amount_decimals, rate_values, rate_decimals, target_decimals)
+        return EMoneyArray(values=values, currency=self.target, decimals=target_decimals)
@@ -0,0 +1,48 @@
+from collections.abc import Callable, Hashable
+from threading import Lock
+from typing import Generic, TypeVar
+
+from attrs import define, field
+
+T = TypeVar("T")
+
+#: Ids fit in a uint16 column.
+MAX_ID = 2**16 - 1
+
+
+@define(slots=True)
+class Registry(Generic[T]):
+    """
+    Interned instances by key, each with a dense integer id assigned in creation order. Lookups of existing
+    keys do not lock.
+    """
+
+    name: str
+    _by_key: dict[Hashable, T] = field(factory=dict, init=False)
+    _by_id: list[T] = field(factory=list, init=False)
+    _lock: Lock = field(factory=Lock, init=False)
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def intern(self, key: Hashable, create: Callable[[int], T]) -> T:
+        """
+        Instance registered for ``key``, built with ``create(id)`` the first time.
+        """
+        instance = self._by_key.get(key)
+        if instance is not None:
+            return instance
+        with self._lock:
+            instance = self._by_key.get(key)
+            if instance is None:
+                if len(self._by_id) > MAX_ID:
+                    raise OverflowError(f"Too many {self.name} instances, ids are limited to {MAX_ID}")
+                instance = create(len(self._by_id))
+                self._by_id.append(instance)
+                self._by_key[key] = instance
+        return instance
+
+    def get(self, id: int) -> T:
+        if not 0 <= id < len(self._by_id):
+            raise KeyError(f"Unknown {self.name} id: {id}")
+        return self._by_id[id]
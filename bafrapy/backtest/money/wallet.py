@@ -1,30 +1,43 @@
+from datetime import datetime
 from typing import List
 
 from attrs import define, field
 from beartype import beartype
 
 from .currency import Currency
-from .emoney import EMoney
+from .emoney import EMoney, pow10
+from .ledger import Ledger
 
 
 @define
 class Wallet:
+    #: Records every balance mutation when set. Mutations then need a ``timestamp``.
+    ledger: Ledger | None = None
     _currencies: dict[Currency, EMoney] = field(factory=dict, init=False)
 
+    def _record(self, m: EMoney, timestamp: datetime | None, reason: str) -> None:
+        if self.ledger is None:
+            return
+        if timestamp is None:
+            raise ValueError("Wallets with a ledger need the timestamp of every balance mutation")
+        self.ledger.record(timestamp, m, reason)
+
     @beartype
     def add_currency(self, currency: Currency) -> None:
         if currency not in self._currencies:
             self._currencies[currency] = EMoney.zero(currency)
 
     @beartype
-    def add_balance(self, m: EMoney) -> None:
+    def add_balance(self, m: EMoney, timestamp: datetime | None = None, reason: str = "") -> None:
+        self._record(m, timestamp, reason)
         if m.currency not in self._currencies:
             self._currencies[m.currency] = m
         else:
             self._currencies[m.currency] += m
 
     @beartype
-    def subtract_balance(self, m: EMoney) -> None:
+    def subtract_balance(self, m: EMoney, timestamp: datetime | None = None, reason: str = "") -> None:
+        self._record(-m, timestamp, reason)
         if m.currency not in self._currencies:
             self._currencies[m.currency] = -m
         else:
@@ -44,15 +57,70 @@ class Wallet:
 
 class SpotWallet(Wallet):
     @beartype
-    def add_balance(self, m: EMoney) -> None:
+    def add_balance(self, m: EMoney, timestamp: datetime | None = None, reason: str = "") -> None:
         current_balance = self.get_balance(m.currency)
         if current_balance < -m:
             raise ValueError(f"Insufficient balance for currency {m.currency}")
-        super().add_balance(m)
+        super().add_balance(m, timestamp, reason)
 
     @beartype
-    def subtract_balance(self, m: EMoney) -> None:
+    def subtract_balance(self, m: EMoney, timestamp: datetime | None = None, reason: str = "") -> None:
         current_balance = self.get_balance(m.currency)
         if current_balance < m:
             raise ValueError(f"Insufficient balance for currency {m.currency}")
-        super().subtract_balance(m)
+        super().subtract_balance(m, timestamp, reason)
+
+
+@define
+class FastSpotWallet:
+    """
+    SpotWallet for trusted callers such as the broker loop. Balances are plain scaled integers per interned
+    currency and arguments are not type checked, so the only validation left is the overdraft check, done on
+    integers. Same interface and results as SpotWallet.
+    """
+
+    #: Records every balance mutation when set. Mutations then need a ``timestamp``.
+    ledger: Ledger | None = None
+    _values: dict[Currency, int] = field(factory=dict, init=False)
+    _decimals: dict[Currency, int] = field(factory=dict, init=False)
+
+    def add_currency(self, currency: Currency) -> None:
+        if currency not in self._values:
+            self._values[currency] = 0
+            self._decimals[currency] = 0
+
+    def _apply(self, m: EMoney, negate: bool, timestamp: datetime | None, reason: str) -> None:
+        currency, delta, decimals = m.currency, -m.value if negate else m.value, m.decimals
+        value = self._values.get(currency, 0)
+        current = self._decimals.get(currency, decimals)
+        if decimals > current:
+            value *= pow10(decimals - current)
+            current = decimals
+        elif decimals < current:
+            delta *= pow10(current - decimals)
+        value += delta
+        if value < 0:
+            raise ValueError(f"Insufficient balance for currency {currency}")
+        # Recorded before the balance changes, so an entry the ledger rejects leaves the wallet untouched.
+        if self.ledger is not None:
+            self._record(-m if negate else m, timestamp, reason)
+        self._values[currency] = value
+        self._decimals[currency] = current
+
+    def add_balance(self, m: EMoney, timestamp: datetime | None = None, reason: str = "") -> None:
+        self._apply(m, False, timestamp, reason)
+
+    def subtract_balance(self, m: EMoney, timestamp: datetime | None = None, reason: str = "") -> None:
+        self._apply(m, True, timestamp, reason)
+
+    def _record(self, m: EMoney, timestamp: datetime | None, reason: str) -> None:
+        if timestamp is None:
+            raise ValueError("Wallets with a ledger need the timestamp of every balance mutation")
+        self.ledger.record(timestamp, m, reason)
+
+    def get_balance(self, currency: Currency) -> EMoney:
+        return EMoney.trusted(self._values.get(currency, 0), currency, self._decimals.get(currency, 0))
+
+    @property
+    def currencies(self) -> List[Currency]:
+        return list(self._values.keys())
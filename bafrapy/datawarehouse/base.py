@@ -35,6 +35,10 @@ class OHLCVRepository(ABC):
     def market_historical_range(self, exchange: str, symbol: str, resolution: int) -> Optional[HistoricalRange]:
         pass
 
+    @abstractmethod
+    def current_snapshot(self) -> int:
+        pass
+
     @abstractmethod
     def insert_ohlcv(self, ohlcv: pl.DataFrame):
         pass
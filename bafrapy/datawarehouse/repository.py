@@ -119,6 +119,10 @@ class DucklakeOHLCVRepository(OHLCVRepository):
         q = f"SELECT COUNT(*) AS n FROM {self._ohlcv_table_name()}"
         return int(self._execute(q).fetch_arrow_table().column("n")[0].as_py())
 
+    def current_snapshot(self) -> int:
+        q = f"SELECT id FROM {self._database}.current_snapshot()"
+        return int(self._execute(q).fetch_arrow_table().column("id")[0].as_py())
+
     def insert_ohlcv(self, data: pl.DataFrame):
         if data.is_empty():
             return True
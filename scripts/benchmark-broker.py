@@ -0,0 +1,112 @@
+import argparse
+import time
+
+from datetime import timedelta
+from decimal import Decimal
+
+import numpy as np
+import polars as pl
+
+from bafrapy.backtest.base import Order, Side, VBroker, VBrokerConfig
+from bafrapy.backtest.dataset import PolarsDataSet
+from bafrapy.backtest.money import Currency, Pair
+from bafrapy.logger import LoguruLogger
+
+PAIR = Pair(base=Currency("BTC"), quote=Currency("USDT"))
+RESOLUTION = 60
+
+
+def synthetic_frame(rows: int) -> pl.DataFrame:
+    rng = np.random.default_rng(42)
+    close = 3_000_000 + np.cumsum(rng.integers(-500, 500, rows))
+    spread = rng.integers(0, 1_000, rows)
+    start = np.datetime64("2020-01-01T00:00:00", "us")
+    return pl.DataFrame(
+        {
+            "time": start + np.arange(rows) * np.timedelta64(RESOLUTION, "s"),
+            "resolution": RESOLUTION,
+            "open": close,
+            "high": close + spread,
+            "low": close - spread,
+            "close": close,
+            "volume": rng.integers(0, 10**10, rows),
+            "quote_volume": rng.integers(0, 10**12, rows),
+            "base_decimals": 8,
+            "quote_decimals": 2,
+        }
+    )
+
+
+def grid_broker(data: pl.DataFrame, orders: int) -> VBroker:
+    """Broker with a grid of resting limit orders far away from the synthetic prices."""
+    dataset = PolarsDataSet(pair=PAIR, resolution=RESOLUTION, data=data)
+    broker = VBroker(VBrokerConfig(data=dataset))
+    for i in range(orders // 2):
+        broker.add_limit_order(Side.buy, Decimal(1), Decimal(1_000_000 - i * 100))
+        broker.add_limit_order(Side.sell, Decimal(1), Decimal(5_000_000 + i * 100))
+    return broker
+
+
+def book_loop(broker: VBroker) -> int:
+    bars = 0
+    while broker.next_data() is not None:
+        bars += 1
+    return bars
+
+
+def fast_forward_loop(broker: VBroker, every: int) -> int:
+    """Strategy subscribed to one bar out of ``every``, e.g. a daily strategy on minute bars."""
+    bars = 0
+    step = timedelta(seconds=RESOLUTION * every)
+    while broker.fast_forward(until=broker.current_time + step) is not None:
+        bars += 1
+    return bars
+
+
+def legacy_loop(data: pl.DataFrame, orders: list[Order]) -> int:
+    """Reproduces the previous VBroker._process_orders cost: every pending order processed on every bar."""
+    dataset = PolarsDataSet(pair=PAIR, resolution=RESOLUTION, data=data)
+    bars = 0
+    while (ohlcv := dataset.next_data()) is not None:
+        for order in orders:
+            order.process(ohlcv)
+        bars += 1
+    return bars
+
+
+def measure(name: str, fn) -> float:
+    start = time.perf_counter()
+    bars = fn()
+    elapsed = time.perf_counter() - start
+    print(f"{name:<32} {bars:>10,} bars {elapsed:>9.3f}s {elapsed / bars * 1e6:>9.2f}µs/bar")
+    return elapsed / bars
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Cost per bar of resting limit orders in VBroker")
+    parser.add_argument("--bars", type=int, default=1_000_000)
+    parser.add_argument("--orders", type=int, default=1_000)
+    parser.add_argument(
+        "--legacy-bars", type=int, default=10_000, help="bars for the per-order walk, extrapolated to --bars"
+    )
+    args = parser.parse_args()
+
+    LoguruLogger().deactivate()
+    data = synthetic_frame(args.bars + 1)
+
+    broker = grid_broker(data, args.orders)
+    broker.next_data()
+    book = measure(f"order book, {len(broker.order_book)} orders", lambda: book_loop(broker))
+
+    broker = grid_broker(data, args.orders)
+    broker.next_data()
+    daily = measure("fast forward, daily strategy", lambda: fast_forward_loop(broker, 1440))
+    print(f"daily strategy over {args.bars:,} bars: {book / (daily / 1440):.0f}x stepping every bar")
+
+    resting = list(broker.pending_orders.values())
+    legacy = measure(f"walk, {len(resting)} orders", lambda: legacy_loop(data.head(args.legacy_bars), resting))
+    print(f"walk over {args.bars:,} bars: ~{legacy * args.bars:.0f}s, {legacy / book:.0f}x the order book")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+import argparse
+import time
+
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import polars as pl
+
+from bafrapy.backtest.dataset import PandasDataSet, PolarsDataSet
+from bafrapy.backtest.money import OHLCV, Currency, Pair
+
+PAIR = Pair(base=Currency("BTC"), quote=Currency("USDT"))
+RESOLUTION = 60
+
+
+def synthetic_frame(rows: int) -> pd.DataFrame:
+    rng = np.random.default_rng(42)
+    close = 3_000_000 + np.cumsum(rng.integers(-500, 500, rows))
+    spread = rng.integers(0, 1_000, rows)
+    return pd.DataFrame(
+        {
+            "time": pd.date_range(datetime(2020, 1, 1), periods=rows, freq=f"{RESOLUTION}s"),
+            "resolution": RESOLUTION,
+            "open": close,
+            "high": close + spread,
+            "low": close - spread,
+            "close": close,
+            "volume": rng.integers(0, 10**10, rows),
+            "quote_volume": rng.integers(0, 10**12, rows),
+            "base_decimals": 8,
+            "quote_decimals": 2,
+        }
+    )
+
+
+def iloc_next_data(data: pd.DataFrame) -> None:
+    """Reproduces the previous PandasDataSet loop: one iloc Series and one dict per bar."""
+    for i in range(len(data)):
+        row = data.iloc[i].to_dict()
+        OHLCV(
+            pair=PAIR,
+            resolution=int(row["resolution"]),
+            base_decimals=int(row["base_decimals"]),
+            quote_decimals=int(row["quote_decimals"]),
+            timestamp=row["time"].to_pydatetime(),
+            open=int(row["open"]),
+            high=int(row["high"]),
+            low=int(row["low"]),
+            close=int(row["close"]),
+            volume=int(row["volume"]),
+            quote_volume=int(row["quote_volume"]),
+        )
+
+
+def columnar_next_data(dataset: PandasDataSet | PolarsDataSet) -> None:
+    while dataset.next_data() is not None:
+        pass
+
+
+def columnar_batches(dataset: PandasDataSet, batch_size: int) -> None:
+    for batch in dataset.iter_batches(batch_size):
+        batch.values[:, 6].sum()
+
+
+def measure(name: str, rows: int, fn) -> float:
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    print(f"{name:<32} {elapsed:>9.3f}s {rows / elapsed:>14,.0f} bars/s")
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare dataset iteration strategies on synthetic OHLCV data")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--batch-size", type=int, default=10_000)
+    parser.add_argument("--skip-iloc", action="store_true", help="skip the slow per-row iloc baseline")
+    args = parser.parse_args()
+
+    data = synthetic_frame(args.rows)
+
+    if not args.skip_iloc:
+        measure("pandas iloc (previous)", args.rows, lambda: iloc_next_data(data))
+    measure(
+        "pandas columnar next_data",
+        args.rows,
+        lambda: columnar_next_data(PandasDataSet(pair=PAIR, resolution=RESOLUTION, data=data)),
+    )
+    measure(
+        "polars columnar next_data",
+        args.rows,
+        lambda: columnar_next_data(PolarsDataSet(pair=PAIR, resolution=RESOLUTION, data=pl.from_pandas(data))),
+    )
+    measure(
+        "pandas iter_batches",
+        args.rows,
+        lambda: columnar_batches(PandasDataSet(pair=PAIR, resolution=RESOLUTION, data=data), args.batch_size),
+    )
+
+
+if __name__ == "__main__":
+    main()
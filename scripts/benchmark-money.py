@@ -0,0 +1,90 @@
+import argparse
+import timeit
+
+from decimal import ROUND_HALF_EVEN, Decimal
+
+import numpy as np
+
+from bafrapy.backtest.money import (
+    Currency,
+    EMoney,
+    EMoneyArray,
+    FastSpotWallet,
+    Ratio,
+    SpotWallet,
+)
+
+USDT = Currency("USDT")
+
+
+def legacy_mul(money: EMoney, multiplier: float | Decimal) -> EMoney:
+    """Reproduces the previous EMoney.__mul__: Decimal product, quantize and a validated constructor."""
+    scaled = (Decimal(money.value) * Decimal(str(multiplier))).quantize(Decimal("1"), rounding=ROUND_HALF_EVEN)
+    return EMoney(value=int(scaled), currency=money.currency, decimals=money.decimals)
+
+
+def legacy_div(money: EMoney, divisor: float | Decimal) -> EMoney:
+    scaled = (Decimal(money.value) / Decimal(str(divisor))).quantize(Decimal("1"), rounding=ROUND_HALF_EVEN)
+    return EMoney(value=int(scaled), currency=money.currency, decimals=money.decimals)
+
+
+def legacy_add(a: EMoney, b: EMoney) -> EMoney:
+    decimals = max(a.decimals, b.decimals)
+    return EMoney(
+        value=a.value * (10 ** (decimals - a.decimals)) + b.value * (10 ** (decimals - b.decimals)),
+        currency=a.currency,
+        decimals=decimals,
+    )
+
+
+def wallet_round_trips(wallet: SpotWallet | FastSpotWallet, amount: EMoney, count: int) -> None:
+    for _ in range(count):
+        wallet.add_balance(amount)
+        wallet.subtract_balance(amount)
+
+
+def measure(name: str, number: int, fn) -> None:
+    elapsed = min(timeit.repeat(fn, number=number, repeat=5)) / number
+    print(f"{name:<36} {elapsed * 1e9:>10,.0f} ns/op")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Micro-benchmarks of the money module")
+    parser.add_argument("--number", type=int, default=100_000, help="operations per measurement")
+    parser.add_argument("--size", type=int, default=1_000_000, help="length of the EMoneyArray operands")
+    args = parser.parse_args()
+    n = args.number
+
+    price = EMoney(value=3_000_012_345, currency=USDT, decimals=2)
+    fee = EMoney(value=1_234, currency=USDT, decimals=4)
+    same = EMoney(value=12_345, currency=USDT, decimals=2)
+    fee_rate = Ratio.from_number(Decimal("0.001"))
+
+    measure("mul float (previous)", n, lambda: legacy_mul(price, 0.001))
+    measure("mul float", n, lambda: price * 0.001)
+    measure("mul Decimal (previous)", n, lambda: legacy_mul(price, Decimal("0.001")))
+    measure("mul Decimal", n, lambda: price * Decimal("0.001"))
+    measure("mul precompiled Ratio", n, lambda: price * fee_rate)
+    measure("mul int", n, lambda: price * 3)
+    measure("div float (previous)", n, lambda: legacy_div(price, 1.5))
+    measure("div float", n, lambda: price / 1.5)
+    measure("add same decimals (previous)", n, lambda: legacy_add(price, same))
+    measure("add same decimals", n, lambda: price + same)
+    measure("add mixed decimals", n, lambda: price + fee)
+    measure("compare", n, lambda: price < same)
+
+    deposit = EMoney(value=10**12, currency=USDT, decimals=2)
+    for wallet in (SpotWallet(), FastSpotWallet()):
+        wallet.add_balance(deposit)
+        measure(f"{type(wallet).__name__} add+subtract", n, lambda w=wallet: wallet_round_trips(w, same, 1))
+
+    rng = np.random.default_rng(42)
+    prices = EMoneyArray(values=rng.integers(1, 10**10, args.size), currency=USDT, decimals=2)
+    quantities = rng.random(args.size)
+    measure(f"EMoneyArray add x{args.size:,}", 10, lambda: prices + prices)
+    measure(f"EMoneyArray mul float x{args.size:,}", 10, lambda: prices * 0.001)
+    measure(f"EMoneyArray mul array x{args.size:,}", 1, lambda: prices * quantities)
+
+
+if __name__ == "__main__":
+    main()
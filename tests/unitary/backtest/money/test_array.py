@@ -0,0 +1,119 @@
+from decimal import Decimal
+
+import numpy as np
+import polars as pl
+import pytest
+
+from bafrapy.backtest.money import Currency, EMoney, EMoneyArray
+
+EUR = Currency("EUR")
+
+
+class TestEMoneyArray:
+    def test_add_aligns_to_higher_decimals(self):
+        a = EMoneyArray(values=[123, 200], currency=EUR, decimals=2)
+        b = EMoneyArray(values=[1234, 1], currency=EUR, decimals=3)
+
+        result = a + b
+
+        assert result.decimals == 3
+        assert result.values.tolist() == [2464, 2001]
+
+    def test_sub_and_neg_with_scalar(self):
+        a = EMoneyArray(values=[100, 200], currency=EUR, decimals=2)
+
+        assert (a - EMoney(value=5, currency=EUR, decimals=1)).values.tolist() == [50, 150]
+        assert (-a).values.tolist() == [-100, -200]
+
+    def test_comparisons(self):
+        a = EMoneyArray(values=[123, 200], currency=EUR, decimals=2)
+        b = EMoneyArray(values=[1230, 1999], currency=EUR, decimals=3)
+
+        assert (a == b).tolist() == [True, False]
+        assert (a > b).tolist() == [False, True]
+        assert (a <= 123).tolist() == [True, False]
+
+    def test_rejects_different_currencies(self):
+        a = EMoneyArray(values=[100], currency=EUR, decimals=2)
+        with pytest.raises(TypeError):
+            _ = a + EMoneyArray(values=[100], currency=Currency("USD"), decimals=2)
+
+    @pytest.mark.parametrize("multiplier", [2, 1.005, 0.5, -0.5, Decimal("1.25"), Decimal("0.333")])
+    def test_mul_matches_emoney(self, multiplier):
+        values = [-15, -5, 5, 15, 100, 250, 2**62]
+        array = EMoneyArray(values=values, currency=EUR, decimals=2) * multiplier
+
+        assert list(array) == [EMoney(value=v, currency=EUR, decimals=2) * multiplier for v in values]
+
+    def test_mul_by_array(self):
+        a = EMoneyArray(values=[15, 25, 100], currency=EUR, decimals=2)
+
+        assert (a * np.array([0.5, 0.5, 3])).values.tolist() == [8, 12, 300]
+        assert (a * np.array([2, 3, 4])).values.tolist() == [30, 75, 400]
+
+    def test_mul_by_float_array_matches_emoney(self):
+        values = [-15, 5, 2**40, 2**62, 123_456_789]
+        multipliers = np.array([1.005, 0.0012345678901234567, 0.5, 0.25, 1e-20])
+        array = EMoneyArray(values=values, currency=EUR, decimals=2) * multipliers
+
+        expected = [EMoney(value=v, currency=EUR, decimals=2) * float(m) for v, m in zip(values, multipliers)]
+        assert list(array) == expected
+        assert array.values.dtype == np.int64
+
+    def test_mul_by_computed_floats_matches_emoney(self):
+        rng = np.random.default_rng(0)
+        values = rng.integers(-(2**62), 2**62, 2_000)
+        # Shortest digits up to 17, scientific notation and products beyond int64 with results that fit.
+        multipliers = np.concatenate([rng.random(1_000), 1 + rng.normal(0, 0.01, 999), [-3.5e-7]])
+        array = EMoneyArray(values=values, currency=EUR, decimals=2) * multipliers
+
+        expected = [EMoney(value=v, currency=EUR, decimals=2) * m for v, m in zip(values.tolist(), multipliers)]
+        assert list(array) == expected
+
+    def test_accepts_ints_beyond_int64(self):
+        a = EMoneyArray(values=[1, 2**63], currency=EUR, decimals=0)
+
+        assert a.values.dtype == object
+        assert a.values.tolist() == [1, 2**63]
+        with pytest.raises(TypeError):
+            EMoneyArray(values=[1, 2.5], currency=EUR, decimals=0)
+
+    def test_mul_rejects_bool(self):
+        a = EMoneyArray(values=[100], currency=EUR, decimals=2)
+        with pytest.raises(TypeError):
+            _ = a * True
+
+    def test_overflow_switches_to_python_ints(self):
+        a = EMoneyArray(values=[2**62, 1], currency=EUR, decimals=0)
+
+        doubled = a * 4
+        back = doubled - doubled + a
+
+        assert doubled.values.dtype == object
+        assert doubled.values.tolist() == [2**64, 4]
+        assert back.values.dtype == np.int64
+        assert doubled.to_polars().dtype == pl.Decimal(38, 0)
+
+    def test_polars_round_trip_is_zero_copy(self):
+        a = EMoneyArray(values=[1, 2, 3], currency=EUR, decimals=2)
+
+        series = a.to_polars("pnl")
+        b = EMoneyArray.from_polars(series, EUR, 2)
+
+        assert series.to_list() == [1, 2, 3]
+        assert np.shares_memory(b.values, a.values)
+
+    def test_sum_and_cumsum(self):
+        a = EMoneyArray(values=[100, -50, 25], currency=EUR, decimals=2)
+
+        assert a.sum() == EMoney(value=75, currency=EUR, decimals=2)
+        assert a.cumsum().values.tolist() == [100, 50, 75]
+
+    def test_from_emoney(self):
+        a = EMoneyArray.from_emoney(
+            [EMoney(value=1, currency=EUR, decimals=0), EMoney(value=15, currency=EUR, decimals=1)], EUR
+        )
+
+        assert a.decimals == 1
+        assert a.values.tolist() == [10, 15]
+        assert a[1] == EMoney(value=15, currency=EUR, decimals=1)
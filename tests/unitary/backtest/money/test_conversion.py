@@ -0,0 +1,67 @@
+from datetime import datetime
+
+import pytest
+
+from bafrapy.backtest.money import OHLCV, ConversionGraph, Currency, EMoney, ERate, Pair
+
+BTC, ETH, USDT, EUR = Currency("BTC"), Currency("ETH"), Currency("USDT"), Currency("EUR")
+
+
+def _bar(base: Currency, quote: Currency, close: int, quote_decimals: int = 2) -> OHLCV:
+    return OHLCV(
+        pair=Pair(base=base, quote=quote),
+        resolution=60,
+        base_decimals=8,
+        quote_decimals=quote_decimals,
+        timestamp=datetime(2024, 1, 1),
+        open=close,
+        high=close,
+        low=close,
+        close=close,
+    )
+
+
+class TestConversionGraph:
+    def _graph(self) -> ConversionGraph:
+        graph = ConversionGraph()
+        graph.update_many([_bar(BTC, USDT, 5_000_000), _bar(ETH, USDT, 300_000), _bar(EUR, USDT, 110)])
+        return graph
+
+    def test_direct_hop_matches_erate(self):
+        graph = self._graph()
+        btc = EMoney(value=150_000_000, currency=BTC, decimals=8)
+
+        converted = graph.convert(btc, USDT, 2)
+
+        assert converted == ERate(BTC, USDT).convert(btc, EMoney(value=5_000_000, currency=USDT, decimals=2))
+
+    def test_triangulates_through_quote(self):
+        graph = self._graph()
+
+        assert graph.path(BTC, EUR) == ((Pair(BTC, USDT), False), (Pair(EUR, USDT), True))
+        assert graph.convert(EMoney(value=1, currency=BTC, decimals=0), EUR, 2) == EMoney(
+            value=4_545_454, currency=EUR, decimals=2
+        )
+
+    def test_new_bars_refresh_memoized_path(self):
+        graph = self._graph()
+        path = graph.path(BTC, EUR)
+
+        graph.update(_bar(EUR, USDT, 100))
+
+        assert graph.path(BTC, EUR) is path
+        assert graph.convert(EMoney(value=1, currency=BTC, decimals=0), EUR, 0) == 50_000
+
+    def test_values_balances(self):
+        graph = self._graph()
+        balances = [
+            EMoney(value=1, currency=BTC, decimals=0),
+            EMoney(value=10, currency=ETH, decimals=0),
+            EMoney(value=500, currency=USDT, decimals=0),
+        ]
+
+        assert graph.value(balances, USDT, 2) == EMoney(value=8_050_000, currency=USDT, decimals=2)
+
+    def test_missing_path(self):
+        with pytest.raises(ValueError):
+            self._graph().path(BTC, Currency("JPY"))
@@ -1,3 +1,5 @@
+import pickle
+
 from bafrapy.backtest.money import Currency
 
 
@@ -11,3 +13,15 @@ class TestCurrency:
 
     def test_inequality_different_symbol(self):
         assert Currency("BTC") != Currency("ETH")
+
+    def test_is_interned(self):
+        assert Currency("BTC") is Currency(symbol="BTC")
+
+    def test_ids_resolve_to_the_same_instance(self):
+        c = Currency("XMR")
+        assert Currency.from_id(c.id) is c
+        assert c.id != Currency("ETH").id
+
+    def test_pickle_keeps_identity(self):
+        c = Currency("BTC")
+        assert pickle.loads(pickle.dumps(c)) is c
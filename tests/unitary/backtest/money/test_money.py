@@ -1,8 +1,12 @@
-from decimal import Decimal
+import random
 
+from decimal import ROUND_HALF_EVEN, Decimal
+
+import polars as pl
+import pyarrow as pa
 import pytest
 
-from bafrapy.backtest.money import Currency, EMoney, Normalizer
+from bafrapy.backtest.money import Currency, EMoney, Normalizer, Ratio
 
 
 class TestNormalizer:
@@ -42,6 +46,40 @@ class TestNormalizer:
         result = Normalizer.to_float(100, 2)
         assert result == 1.00
 
+    def test_normalize_string_column_matches_decimal(self):
+        rows = ["1.50", "-0.005", " 2.5 ", "+3", ".5", "0.125", "-0.135", "1e-7", "1.25E+3", "-0"]
+        values, places = Normalizer.normalize_column(pl.Series("price", rows), 2)
+
+        assert values.dtype == pl.Int64
+        assert values.to_list() == [Normalizer.normalize_decimal(Decimal(r.strip()), 2) for r in rows]
+        assert places.to_list() == [Normalizer.decimal_places(Decimal(r.strip())) for r in rows]
+
+    def test_normalize_float_column_matches_normalize_float(self):
+        rng = random.Random(19)
+        rows = [0.1, 1.005, 2.675, 1e-5, -0.5, 1.5e14] + [rng.uniform(-1e6, 1e6) for _ in range(500)]
+        values, _ = Normalizer.normalize_column(pa.array(rows), 4)
+
+        assert values.to_list() == [Normalizer.normalize_float(r, 4) for r in rows]
+
+    def test_normalize_column_infers_decimals(self):
+        values, places = Normalizer.normalize_column(pl.Series(["1.5", "2.25", None, "3"]))
+
+        assert values.to_list() == [150, 225, None, 300]
+        assert places.to_list() == [1, 2, None, 0]
+
+    def test_decimal_places_column(self):
+        places = Normalizer.decimal_places_column(pa.chunked_array([[1.5, 0.001], [None, 100.0]]))
+
+        assert places.to_list() == [1, 3, None, 1]
+
+    def test_normalize_column_invalid_rows(self):
+        with pytest.raises(ValueError, match="rows 1"):
+            Normalizer.normalize_column(pl.Series(["1.0", "1.2.3", ""]), 2)
+
+    def test_normalize_column_overflow(self):
+        with pytest.raises(OverflowError):
+            Normalizer.normalize_column(pl.Series(["1e17"]), 8)
+
 
 class TestEMoney:
     def test_create_zero_value(self):
@@ -183,3 +221,48 @@ class TestEMoney:
                 _ = money > True
             else:
                 _ = money >= True
+
+    def test_trusted_matches_validated_constructor(self):
+        assert EMoney.trusted(123, Currency("EUR"), 2) == EMoney(value=123, currency=Currency("EUR"), decimals=2)
+
+    def test_mul_and_div_by_precompiled_ratio(self):
+        money = EMoney(value=1000, currency=Currency("EUR"), decimals=2)
+        ratio = Ratio.from_number(Decimal("0.0015"))
+
+        assert (ratio.numerator, ratio.denominator) == (15, 10000)
+        assert money * ratio == money * Decimal("0.0015")
+        assert money / ratio == money / Decimal("0.0015")
+
+    def test_ratio_cache_tells_equal_numbers_apart(self):
+        ratios = [Ratio.from_number(n) for n in (Decimal("1"), Decimal("1.0"), 1.0, Decimal("1.00"))]
+
+        assert [(r.numerator, r.denominator, r.coefficient) for r in ratios] == [
+            (1, 1, 1),
+            (10, 10, 10),
+            (10, 10, 10),
+            (100, 100, 100),
+        ]
+        assert str(Ratio.from_number(-0.0).decimal) == "-0.0"
+        assert str(Ratio.from_number(0.0).decimal) == "0.0"
+
+    def test_ratio_rejects_non_finite(self):
+        with pytest.raises(ValueError):
+            Ratio.from_number(float("inf"))
+
+    def test_rational_path_matches_decimal_rounding(self):
+        def previous(value, number, operation):
+            amount = Decimal(value)
+            scaled = amount * Decimal(str(number)) if operation == "mul" else amount / Decimal(str(number))
+            return int(scaled.quantize(Decimal("1"), rounding=ROUND_HALF_EVEN))
+
+        rng = random.Random(7)
+        for _ in range(5000):
+            value = rng.choice([rng.randint(-(10**6), 10**6), rng.randint(-(10**20), 10**20)])
+            number = rng.choice(
+                [rng.random() * 10, Decimal(rng.randint(-(10**6), 10**6)) / 10 ** rng.randint(0, 9), 0.5]
+            )
+            money = EMoney(value=value, currency=Currency("EUR"), decimals=2)
+
+            assert (money * number).value == previous(value, number, "mul")
+            if number:
+                assert (money / number).value == previous(value, number, "div")
@@ -3,7 +3,7 @@ from decimal import Decimal
 
 import pytest
 
-from bafrapy.backtest.money import Currency, EMoney, OHLCV, Pair
+from bafrapy.backtest.money import Currency, EMoney, OHLCV, Pair, SeriesBar, SeriesMeta
 
 
 class TestOHLCV:
@@ -165,3 +165,61 @@ class TestOHLCV:
     def test_close_cannot_be_greater_than_high(self):
         with pytest.raises(ValueError):
             self.make_ohlcv(high=100, close=110)
+
+    def test_trusted_matches_validated_constructor(self):
+        ohlcv = self.make_ohlcv()
+        trusted = OHLCV.trusted(
+            Pair(base=Currency("BTC"), quote=Currency("USD")),
+            86400,
+            8,
+            2,
+            datetime(2026, 1, 1, 0, 0, 0),
+            100 * 10**2,
+            120 * 10**2,
+            90 * 10**2,
+            110 * 10**2,
+            1000 * 10**8,
+            2000 * 10**2,
+        )
+        assert trusted == ohlcv
+        assert trusted.close_emoney == ohlcv.close_emoney
+
+
+class TestSeriesBar:
+    META = SeriesMeta(pair=Pair(Currency("BTC"), Currency("USD")), resolution=86400, base_decimals=8, quote_decimals=2)
+
+    def test_reads_like_ohlcv(self):
+        ohlcv = TestOHLCV().make_ohlcv()
+        bar = SeriesBar.from_ohlcv(ohlcv, self.META)
+
+        assert bar.to_ohlcv() == ohlcv
+        assert bar.pair is ohlcv.pair
+        assert bar.close_emoney == ohlcv.close_emoney
+        assert bar.volume_emoney == EMoney(value=1000 * 10**8, currency=Currency("BTC"), decimals=8)
+        assert bar.decimal_high() == ohlcv.decimal_high()
+        assert bar.float_low() == ohlcv.float_low()
+
+    def test_holds_only_bar_values(self):
+        assert SeriesBar.__slots__ == ("meta", "timestamp", "open", "high", "low", "close", "volume", "quote_volume")
+        assert not hasattr(self.META.bar(datetime(2026, 1, 1), 1, 2, 0, 1), "__dict__")
+
+    def test_meta_bar_validates_values(self):
+        with pytest.raises(ValueError):
+            self.META.bar(datetime(2026, 1, 1), 100, 90, 80, 95)
+        with pytest.raises(TypeError):
+            self.META.bar(datetime(2026, 1, 1), 1.0, 2, 0, 1)
+
+    def test_from_ohlcv_rejects_other_series(self):
+        with pytest.raises(ValueError):
+            SeriesBar.from_ohlcv(TestOHLCV().make_ohlcv(quote_decimals=3), self.META)
+
+
+class TestPair:
+    def test_is_interned(self):
+        pair = Pair(base=Currency("BTC"), quote=Currency("USD"))
+        assert pair is Pair(Currency("BTC"), Currency("USD"))
+        assert Pair.from_id(pair.id) is pair
+
+    def test_rejects_non_currency(self):
+        with pytest.raises(TypeError):
+            Pair(base="BTC", quote=Currency("USD"))
@@ -1,6 +1,6 @@
 import pytest
 
-from bafrapy.backtest.money import Currency, EMoney, ERate
+from bafrapy.backtest.money import Currency, EMoney, EMoneyArray, ERate
 
 
 class TestERate:
@@ -42,3 +42,44 @@ class TestERate:
             rate.convert(300, jpy_rate)
         with pytest.raises(TypeError, match="Unsupported rate type"):
             rate.convert(eur, 180)
+
+    def test_convert_array_matches_scalar(self):
+        rate = ERate(Currency("USDT"), Currency("EUR"))
+        amounts = [
+            EMoney(value=v, currency=Currency("USDT"), decimals=d)
+            for v, d in [(12345, 2), (-12345, 2), (10**17, 8), (7, 0), (999999, 6)]
+        ]
+        rates = [
+            EMoney(value=v, currency=Currency("EUR"), decimals=d)
+            for v, d in [(91, 2), (9123, 4), (9123456789, 10), (1, 0), (92, 2)]
+        ]
+
+        converted = rate.convert_array(amounts, rates, target_decimals=3)
+
+        assert list(converted) == [rate.convert(a, r, 3) for a, r in zip(amounts, rates)]
+
+    def test_convert_array_with_amounts_beyond_int64(self):
+        rate = ERate(Currency("USDT"), Currency("EUR"))
+        amounts = [EMoney(value=v, currency=Currency("USDT"), decimals=2) for v in (12345, 2**63 + 5)]
+        rates = EMoney(value=91, currency=Currency("EUR"), decimals=2)
+
+        converted = rate.convert_array(amounts, rates)
+
+        assert list(converted) == [rate.convert(a, rates) for a in amounts]
+
+    def test_convert_array_with_arrays_and_single_rate(self):
+        rate = ERate(Currency("BTC"), Currency("USD"))
+        amounts = EMoneyArray(values=[200_000_000, 50_000_000], currency=Currency("BTC"), decimals=8)
+        usd_rate = EMoney(value=5_000_000, currency=Currency("USD"), decimals=2)
+
+        converted = rate.convert_array(amounts, usd_rate)
+
+        assert converted.decimals == 2
+        assert converted.values.tolist() == [10_000_000, 2_500_000]
+
+    def test_convert_array_requires_target_decimals_for_mixed_rates(self):
+        rate = ERate(Currency("USDT"), Currency("EUR"))
+        amounts = [EMoney(value=1, currency=Currency("USDT"), decimals=0)] * 2
+        rates = [EMoney(value=1, currency=Currency("EUR"), decimals=d) for d in (1, 2)]
+        with pytest.raises(ValueError):
+            rate.convert_array(amounts, rates)
@@ -1,6 +1,17 @@
+from datetime import datetime
+
+import numpy as np
+import polars as pl
 import pytest
 
-from bafrapy.backtest.money import Currency, EMoney, SpotWallet, Wallet
+from bafrapy.backtest.money import (
+    Currency,
+    EMoney,
+    FastSpotWallet,
+    Ledger,
+    SpotWallet,
+    Wallet,
+)
 
 
 class TestWallet:
@@ -65,3 +76,106 @@ class TestSpotWallet:
         wallet.add_balance(EMoney(value=123, currency=Currency("BTC"), decimals=2))
         with pytest.raises(ValueError):
             wallet.subtract_balance(EMoney(value=1234, currency=Currency("BTC"), decimals=3))
+
+
+class TestLedger:
+    def _wallet(self) -> Wallet:
+        wallet = Wallet(ledger=Ledger(capacity=2))
+        wallet.add_balance(EMoney(value=100, currency=Currency("USD"), decimals=0), datetime(2024, 1, 1), "deposit")
+        wallet.subtract_balance(EMoney(value=1050, currency=Currency("USD"), decimals=1), datetime(2024, 1, 2), "buy")
+        wallet.add_balance(EMoney(value=2, currency=Currency("BTC"), decimals=0), datetime(2024, 1, 2), "buy")
+        wallet.add_balance(EMoney(value=5, currency=Currency("USD"), decimals=2), datetime(2024, 1, 3), "fee")
+        return wallet
+
+    def test_balance_at_past_timestamps(self):
+        ledger = self._wallet().ledger
+
+        assert len(ledger) == 4
+        assert ledger.balance(Currency("USD"), datetime(2023, 12, 31)) == EMoney(
+            value=0, currency=Currency("USD"), decimals=2
+        )
+        assert ledger.balance(Currency("USD"), datetime(2024, 1, 1, 12)) == EMoney(
+            value=100, currency=Currency("USD"), decimals=0
+        )
+        assert ledger.balance(Currency("USD"), datetime(2024, 1, 2)) == EMoney(
+            value=-5, currency=Currency("USD"), decimals=0
+        )
+        assert ledger.balance(Currency("USD")) == self._wallet().get_balance(Currency("USD"))
+
+    def test_balances_for_equity_curve(self):
+        ledger = self._wallet().ledger
+        times = np.array(["2024-01-01", "2024-01-02", "2024-01-03"], dtype="datetime64[us]")
+
+        balances = ledger.balances(Currency("USD"), times)
+
+        assert balances.decimals == 2
+        assert balances.values.tolist() == [10000, -500, -495]
+
+    def test_rejects_out_of_order_entries(self):
+        wallet = self._wallet()
+        with pytest.raises(ValueError):
+            wallet.add_balance(EMoney(value=1, currency=Currency("USD"), decimals=0), datetime(2024, 1, 1))
+
+    def test_requires_timestamp(self):
+        with pytest.raises(ValueError):
+            Wallet(ledger=Ledger()).add_balance(EMoney(value=1, currency=Currency("USD"), decimals=0))
+
+    def test_to_polars(self):
+        frame = self._wallet().ledger.to_polars()
+
+        assert frame.columns == ["time", "currency", "value", "decimals", "reason"]
+        assert frame["currency"].cast(pl.String).to_list() == ["USD", "USD", "BTC", "USD"]
+        assert frame["value"].to_list() == [100, -1050, 2, 5]
+        assert frame["reason"].cast(pl.String).to_list() == ["deposit", "buy", "buy", "fee"]
+
+
+class TestFastSpotWallet:
+    def test_matches_spot_wallet(self):
+        operations = [
+            ("add", EMoney(value=123, currency=Currency("BTC"), decimals=2)),
+            ("add", EMoney(value=1234, currency=Currency("BTC"), decimals=3)),
+            ("subtract", EMoney(value=4, currency=Currency("BTC"), decimals=1)),
+            ("add", EMoney(value=7, currency=Currency("ETH"), decimals=0)),
+        ]
+        slow, fast = SpotWallet(), FastSpotWallet()
+        for operation, amount in operations:
+            getattr(slow, f"{operation}_balance")(amount)
+            getattr(fast, f"{operation}_balance")(amount)
+
+        assert fast.currencies == slow.currencies
+        for currency in slow.currencies:
+            balance = fast.get_balance(currency)
+            assert balance == slow.get_balance(currency)
+            assert balance.decimals == slow.get_balance(currency).decimals
+
+    def test_rejects_overdraft_without_changing_balance(self):
+        wallet = FastSpotWallet()
+        wallet.add_balance(EMoney(value=123, currency=Currency("BTC"), decimals=2))
+
+        with pytest.raises(ValueError):
+            wallet.subtract_balance(EMoney(value=1234, currency=Currency("BTC"), decimals=3))
+        assert wallet.get_balance(Currency("BTC")) == EMoney(value=123, currency=Currency("BTC"), decimals=2)
+
+    def test_records_ledger(self):
+        wallet = FastSpotWallet(ledger=Ledger())
+        wallet.add_balance(EMoney(value=5, currency=Currency("USD"), decimals=0), datetime(2024, 1, 1))
+        wallet.subtract_balance(EMoney(value=2, currency=Currency("USD"), decimals=0), datetime(2024, 1, 2))
+
+        assert wallet.ledger.balance(Currency("USD")) == wallet.get_balance(Currency("USD"))
+
+    @pytest.mark.parametrize(
+        "timestamp, amount",
+        [
+            (None, 1),
+            (datetime(2023, 12, 31), 1),
+            (datetime(2024, 1, 2), 2**63),
+        ],
+    )
+    def test_rejected_ledger_entry_leaves_balance_unchanged(self, timestamp, amount):
+        wallet = FastSpotWallet(ledger=Ledger())
+        wallet.add_balance(EMoney(value=5, currency=Currency("USD"), decimals=0), datetime(2024, 1, 1))
+
+        with pytest.raises((ValueError, OverflowError)):
+            wallet.add_balance(EMoney(value=amount, currency=Currency("USD"), decimals=0), timestamp)
+        assert wallet.get_balance(Currency("USD")) == EMoney(value=5, currency=Currency("USD"), decimals=0)
+        assert len(wallet.ledger) == 1
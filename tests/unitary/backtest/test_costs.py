@@ -0,0 +1,202 @@
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+import pandas as pd
+import pytest
+
+import bafrapy.backtest.base as base
+import bafrapy.backtest.dataset as dataset
+
+from bafrapy.backtest.costs import FeeSchedule, FeeTier, Liquidity, VolumeSlippage
+from bafrapy.backtest.exceptions import (
+    NotEnoughMoneyToExecuteMarketOrder,
+    NotEnoughQuoteToExecuteMarketOrder,
+)
+from bafrapy.backtest.money import OHLCV, Currency, EMoney, Pair
+
+USD = Currency("USD")
+PAIR = Pair(base=Currency("BTC"), quote=USD)
+
+
+def _usd(value: int, decimals: int = 2) -> EMoney:
+    return EMoney(value=value, currency=USD, decimals=decimals)
+
+
+def _ohlcv(quote_volume: int) -> OHLCV:
+    return OHLCV(
+        pair=PAIR,
+        resolution=60,
+        base_decimals=0,
+        quote_decimals=0,
+        timestamp=datetime(2024, 1, 1),
+        open=10,
+        high=10,
+        low=10,
+        close=10,
+        quote_volume=quote_volume,
+    )
+
+
+class TestFeeSchedule:
+    def test_flat_fee_is_rounded_up(self):
+        fees = FeeSchedule.flat(Decimal("0.001"), 0.002)
+
+        assert fees.fee(_usd(1_001), Liquidity.maker) == _usd(2)
+        assert fees.fee(_usd(1_000), Liquidity.taker) == _usd(2)
+        assert fees.fee(_usd(0), Liquidity.taker) == _usd(0)
+        assert fees.traded == _usd(2_001)
+
+    def test_tiers_apply_from_traded_volume(self):
+        fees = FeeSchedule([FeeTier(0, 0.01, 0.02), FeeTier(100, 0.005, 0.01), FeeTier(1000, 0, 0.001)])
+
+        assert fees.fee(_usd(9_900), Liquidity.taker) == _usd(198)
+        assert fees.tier.volume == 0
+        assert fees.fee(_usd(100), Liquidity.taker) == _usd(2)
+        assert fees.tier.volume == 100
+        # A fill crossing several tiers moves straight to the last one.
+        fees.fee(_usd(200_000), Liquidity.maker)
+        assert fees.fee(_usd(10_000), Liquidity.maker) == _usd(0)
+        assert fees.fee(_usd(10_000), Liquidity.taker) == _usd(10)
+
+    def test_counts_volume_with_mixed_decimals(self):
+        fees = FeeSchedule([FeeTier(0, 0.01, 0.01), FeeTier(Decimal("1.5"), 0, 0)])
+
+        fees.fee(_usd(1, 0), Liquidity.maker)
+        fees.fee(_usd(49, 2), Liquidity.maker)
+        assert fees.tier.volume == 0
+        fees.fee(_usd(1, 2), Liquidity.maker)
+
+        assert fees.traded == _usd(150)
+        assert fees.tier.volume == Decimal("1.5")
+
+    def test_rejects_other_currency(self):
+        fees = FeeSchedule.flat(0.001)
+        fees.fee(_usd(1), Liquidity.maker)
+
+        with pytest.raises(TypeError):
+            fees.fee(EMoney(value=1, currency=Currency("EUR"), decimals=2), Liquidity.maker)
+
+    @pytest.mark.parametrize(
+        "tiers",
+        [
+            [],
+            [FeeTier(1, 0, 0)],
+            [FeeTier(0, 0, 0), FeeTier(0, 0, 0)],
+            [FeeTier(0, 0, 0), FeeTier(10, 0, 0), FeeTier(5, 0, 0)],
+        ],
+    )
+    def test_rejects_invalid_tiers(self, tiers):
+        with pytest.raises(ValueError):
+            FeeSchedule(tiers)
+
+    def test_rejects_negative_rates(self):
+        with pytest.raises(ValueError):
+            FeeTier(0, -0.001, 0)
+
+
+class TestVolumeSlippage:
+    def test_moves_price_by_participation(self):
+        slippage = VolumeSlippage(impact=0.5, max_impact=0.1)
+
+        # 100 of a 1000 volume is a participation of 0.1, so 0.05 of the price.
+        assert slippage.price(1_000, 100, _ohlcv(1_000), buy=True) == 1_050
+        assert slippage.price(1_000, 100, _ohlcv(1_000), buy=False) == 950
+        # Rounded against the fill.
+        assert slippage.price(10, 100, _ohlcv(1_000), buy=True) == 11
+        assert slippage.price(10, 100, _ohlcv(1_000), buy=False) == 9
+
+    def test_is_capped(self):
+        slippage = VolumeSlippage(impact=0.5, max_impact=0.1)
+
+        assert slippage.price(1_000, 900, _ohlcv(1_000), buy=True) == 1_100
+        assert slippage.price(1_000, 1, _ohlcv(0), buy=False) == 900
+
+
+class TestBrokerCosts:
+    def _broker(self, **config) -> base.VBroker:
+        candles = 3
+        df = pd.DataFrame(
+            {
+                "time": [datetime(2024, 1, 1) + timedelta(days=x) for x in range(candles)],
+                "resolution": 86400,
+                "open": [10, 10, 10],
+                "high": [10, 10, 12],
+                "low": [10, 10, 10],
+                "close": [10, 10, 12],
+                "volume": 100,
+                "quote_volume": 1000,
+                "base_decimals": 0,
+                "quote_decimals": 0,
+            }
+        )
+        data = dataset.PandasDataSet(pair=PAIR, resolution=86400, data=df)
+        return base.VBroker(base.VBrokerConfig(initial_money=1000, data=data, **config))
+
+    def test_flat_fee_from_config(self):
+        vbroker = self._broker(fee=Decimal("0.01"))
+        vbroker.add_market_order(base.Side.buy, 10)
+
+        vbroker.next_data()
+
+        assert vbroker.trades[0].fee == 1
+        assert vbroker.available_money == 899
+
+    def test_set_commission(self):
+        vbroker = self._broker()
+        vbroker.set_commision(Decimal("0.05"))
+        vbroker.add_market_order(base.Side.buy, 10)
+
+        vbroker.next_data()
+
+        assert vbroker.fee == Decimal("0.05")
+        assert vbroker.available_money == 895
+
+    def test_taker_slippage_and_maker_fee(self):
+        vbroker = self._broker(
+            fees=FeeSchedule.flat(maker=0.001, taker=0.01), slippage=VolumeSlippage(impact=1, max_impact=0.5)
+        )
+        vbroker.add_market_order(base.Side.buy, 10)
+        vbroker.next_data()
+        vbroker.add_limit_order(base.Side.sell, 10, 12)
+        vbroker.next_data()
+
+        buy, sell = vbroker.trades
+        # 100 of a 1000 volume moves the price by 10%, and the taker fee is 1% of 110.
+        assert (buy.executed_price, buy.fee) == (11, 2)
+        # Limit orders are makers and fill at their price.
+        assert (sell.executed_price, sell.fee) == (12, 1)
+        assert vbroker.available_money == 1000 - 112 + 120 - 1
+
+    def test_rejected_market_order_is_not_charged(self):
+        fees = FeeSchedule([FeeTier(0, 0.01, 0.01), FeeTier(1000, 0, 0)])
+        vbroker = self._broker(fees=fees, slippage=VolumeSlippage(impact=1, max_impact=0.5))
+        order = vbroker.add_market_order(base.Side.buy, 200)
+
+        with pytest.raises(NotEnoughMoneyToExecuteMarketOrder):
+            vbroker.next_data()
+
+        assert vbroker.trades == []
+        assert vbroker.open_position is None
+        assert fees.traded is None
+        assert fees.tier.volume == 0
+        assert vbroker.available_money == 1000
+        assert order.state == base.OrderState.rejected
+        assert vbroker.pending_orders == {}
+        assert list(vbroker.rejected_orders.values()) == [order]
+        assert len(vbroker.order_book) == 0
+
+        assert vbroker.next_data().timestamp == datetime(2024, 1, 3)
+        assert vbroker.trades == []
+
+    def test_rejected_market_sell_is_not_charged(self):
+        vbroker = self._broker(fee=Decimal("0.01"))
+        order = vbroker.add_market_order(base.Side.sell, 10)
+
+        with pytest.raises(NotEnoughQuoteToExecuteMarketOrder):
+            vbroker.next_data()
+
+        assert vbroker.trades == []
+        assert vbroker.open_position is None
+        assert vbroker.fees.traded is None
+        assert list(vbroker.rejected_orders.values()) == [order]
+        assert vbroker.next_data().timestamp == datetime(2024, 1, 3)
@@ -1,10 +1,26 @@
-from datetime import datetime, timedelta
+import gc
+import pickle
+import time
+
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
 from unittest.mock import MagicMock
 
+import numpy as np
 import pandas as pd
 import polars as pl
+import pytest
 
 from bafrapy.backtest.dataset import DucklakeDataSet, PandasDataSet, PolarsDataSet
+from bafrapy.backtest.dataset.cache import OHLCVCache
+from bafrapy.backtest.dataset.columns import OHLCVColumns
+from bafrapy.backtest.dataset.multi import MissingBarPolicy, MultiPairDataSet
+from bafrapy.backtest.dataset.prefetch import Prefetcher
+from bafrapy.backtest.dataset.resampled import ResampledDataSet
+from bafrapy.backtest.dataset.shared import DataSetShard
+from bafrapy.backtest.dataset.validation import validate_ohlcv_frame
+from bafrapy.backtest.dataset.window import LookbackWindow
+from bafrapy.backtest.exceptions import InvalidOHLCVData
 from bafrapy.backtest.money import Currency, OHLCV, Pair
 
 __pytest__ = False
@@ -32,6 +48,15 @@ def _ohlcv_frame(candles: int) -> pd.DataFrame:
     )
 
 
+def _ducklake_chunk(start: datetime, candles: int) -> pl.DataFrame:
+    return pl.from_pandas(_ohlcv_frame(candles)).with_columns(
+        pl.Series("time", [start + timedelta(days=x) for x in range(candles)]),
+        pl.lit("binance").alias("exchange"),
+        pl.lit("BTCUSDT").alias("symbol"),
+        pl.lit(False).alias("generated"),
+    )
+
+
 class TestPandasDataSet:
     def test_iterates_ohlcv(self):
         dataset = PandasDataSet(pair=PAIR, resolution=RESOLUTION, data=_ohlcv_frame(5))
@@ -49,6 +74,98 @@ class TestPandasDataSet:
         assert dataset.next_data() is None
         assert not dataset.has_data()
 
+    def test_keeps_time_zone(self):
+        data = _ohlcv_frame(1)
+        data["time"] = data["time"].dt.tz_localize("UTC").dt.tz_convert("Europe/Madrid")
+        dataset = PandasDataSet(pair=PAIR, resolution=RESOLUTION, data=data)
+
+        ohlcv = dataset.next_data()
+        assert ohlcv is not None
+        assert ohlcv.timestamp == datetime(2024, 1, 1, tzinfo=timezone.utc)
+        assert ohlcv.timestamp.utcoffset() == timedelta(hours=1)
+
+    def test_rejects_null_values(self):
+        data = _ohlcv_frame(2).astype({"close": "float64"})
+        data.loc[1, "close"] = None
+        with pytest.raises(ValueError, match="nulls"):
+            PandasDataSet(pair=PAIR, resolution=RESOLUTION, data=data)
+
+    def test_iter_batches(self):
+        dataset = PandasDataSet(pair=PAIR, resolution=RESOLUTION, data=_ohlcv_frame(5))
+        dataset.next_data()
+
+        batches = list(dataset.iter_batches(3))
+
+        assert [len(batch) for batch in batches] == [3, 1]
+        assert batches[0].time[0] == np.datetime64(datetime(2024, 1, 2))
+        assert batches[1].values[0].tolist() == [RESOLUTION, 2, 0, 200, 300, 100, 200, 100000, 0]
+        assert dataset.get_current_data().timestamp == datetime(2024, 1, 5)
+        assert not dataset.has_data()
+
+    def test_iter_batches_rejects_invalid_size(self):
+        dataset = PandasDataSet(pair=PAIR, resolution=RESOLUTION, data=_ohlcv_frame(1))
+        with pytest.raises(ValueError):
+            next(dataset.iter_batches(0))
+
+    def test_first_touch(self):
+        data = _ohlcv_frame(2000)
+        data.loc[1500, "low"] = 50
+        data.loc[1700, "high"] = 400
+        columns = OHLCVColumns.from_pandas(data)
+
+        assert columns.first_touch(0, 2000, below=Decimal("50.5")) == 1500
+        assert columns.first_touch(0, 2000, below=Decimal("49.5")) == 2000
+        assert columns.first_touch(0, 2000, below=50, above=400) == 1500
+        assert columns.first_touch(1501, 2000, below=50, above=Decimal("399.5")) == 1700
+        assert columns.first_touch(0, 1000, above=300) == 0
+
+    def test_skip_to_touch(self):
+        data = _ohlcv_frame(5)
+        data.loc[3, "low"] = 50
+        dataset = PandasDataSet(pair=PAIR, resolution=RESOLUTION, data=data, lookback=2)
+        dataset.next_data()
+
+        skipped = dataset.skip_to_touch(below=60, above=None)
+
+        assert skipped == 2
+        assert dataset.get_current_data().timestamp == datetime(2024, 1, 3)
+        assert dataset.window.time().tolist() == [datetime(2024, 1, 2), datetime(2024, 1, 3)]
+        assert dataset.next_data().low == 50
+
+    def test_skip_to_touch_stops_at_until(self):
+        dataset = PandasDataSet(pair=PAIR, resolution=RESOLUTION, data=_ohlcv_frame(5))
+
+        assert dataset.skip_to_touch(below=None, above=None, until=datetime(2024, 1, 2, 12)) == 2
+        assert dataset.next_data().timestamp == datetime(2024, 1, 3)
+        assert dataset.skip_to_touch(below=None, above=None) == 2
+        assert not dataset.has_data()
+
+    def test_seek(self):
+        dataset = PandasDataSet(pair=PAIR, resolution=RESOLUTION, data=_ohlcv_frame(5), lookback=2)
+        dataset.next_data()
+
+        dataset.seek(datetime(2024, 1, 3, 12))
+
+        assert dataset.get_current_data() is None
+        assert len(dataset.window) == 0
+        assert dataset.next_data().timestamp == datetime(2024, 1, 4)
+
+    def test_slice_is_inclusive(self):
+        dataset = PandasDataSet(pair=PAIR, resolution=RESOLUTION, data=_ohlcv_frame(5))
+
+        sliced = dataset.slice(datetime(2024, 1, 2), datetime(2024, 1, 4))
+
+        assert len(sliced.data) == 3
+        assert [sliced.next_data().timestamp for _ in range(3)] == [datetime(2024, 1, d) for d in (2, 3, 4)]
+        assert not sliced.has_data()
+        assert dataset.next_data().timestamp == datetime(2024, 1, 1)
+
+    def test_seek_rejects_unsorted_data(self):
+        data = _ohlcv_frame(3).iloc[::-1].reset_index(drop=True)
+        dataset = PandasDataSet(pair=PAIR, resolution=RESOLUTION, data=data)
+        with pytest.raises(ValueError, match="sorted"):
+            dataset.seek(datetime(2024, 1, 2))
+
 
 class TestPolarsDataSet:
     def test_iterates_ohlcv(self):
@@ -65,6 +182,55 @@ class TestPolarsDataSet:
 
         assert dataset.next_data() is None
 
+    def test_iterates_decimal_columns(self):
+        data = pl.from_pandas(_ohlcv_frame(2)).with_columns(
+            pl.col("open", "high", "low", "close", "volume", "quote_volume").cast(pl.Decimal(precision=38, scale=0))
+        )
+        dataset = PolarsDataSet(pair=PAIR, resolution=RESOLUTION, data=data)
+
+        ohlcv = dataset.next_data()
+        assert ohlcv is not None
+        assert type(ohlcv.open) is int
+        assert ohlcv.open == 200
+        assert ohlcv.timestamp == datetime(2024, 1, 1)
+
+    def test_keeps_time_zone(self):
+        data = pl.from_pandas(_ohlcv_frame(1)).with_columns(
+            pl.col("time").dt.replace_time_zone("UTC").dt.convert_time_zone("Europe/Madrid")
+        )
+        dataset = PolarsDataSet(pair=PAIR, resolution=RESOLUTION, data=data)
+
+        ohlcv = dataset.next_data()
+        assert ohlcv is not None
+        assert ohlcv.timestamp == datetime(2024, 1, 1, tzinfo=timezone.utc)
+        assert ohlcv.timestamp.utcoffset() == timedelta(hours=1)
+
+    def test_rejects_null_values(self):
+        data = pl.from_pandas(_ohlcv_frame(2)).with_columns(
+            pl.when(pl.int_range(pl.len()) == 1).then(None).otherwise(pl.col("close")).alias("close")
+        )
+        with pytest.raises(ValueError, match="nulls"):
+            PolarsDataSet(pair=PAIR, resolution=RESOLUTION, data=data)
+
+    def test_rejects_missing_columns(self):
+        data = pl.from_pandas(_ohlcv_frame(2)).drop("quote_volume")
+        with pytest.raises(ValueError, match="Missing OHLCV columns"):
+            PolarsDataSet(pair=PAIR, resolution=RESOLUTION, data=data)
+
+    def test_seek_and_slice_with_time_zone(self):
+        data = pl.from_pandas(_ohlcv_frame(5)).with_columns(
+            pl.col("time").dt.replace_time_zone("UTC").dt.convert_time_zone("Europe/Madrid")
+        )
+        dataset = PolarsDataSet(pair=PAIR, resolution=RESOLUTION, data=data)
+
+        sliced = dataset.slice(datetime(2024, 1, 2, tzinfo=timezone.utc), datetime(2024, 1, 3, tzinfo=timezone.utc))
+        dataset.seek(datetime(2024, 1, 5, tzinfo=timezone.utc))
+
+        assert sliced.data.height == 2
+        assert sliced.next_data().timestamp == datetime(2024, 1, 2, tzinfo=timezone.utc)
+        assert dataset.next_data().timestamp == datetime(2024, 1, 5, tzinfo=timezone.utc)
+        assert not dataset.has_data()
+
 
 class TestDucklakeDataSet:
     DUCKLAKE_PAIR = Pair(base=Currency("BTC"), quote=Currency("USDT"))
@@ -130,3 +296,598 @@ class TestDucklakeDataSet:
 
         assert dataset.next_data() is None
         assert not dataset.has_data()
+
+    def test_prefetches_chunks_in_background(self):
+        chunks = [_ducklake_chunk(datetime(2024, 1, 1) + timedelta(days=2 * i), 2) for i in range(3)]
+        repository = MagicMock()
+        repository.get_ohlcv_stream.return_value = iter(chunks)
+
+        dataset = DucklakeDataSet(
+            pair=self.DUCKLAKE_PAIR,
+            resolution=RESOLUTION,
+            repository=repository,
+            exchange="binance",
+            start=datetime(2024, 1, 1).date(),
+            end=datetime(2024, 1, 6).date(),
+            chunk_size=2,
+            prefetch=2,
+        )
+
+        prefetcher = dataset._chunks
+        timestamps = []
+        while dataset.has_data():
+            timestamps.append(dataset.next_data().timestamp)
+        assert timestamps == [datetime(2024, 1, 1) + timedelta(days=i) for i in range(6)]
+        assert dataset.next_data() is None
+        assert not prefetcher._thread.is_alive()
+
+    def test_prefetch_propagates_repository_errors(self):
+        def failing_stream():
+            yield _ducklake_chunk(datetime(2024, 1, 1), 1)
+            raise RuntimeError("connection lost")
+
+        repository = MagicMock()
+        repository.get_ohlcv_stream.return_value = failing_stream()
+
+        dataset = DucklakeDataSet(
+            pair=self.DUCKLAKE_PAIR,
+            resolution=RESOLUTION,
+            repository=repository,
+            exchange="binance",
+            start=datetime(2024, 1, 1).date(),
+            end=datetime(2024, 1, 2).date(),
+            prefetch=1,
+        )
+
+        assert dataset.next_data() is not None
+        with pytest.raises(RuntimeError, match="connection lost"):
+            dataset.next_data()
+
+    def test_seek_restarts_query_at_timestamp(self):
+        repository = MagicMock()
+        repository.get_ohlcv_stream.side_effect = [
+            iter([_ducklake_chunk(datetime(2024, 1, 1), 4)]),
+            iter([_ducklake_chunk(datetime(2024, 1, 3), 2)]),
+        ]
+        dataset = DucklakeDataSet(
+            pair=self.DUCKLAKE_PAIR,
+            resolution=RESOLUTION,
+            repository=repository,
+            exchange="binance",
+            start=datetime(2024, 1, 1).date(),
+            end=datetime(2024, 1, 4).date(),
+        )
+        dataset.next_data()
+
+        dataset.seek(datetime(2024, 1, 3))
+
+        assert repository.get_ohlcv_stream.call_args.args[3] == datetime(2024, 1, 3)
+        assert dataset.get_current_data() is None
+        assert dataset.next_data().timestamp == datetime(2024, 1, 3)
+
+    def test_slice_queries_new_range(self):
+        repository = MagicMock()
+        repository.get_ohlcv_stream.return_value = iter([])
+        dataset = DucklakeDataSet(
+            pair=self.DUCKLAKE_PAIR,
+            resolution=RESOLUTION,
+            repository=repository,
+            exchange="binance",
+            start=datetime(2024, 1, 1).date(),
+            end=datetime(2024, 1, 31).date(),
+        )
+
+        sliced = dataset.slice(datetime(2024, 1, 10).date(), datetime(2024, 1, 20).date())
+
+        assert (sliced.start, sliced.end) == (datetime(2024, 1, 10).date(), datetime(2024, 1, 20).date())
+        assert repository.get_ohlcv_stream.call_args.args[3:5] == (sliced.start, sliced.end)
+
+    def test_rejects_negative_prefetch(self):
+        with pytest.raises(ValueError):
+            DucklakeDataSet(
+                pair=self.DUCKLAKE_PAIR,
+                resolution=RESOLUTION,
+                repository=MagicMock(),
+                exchange="binance",
+                start=datetime(2024, 1, 1).date(),
+                end=datetime(2024, 1, 2).date(),
+                prefetch=-1,
+            )
+
+
+class TestCommonScale:
+    def _mixed_frame(self) -> pl.DataFrame:
+        return pl.from_pandas(_ohlcv_frame(3)).with_columns(
+            pl.Series("quote_decimals", [0, 2, 1]),
+            pl.Series("base_decimals", [2, 0, 2]),
+        )
+
+    def test_rescales_to_series_maximum(self):
+        dataset = PolarsDataSet(pair=PAIR, resolution=RESOLUTION, data=self._mixed_frame(), common_scale=True)
+
+        bars = [dataset.next_data() for _ in range(3)]
+
+        assert [(bar.quote_decimals, bar.base_decimals) for bar in bars] == [(2, 2)] * 3
+        assert [bar.open for bar in bars] == [20000, 200, 2000]
+        assert [bar.volume for bar in bars] == [100000, 10000000, 100000]
+
+    def test_rescales_to_explicit_decimals(self):
+        columns = OHLCVColumns.from_polars(self._mixed_frame()).normalize(quote_decimals=4, base_decimals=3)
+
+        assert columns.values[:, 1:3].tolist() == [[3, 4]] * 3
+        assert columns.values[:, 3].tolist() == [2000000, 20000, 200000]
+
+    def test_rejects_dropping_decimals(self):
+        with pytest.raises(ValueError, match="quote decimals"):
+            OHLCVColumns.from_polars(self._mixed_frame()).normalize(quote_decimals=1)
+
+    def test_rejects_overflow(self):
+        data = self._mixed_frame().with_columns(pl.lit(2**62).alias("high"))
+        with pytest.raises(OverflowError):
+            OHLCVColumns.from_polars(data).normalize()
+
+    def test_series_bars_share_metadata(self):
+        columns = OHLCVColumns.from_polars(self._mixed_frame()).normalize()
+
+        bars = columns.series_bars(PAIR)
+
+        assert all(bar.meta is bars[0].meta for bar in bars)
+        assert [bar.to_ohlcv() for bar in bars] == [columns.ohlcv(i, PAIR) for i in range(3)]
+
+    def test_series_bars_reject_mixed_decimals(self):
+        with pytest.raises(ValueError, match="same resolution and decimals"):
+            OHLCVColumns.from_polars(self._mixed_frame()).series_bars(PAIR)
+
+    def test_streamed_dataset_requires_targets(self):
+        with pytest.raises(ValueError, match="explicit"):
+            DucklakeDataSet(
+                pair=PAIR,
+                resolution=RESOLUTION,
+                repository=MagicMock(),
+                exchange="binance",
+                start=datetime(2024, 1, 1).date(),
+                end=datetime(2024, 1, 2).date(),
+                common_scale=True,
+            )
+
+
+class TestDataSetSharding:
+    def test_split_and_windows_are_views(self):
+        dataset = PolarsDataSet(pair=PAIR, resolution=RESOLUTION, data=pl.from_pandas(_ohlcv_frame(10)))
+
+        parts = dataset.split(3)
+        windows = list(dataset.windows(4, 3))
+
+        assert [len(part.columns) for part in parts] == [4, 3, 3]
+        assert [window.columns.timestamp(0).day for window in windows] == [1, 4, 7]
+        assert all(len(window.data) == 4 for window in windows)
+        assert all(np.shares_memory(part.columns.values, dataset.columns.values) for part in parts)
+
+    def test_split_rejects_too_many_parts(self):
+        dataset = PolarsDataSet(pair=PAIR, resolution=RESOLUTION, data=pl.from_pandas(_ohlcv_frame(2)))
+        with pytest.raises(ValueError):
+            dataset.split(3)
+
+    def test_shard_round_trip(self, tmp_path):
+        data = pl.from_pandas(_ohlcv_frame(6)).with_columns(
+            pl.col("time").dt.replace_time_zone("UTC").dt.convert_time_zone("Europe/Madrid")
+        )
+        dataset = PolarsDataSet(pair=PAIR, resolution=RESOLUTION, data=data)
+
+        shard = DataSetShard.share(dataset, tmp_path / "ohlcv.arrow")
+        folds = [pickle.loads(pickle.dumps(fold)) for fold in shard.windows(3, 2)]
+        opened = [fold.open(lookback=2) for fold in folds]
+
+        assert [(fold.start, fold.stop) for fold in folds] == [(0, 3), (2, 5)]
+        assert [len(part) for part in shard.split(4)] == [2, 2, 1, 1]
+        bar = opened[1].next_data()
+        assert bar == dataset.columns.ohlcv(2, PAIR)
+        assert bar.timestamp.utcoffset() == timedelta(hours=1)
+        assert not opened[1].columns.values.flags.writeable
+
+
+class TestPrefetcher:
+    def test_memory_is_bounded_by_depth(self):
+        pulled = []
+
+        def source():
+            for i in range(100):
+                pulled.append(i)
+                yield i
+
+        prefetcher = Prefetcher(source(), 2)
+        deadline = time.monotonic() + 1
+        while len(pulled) < 3 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        time.sleep(0.05)
+
+        # Two queued items plus the one the producer is blocked trying to enqueue.
+        assert len(pulled) == 3
+        assert next(prefetcher) == 0
+        prefetcher.close()
+        assert next(prefetcher, None) is None
+
+    def test_rejects_invalid_depth(self):
+        with pytest.raises(ValueError):
+            Prefetcher(iter([]), 0)
+
+    def test_context_manager_stops_thread_and_closes_source(self):
+        closed = []
+
+        def source():
+            try:
+                yield from range(100)
+            finally:
+                closed.append(True)
+
+        with Prefetcher(source(), 1) as prefetcher:
+            assert next(prefetcher) == 0
+        assert not prefetcher._thread.is_alive()
+        assert closed == [True]
+
+    def test_abandoned_prefetcher_stops_thread(self):
+        prefetcher = Prefetcher(iter(range(100)), 1)
+        thread = prefetcher._thread
+
+        del prefetcher
+        gc.collect()
+
+        thread.join(timeout=1)
+        assert not thread.is_alive()
+
+    def test_source_errors_are_forwarded(self):
+        def source():
+            yield 0
+            raise ValueError("bad chunk")
+
+        prefetcher = Prefetcher(source(), 1)
+        assert next(prefetcher) == 0
+        with pytest.raises(ValueError, match="bad chunk"):
+            next(prefetcher)
+        assert next(prefetcher, None) is None
+
+
+class TestValidateOHLCVFrame:
+    def _frame(self) -> pl.DataFrame:
+        return pl.from_pandas(_ohlcv_frame(5)).drop("time")
+
+    def test_valid_frame(self):
+        validation = validate_ohlcv_frame(self._frame())
+        assert validation.is_valid
+        assert validation.rows == []
+        validation.raise_for_failures()
+
+    def test_reports_failing_rows(self):
+        data = self._frame().with_columns(
+            pl.when(pl.int_range(pl.len()) == 1).then(50).otherwise(pl.col("high")).alias("high"),
+            pl.when(pl.int_range(pl.len()) == 3).then(-1).otherwise(pl.col("volume")).alias("volume"),
+            pl.when(pl.int_range(pl.len()) == 4).then(350).otherwise(pl.col("close")).alias("close"),
+        )
+
+        validation = validate_ohlcv_frame(data)
+
+        assert not validation.is_valid
+        assert validation.rows == [1, 3, 4]
+        assert validation.failed_checks == ["negative_values", "high_below_low", "close_out_of_range"]
+        assert validation.failures.row(0, named=True)["high_below_low"]
+        with pytest.raises(InvalidOHLCVData) as error:
+            validation.raise_for_failures()
+        assert error.value.rows == [1, 3, 4]
+
+    def test_dataset_rejects_invalid_rows(self):
+        data = _ohlcv_frame(3)
+        data.loc[2, "low"] = 250
+        with pytest.raises(InvalidOHLCVData, match="rows 2"):
+            PandasDataSet(pair=PAIR, resolution=RESOLUTION, data=data)
+        with pytest.raises(InvalidOHLCVData, match="rows 2"):
+            PolarsDataSet(pair=PAIR, resolution=RESOLUTION, data=pl.from_pandas(data))
+
+
+class TestOHLCVCache:
+    PAIR = Pair(base=Currency("BTC"), quote=Currency("USDT"))
+
+    def _dataset(self, repository, cache: OHLCVCache, end_day: int = 4) -> DucklakeDataSet:
+        return DucklakeDataSet(
+            pair=self.PAIR,
+            resolution=RESOLUTION,
+            repository=repository,
+            exchange="binance",
+            start=datetime(2024, 1, 1).date(),
+            end=datetime(2024, 1, end_day).date(),
+            chunk_size=2,
+            cache=cache,
+        )
+
+    def _repository(self, snapshot: int = 1) -> MagicMock:
+        repository = MagicMock()
+        repository.current_snapshot.return_value = snapshot
+        repository.get_ohlcv_stream.side_effect = lambda *args: iter(
+            [_ducklake_chunk(datetime(2024, 1, 1), 2), _ducklake_chunk(datetime(2024, 1, 3), 2)]
+        )
+        return repository
+
+    def _drain(self, dataset: DucklakeDataSet) -> list[datetime]:
+        timestamps = []
+        while dataset.has_data():
+            timestamps.append(dataset.next_data().timestamp)
+        return timestamps
+
+    def test_serves_second_run_from_cache(self, tmp_path):
+        cache = OHLCVCache(tmp_path)
+        repository = self._repository()
+
+        first = self._drain(self._dataset(repository, cache))
+        second = self._drain(self._dataset(repository, cache))
+
+        assert first == second == [datetime(2024, 1, 1) + timedelta(days=i) for i in range(4)]
+        assert repository.get_ohlcv_stream.call_count == 1
+        stats = cache.stats()
+        assert (stats.hits, stats.misses) == (1, 1)
+        assert stats.size_bytes > 0
+
+    def test_new_snapshot_misses(self, tmp_path):
+        cache = OHLCVCache(tmp_path)
+        self._drain(self._dataset(self._repository(snapshot=1), cache))
+        repository = self._repository(snapshot=2)
+
+        self._drain(self._dataset(repository, cache))
+
+        assert repository.get_ohlcv_stream.call_count == 1
+        assert cache.stats().misses == 2
+
+    def test_partially_consumed_stream_is_not_cached(self, tmp_path):
+        cache = OHLCVCache(tmp_path)
+        dataset = self._dataset(self._repository(), cache)
+        dataset.next_data()
+        dataset.close()
+
+        assert cache.stats().size_bytes == 0
+        assert list(tmp_path.iterdir()) == []
+
+    def test_evicts_least_recently_used(self, tmp_path):
+        cache = OHLCVCache(tmp_path)
+        repository = self._repository()
+        self._drain(self._dataset(repository, cache, end_day=4))
+        entry_size = cache.stats().size_bytes
+
+        cache = OHLCVCache(tmp_path, max_bytes=int(entry_size * 1.5))
+        self._drain(self._dataset(repository, cache, end_day=5))
+
+        stats = cache.stats()
+        assert stats.evictions == 1
+        assert len(list(tmp_path.glob("*.arrow"))) == 1
+        assert stats.size_bytes <= entry_size * 1.5
+
+
+class TestResampledDataSet:
+    def _minute_frame(self, candles: int, start: datetime = datetime(2024, 1, 1)) -> pl.DataFrame:
+        return pl.DataFrame(
+            {
+                "time": [start + timedelta(minutes=x) for x in range(candles)],
+                "resolution": [60] * candles,
+                "open": [100 + x for x in range(candles)],
+                "high": [110 + x for x in range(candles)],
+                "low": [90 + x for x in range(candles)],
+                "close": [105 + x for x in range(candles)],
+                "volume": [10] * candles,
+                "quote_volume": [1000] * candles,
+                "base_decimals": [2] * candles,
+                "quote_decimals": [0] * candles,
+            }
+        )
+
+    def _drain(self, dataset) -> list[OHLCV]:
+        bars = []
+        while dataset.has_data():
+            bars.append(dataset.next_data())
+        return bars
+
+    @pytest.mark.parametrize("batch_size", [1, 3, 10_000])
+    def test_aggregates_buckets(self, batch_size):
+        source = PolarsDataSet(pair=PAIR, resolution=60, data=self._minute_frame(12))
+        dataset = ResampledDataSet(source=source, resolution=300, batch_size=batch_size)
+
+        bars = self._drain(dataset)
+
+        assert [bar.timestamp for bar in bars] == [datetime(2024, 1, 1, 0, m) for m in (0, 5, 10)]
+        assert [(bar.open, bar.high, bar.low, bar.close) for bar in bars] == [
+            (100, 114, 90, 109),
+            (105, 119, 95, 114),
+            (110, 121, 100, 116),
+        ]
+        assert [bar.volume for bar in bars] == [50, 50, 20]
+        assert [bar.quote_volume for bar in bars] == [5000, 5000, 2000]
+        assert all(bar.resolution == 300 for bar in bars)
+        assert dataset.next_data() is None
+
+    def test_aligns_buckets_to_epoch(self):
+        source = PolarsDataSet(pair=PAIR, resolution=60, data=self._minute_frame(4, datetime(2024, 1, 1, 0, 3)))
+        bars = self._drain(ResampledDataSet(source=source, resolution=300))
+        assert [bar.timestamp for bar in bars] == [datetime(2024, 1, 1, 0, 0), datetime(2024, 1, 1, 0, 5)]
+        assert [bar.open for bar in bars] == [100, 102]
+
+    def test_rescales_mixed_decimals(self):
+        data = self._minute_frame(2).with_columns(
+            pl.Series("open", [100, 1015]),
+            pl.Series("high", [110, 1200]),
+            pl.Series("low", [90, 1000]),
+            pl.Series("close", [105, 1150]),
+            pl.Series("volume", [10, 100]),
+            pl.Series("quote_volume", [1000, 10000]),
+            pl.Series("quote_decimals", [0, 1]),
+            pl.Series("base_decimals", [2, 3]),
+        )
+        source = PolarsDataSet(pair=PAIR, resolution=60, data=data)
+
+        [bar] = self._drain(ResampledDataSet(source=source, resolution=300))
+
+        assert (bar.quote_decimals, bar.base_decimals) == (1, 3)
+        assert (bar.open, bar.high, bar.low, bar.close) == (1000, 1200, 900, 1150)
+        assert bar.volume == 200
+        assert bar.quote_volume == 20000
+
+    def test_resamples_row_based_source(self):
+        repository = MagicMock()
+        repository.get_ohlcv_stream.return_value = iter([self._minute_frame(6)])
+        source = DucklakeDataSet(
+            pair=PAIR,
+            resolution=60,
+            repository=repository,
+            exchange="binance",
+            start=datetime(2024, 1, 1).date(),
+            end=datetime(2024, 1, 1).date(),
+        )
+
+        bars = self._drain(ResampledDataSet(source=source, resolution=300, batch_size=2))
+
+        assert [(bar.timestamp, bar.open, bar.close) for bar in bars] == [
+            (datetime(2024, 1, 1, 0, 0), 100, 109),
+            (datetime(2024, 1, 1, 0, 5), 105, 110),
+        ]
+
+    def test_rejects_incompatible_resolution(self):
+        source = PolarsDataSet(pair=PAIR, resolution=60, data=self._minute_frame(2))
+        with pytest.raises(ValueError):
+            ResampledDataSet(source=source, resolution=90)
+        with pytest.raises(ValueError):
+            ResampledDataSet(source=source, resolution=60)
+
+
+    def test_seek_starts_at_next_complete_bucket(self):
+        source = PolarsDataSet(pair=PAIR, resolution=60, data=self._minute_frame(15))
+        dataset = ResampledDataSet(source=source, resolution=300)
+        dataset.next_data()
+
+        dataset.seek(datetime(2024, 1, 1, 0, 3))
+
+        bars = self._drain(dataset)
+        assert [bar.timestamp for bar in bars] == [datetime(2024, 1, 1, 0, 5), datetime(2024, 1, 1, 0, 10)]
+        assert bars[0].open == 105
+
+    def test_slice_keeps_whole_buckets(self):
+        source = PolarsDataSet(pair=PAIR, resolution=60, data=self._minute_frame(20))
+        dataset = ResampledDataSet(source=source, resolution=300)
+
+        sliced = dataset.slice(datetime(2024, 1, 1, 0, 1), datetime(2024, 1, 1, 0, 12))
+
+        bars = self._drain(sliced)
+        assert [bar.timestamp for bar in bars] == [datetime(2024, 1, 1, 0, 5), datetime(2024, 1, 1, 0, 10)]
+        assert bars[1].volume == 50
+
+
+class TestMultiPairDataSet:
+    BTC = Pair(base=Currency("BTC"), quote=Currency("USDT"))
+    ETH = Pair(base=Currency("ETH"), quote=Currency("USDT"))
+
+    def _dataset(self, pair: Pair, days: list[int], price: int) -> PolarsDataSet:
+        data = pl.from_pandas(_ohlcv_frame(len(days))).with_columns(
+            pl.Series("time", [datetime(2024, 1, 1) + timedelta(days=d) for d in days]),
+            pl.lit(price).alias("close"),
+            pl.lit(price).alias("open"),
+            pl.lit(price + 10).alias("high"),
+            pl.lit(price - 10).alias("low"),
+        )
+        return PolarsDataSet(pair=pair, resolution=RESOLUTION, data=data)
+
+    def _datasets(self) -> list[PolarsDataSet]:
+        return [self._dataset(self.BTC, [0, 1, 3], 200), self._dataset(self.ETH, [1, 2, 3], 50)]
+
+    def _drain(self, dataset: MultiPairDataSet) -> list:
+        bundles = []
+        while dataset.has_data():
+            bundles.append(dataset.next_data())
+        return bundles
+
+    def test_marks_missing_bars(self):
+        bundles = self._drain(MultiPairDataSet(self._datasets(), policy=MissingBarPolicy.mark))
+
+        assert [bundle.timestamp.day for bundle in bundles] == [1, 2, 3, 4]
+        assert bundles[0].missing() == [self.ETH]
+        assert bundles[0][self.BTC].close == 200
+        assert bundles[1][self.ETH].close == 50
+        assert bundles[2][self.BTC] is None
+        assert bundles[3].missing() == []
+
+    def test_skips_incomplete_timestamps(self):
+        bundles = self._drain(MultiPairDataSet(self._datasets(), policy=MissingBarPolicy.skip))
+        assert [bundle.timestamp.day for bundle in bundles] == [2, 4]
+
+    def test_forward_fills_missing_bars(self):
+        bundles = self._drain(MultiPairDataSet(self._datasets(), policy=MissingBarPolicy.forward_fill))
+
+        assert bundles[0][self.ETH] is None
+        filled = bundles[2][self.BTC]
+        assert filled.timestamp == datetime(2024, 1, 3)
+        assert (filled.open, filled.high, filled.low, filled.close) == (200, 200, 200, 200)
+        assert filled.volume == filled.quote_volume == 0
+
+    def test_rejects_duplicated_pairs(self):
+        with pytest.raises(ValueError):
+            MultiPairDataSet([self._dataset(self.BTC, [0], 1), self._dataset(self.BTC, [1], 1)])
+
+
+class TestLookbackWindow:
+    def _dataset(self, candles: int, lookback: int) -> PolarsDataSet:
+        data = pl.from_pandas(_ohlcv_frame(candles)).with_columns(
+            pl.int_range(100, 100 + candles).alias("close"),
+            pl.lit(100 + candles).alias("high"),
+        )
+        return PolarsDataSet(pair=PAIR, resolution=RESOLUTION, data=data, lookback=lookback)
+
+    def test_keeps_last_bars(self):
+        dataset = self._dataset(10, lookback=4)
+        for _ in range(6):
+            dataset.next_data()
+
+        window = dataset.window
+        assert len(window) == 4
+        assert window.close().tolist() == [102, 103, 104, 105]
+        assert window.close(2).tolist() == [104, 105]
+        assert window.time(1)[0] == np.datetime64(datetime(2024, 1, 6))
+        assert window.values("quote_decimals", 1).tolist() == [0]
+
+    def test_views_do_not_copy(self):
+        dataset = self._dataset(10, lookback=3)
+        for _ in range(5):
+            dataset.next_data()
+
+        closes = dataset.window.close()
+        assert closes.flags.c_contiguous
+        assert not closes.flags.owndata
+
+    def test_partially_filled_window(self):
+        dataset = self._dataset(10, lookback=5)
+        dataset.next_data()
+        dataset.next_data()
+        assert dataset.window.close().tolist() == [100, 101]
+        with pytest.raises(ValueError):
+            dataset.window.close(3)
+
+    def test_iter_batches_fills_window(self):
+        dataset = self._dataset(10, lookback=3)
+        list(dataset.iter_batches(4))
+        assert dataset.window.close().tolist() == [107, 108, 109]
+
+    def test_append_ohlcv(self):
+        window = LookbackWindow(2)
+        for day in range(3):
+            window.append(
+                OHLCV(
+                    pair=PAIR,
+                    resolution=RESOLUTION,
+                    base_decimals=0,
+                    quote_decimals=0,
+                    timestamp=datetime(2024, 1, 1 + day, tzinfo=timezone.utc),
+                    open=1,
+                    high=10,
+                    low=1,
+                    close=day + 1,
+                )
+            )
+        assert window.close().tolist() == [2, 3]
+        assert window.time().tolist() == [datetime(2024, 1, 2), datetime(2024, 1, 3)]
+
+    def test_window_requires_lookback(self):
+        dataset = self._dataset(1, lookback=0)
+        with pytest.raises(ValueError, match="without lookback"):
+            _ = dataset.window
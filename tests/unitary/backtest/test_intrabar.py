@@ -0,0 +1,125 @@
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import bafrapy.backtest.base as base
+import bafrapy.backtest.dataset as dataset
+
+from bafrapy.backtest.dataset.columns import OHLCVColumns
+from bafrapy.backtest.intrabar import (
+    NearestExtremePath,
+    OHLCPath,
+    OLHCPath,
+    SubBarPath,
+    touch_times,
+)
+from bafrapy.backtest.money import OHLCV, Currency, Pair
+
+PAIR = Pair(base=Currency("BTC"), quote=Currency("USD"))
+
+
+def _ohlcv(open: int, high: int, low: int, close: int, minutes: int = 0, resolution: int = 3600) -> OHLCV:
+    return OHLCV(
+        pair=PAIR,
+        resolution=resolution,
+        base_decimals=0,
+        quote_decimals=0,
+        timestamp=datetime(2024, 1, 1) + timedelta(minutes=minutes),
+        open=open,
+        high=high,
+        low=low,
+        close=close,
+    )
+
+
+class TestTouchTimes:
+    def test_distance_along_the_path(self):
+        times = touch_times(
+            [10, 16, 7, 12],
+            [15, 8, 10, 12, 17, 6, 11],
+            [False, True, True, False, False, True, True],
+        )
+
+        np.testing.assert_array_equal(times, [5, 14, 0, 2, np.inf, np.inf, 0])
+
+    def test_price_reached_on_the_way_back(self):
+        # Going up to 8 only happens after the low, on the way to the close.
+        assert touch_times([5, 6, 2, 9], [8], [False])[0] == 1 + 4 + 6
+
+
+class TestPaths:
+    def test_fixed_routes(self):
+        bar = _ohlcv(10, 16, 7, 12)
+
+        np.testing.assert_array_equal(OHLCPath().waypoints(bar), [10, 16, 7, 12])
+        np.testing.assert_array_equal(OLHCPath().waypoints(bar), [10, 7, 16, 12])
+
+    @pytest.mark.parametrize(
+        "bar, waypoints",
+        [
+            ((10, 11, 5, 6), [10, 11, 5, 6]),
+            ((10, 15, 9, 12), [10, 9, 15, 12]),
+            ((10, 13, 7, 12), [10, 7, 13, 12]),
+        ],
+    )
+    def test_nearest_extreme_goes_to_the_low_on_ties(self, bar, waypoints):
+        np.testing.assert_array_equal(NearestExtremePath().waypoints(_ohlcv(*bar)), waypoints)
+
+    def test_routes_are_vectorized(self):
+        route = NearestExtremePath().route(np.array([10, 10]), np.array([11, 15]), np.array([5, 9]), np.array([6, 12]))
+
+        np.testing.assert_array_equal(route, [[10, 11, 5, 6], [10, 9, 15, 12]])
+
+    def test_sub_bars(self):
+        sub_bars = OHLCVColumns.from_ohlcv(
+            [
+                _ohlcv(10, 11, 9, 9, minutes=0, resolution=1800),
+                _ohlcv(9, 9, 7, 8, minutes=30, resolution=1800),
+                _ohlcv(8, 16, 8, 12, minutes=60, resolution=1800),
+            ]
+        )
+        path = SubBarPath(sub_bars)
+
+        # The hourly candle only spans the first two sub-bars, not the high of the third.
+        np.testing.assert_array_equal(path.waypoints(_ohlcv(10, 11, 7, 8)), [10, 9, 11, 9, 9, 9, 7, 8])
+        # Without sub-bars the candle is routed on its own.
+        np.testing.assert_array_equal(path.waypoints(_ohlcv(10, 16, 7, 12, minutes=120)), [10, 7, 16, 12])
+
+
+class TestBrokerFillOrder:
+    def _broker(self, path) -> base.VBroker:
+        candles = [(10, 10, 10, 10), (10, 10, 9, 10), (10, 10, 10, 10), (10, 16, 7, 12)]
+        open, high, low, close = (list(column) for column in zip(*candles))
+        df = pd.DataFrame(
+            {
+                "time": [datetime(2024, 1, 1) + timedelta(days=x) for x in range(len(candles))],
+                "resolution": 86400,
+                "open": open,
+                "high": high,
+                "low": low,
+                "close": close,
+                "volume": 1000,
+                "quote_volume": 0,
+                "base_decimals": 0,
+                "quote_decimals": 0,
+            }
+        )
+        data = dataset.PandasDataSet(pair=PAIR, resolution=86400, data=df)
+        config = base.VBrokerConfig(initial_money=1000, data=data, intrabar_path=path)
+        vbroker = base.VBroker(config)
+        vbroker.add_limit_order(base.Side.buy, 2, 10, take_profit=Decimal(15), stop_loss=Decimal(8))
+        for _ in candles[1:]:
+            vbroker.next_data()
+        return vbroker
+
+    @pytest.mark.parametrize("path, price", [(None, 15), (OHLCPath(), 15), (OLHCPath(), 8), (NearestExtremePath(), 8)])
+    def test_bracket_exit_follows_the_path(self, path, price):
+        vbroker = self._broker(path)
+
+        assert len(vbroker.trades) == 2
+        assert vbroker.trades[1].executed_price == price
+        assert vbroker.pending_orders == {}
+        assert vbroker.open_position is None
@@ -1,7 +1,27 @@
 from datetime import datetime
 
+import pytest
+
 import bafrapy.backtest.base as base
-import bafrapy.backtest.dataset as dataset
+
+from bafrapy.backtest.money import OHLCV, Currency, Pair
+
+PAIR = Pair(base=Currency("BTC"), quote=Currency("USD"))
+
+
+def _ohlcv(timestamp: datetime, open: int, high: int, low: int, close: int, volume: int) -> OHLCV:
+    return OHLCV(
+        pair=PAIR,
+        resolution=86400,
+        base_decimals=0,
+        quote_decimals=0,
+        timestamp=timestamp,
+        open=open,
+        high=high,
+        low=low,
+        close=close,
+        volume=volume,
+    )
 
 
 class TestOrder:
@@ -15,7 +35,7 @@ class TestOrder:
 
     def test_execute_market_order(self):
         order = base.MarketOrder(1, datetime(2024, 1, 1), base.Side.buy, 100)
-        ohlcv = dataset.OHLCV(datetime(2024, 1, 2), 1, 1, 1, 1, 0)
+        ohlcv = _ohlcv(datetime(2024, 1, 2), 1, 1, 1, 1, 0)
         trade = order.execute(ohlcv).trade
         assert trade is not None
         assert order.state == base.OrderState.executed
@@ -24,7 +44,7 @@ class TestOrder:
 
     def test_trade_market_order(self):
         order = base.MarketOrder(1, datetime(2024, 1, 1), base.Side.buy, 100)
-        ohlcv = dataset.OHLCV(datetime(2024, 1, 2), 1, 1, 1, 1, 0)
+        ohlcv = _ohlcv(datetime(2024, 1, 2), 1, 1, 1, 1, 0)
         trade = order.execute(ohlcv).trade
         assert trade.order is order
         assert trade.quantity == 100
@@ -42,7 +62,7 @@ class TestOrder:
 
     def test_execute_buy_limit_order_under_price(self):
         order = base.LimitOrder(1, datetime(2024, 1, 1), base.Side.buy, 100, 5)
-        ohlcv = dataset.OHLCV(datetime(2024, 1, 2), 1, 1, 1, 1, 0)
+        ohlcv = _ohlcv(datetime(2024, 1, 2), 1, 1, 1, 1, 0)
         result = order.execute(ohlcv)
         assert result is not None
         assert result.is_trade()
@@ -53,7 +73,46 @@ class TestOrder:
 
     def test_not_execute_buy_limit_order_over_price(self):
         order = base.LimitOrder(1, datetime(2024, 1, 1), base.Side.buy, 100, 5)
-        ohlcv = dataset.OHLCV(datetime(2024, 1, 10), 10, 10, 10, 10, 0)
+        ohlcv = _ohlcv(datetime(2024, 1, 10), 10, 10, 10, 10, 0)
         result = order.execute(ohlcv)
         assert result is None
         assert order.state == base.OrderState.pending
+
+    def test_buy_stop_order_executes_at_stop_price(self):
+        order = base.StopOrder(1, datetime(2024, 1, 1), base.Side.buy, 2, 10)
+        assert order.process(_ohlcv(datetime(2024, 1, 2), 8, 9, 7, 8, 0)) is None
+
+        trade = order.execute(_ohlcv(datetime(2024, 1, 3), 8, 12, 7, 11, 0)).trade
+
+        assert trade.executed_price == 10
+        assert trade.quantity == 2
+        assert order.state == base.OrderState.executed
+
+    def test_sell_stop_order_gapping_down_executes_at_open(self):
+        order = base.StopOrder(1, datetime(2024, 1, 1), base.Side.sell, 2, 10)
+
+        trade = order.execute(_ohlcv(datetime(2024, 1, 2), 8, 9, 7, 8, 0)).trade
+
+        assert trade.executed_price == 8
+
+    def test_stop_limit_order_opens_limit_order(self):
+        order = base.StopLimitOrder(1, datetime(2024, 1, 1), base.Side.buy, 2, 10, 11)
+
+        result = order.process(_ohlcv(datetime(2024, 1, 2), 9, 10, 9, 10, 0))
+
+        assert result.is_order()
+        assert isinstance(result.order, base.LimitOrder)
+        assert (result.order.side, result.order.quantity, result.order.price) == (
+            base.Side.buy,
+            2,
+            11,
+        )
+        assert order.state == base.OrderState.executed
+
+    def test_limit_order_rejects_inverted_bracket(self):
+        with pytest.raises(ValueError):
+            base.LimitOrder(
+                1, datetime(2024, 1, 1), base.Side.buy, 1, 10, take_profit=9
+            )
+        with pytest.raises(ValueError):
+            base.LimitOrder(1, datetime(2024, 1, 1), base.Side.sell, 1, 10, stop_loss=9)
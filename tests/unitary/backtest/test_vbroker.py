@@ -1,10 +1,13 @@
 from datetime import datetime, timedelta
+from decimal import Decimal
 
 import pandas as pd
 
 import bafrapy.backtest.base as base
 import bafrapy.backtest.dataset as dataset
 
+from bafrapy.backtest.money import OHLCV, Currency, Pair
+
 
 class TestVBroker:
     def setup_method(self):
@@ -15,16 +18,21 @@ class TestVBroker:
         dates = [start_date + timedelta(days=x) for x in range(candles)]
         df = pd.DataFrame(
             {
-                "Date": dates,
-                "Open": [1] * candles,
-                "High": [1] * candles,
-                "Low": [1] * candles,
-                "Close": [1] * candles,
-                "Volume": [1000] * candles,
+                "time": dates,
+                "resolution": [86400] * candles,
+                "open": [1] * candles,
+                "high": [1] * candles,
+                "low": [1] * candles,
+                "close": [1] * candles,
+                "volume": [1000] * candles,
+                "quote_volume": [0] * candles,
+                "base_decimals": [0] * candles,
+                "quote_decimals": [0] * candles,
             }
         )
-        df["Date"] = pd.to_datetime(df["Date"])
-        self.dataset = dataset.DataSetPandas(86400, data=df)
+        df["time"] = pd.to_datetime(df["time"])
+        pair = Pair(base=Currency("BTC"), quote=Currency("USD"))
+        self.dataset = dataset.PandasDataSet(pair=pair, resolution=86400, data=df)
 
     def test_basic_setup(self):
         config = base.VBrokerConfig(
@@ -70,3 +78,254 @@ class TestVBroker:
         assert len(vbroker.created_orders) == 0
         assert vbroker.available_money == 900
         assert vbroker.available_quote == 100
+
+    def test_limit_orders_out_of_range_are_not_processed(self, monkeypatch):
+        config = base.VBrokerConfig(
+            initial_money=1000, initial_quote=1000, fee=0, data=self.dataset
+        )
+        vbroker = base.VBroker(config)
+        far_buy = vbroker.add_limit_order(base.Side.buy, 1, 0)
+        far_sell = vbroker.add_limit_order(base.Side.sell, 1, 5)
+        processed = []
+        original = base.LimitOrder.process
+        monkeypatch.setattr(
+            base.LimitOrder,
+            "process",
+            lambda order, ohlcv: processed.append(order) or original(order, ohlcv),
+        )
+
+        vbroker.next_data()
+        vbroker.next_data()
+
+        assert processed == []
+        assert list(vbroker.pending_orders.values()) == [far_buy, far_sell]
+        assert len(vbroker.order_book) == 2
+
+    def test_limit_order_in_range_is_filled(self):
+        config = base.VBrokerConfig(
+            initial_money=1000, initial_quote=1000, fee=0, data=self.dataset
+        )
+        vbroker = base.VBroker(config)
+        resting = vbroker.add_limit_order(base.Side.buy, 4, 0)
+        sell = vbroker.add_limit_order(base.Side.sell, 2, 1)
+
+        vbroker.next_data()
+
+        assert [trade.order for trade in vbroker.trades] == [sell]
+        assert list(vbroker.pending_orders.values()) == [resting]
+        assert len(vbroker.order_book) == 1
+
+    def _broker(self, lows: list[int]) -> base.VBroker:
+        self.setUpFixedDataset(len(lows))
+        self.dataset.data["low"] = lows
+        self.dataset = dataset.PandasDataSet(
+            pair=self.dataset.pair, resolution=86400, data=self.dataset.data
+        )
+        config = base.VBrokerConfig(
+            initial_money=1000, initial_quote=0, fee=0, data=self.dataset
+        )
+        vbroker = base.VBroker(config)
+        vbroker.add_limit_order(base.Side.buy, 1, 0)
+        return vbroker
+
+    def test_fast_forward_fills_like_stepping(self):
+        lows = [1] * 50 + [0] + [1] * 10
+        stepped = self._broker(lows)
+        while stepped.next_data() is not None and not stepped.trades:
+            pass
+        forwarded = self._broker(lows)
+
+        data = forwarded.fast_forward()
+
+        assert data == stepped.current_data()
+        assert data.timestamp == datetime(2024, 1, 1) + timedelta(days=50)
+        assert [t.executed_time for t in forwarded.trades] == [
+            t.executed_time for t in stepped.trades
+        ]
+        assert forwarded._last_ohlcv == stepped._last_ohlcv
+
+    def test_fast_forward_stops_at_until(self):
+        vbroker = self._broker([1] * 20)
+
+        data = vbroker.fast_forward(until=datetime(2024, 1, 8))
+
+        assert data.timestamp == datetime(2024, 1, 8)
+        assert vbroker.trades == []
+        assert vbroker.fast_forward() is None
+
+    def test_fast_forward_steps_with_market_orders(self):
+        vbroker = self._broker([1] * 20)
+        vbroker.add_market_order(base.Side.buy, 1)
+
+        assert vbroker.fast_forward().timestamp == datetime(2024, 1, 2)
+
+
+    def test_fast_forward_steps_without_orders(self):
+        self.setUpFixedDataset(20)
+        config = base.VBrokerConfig(
+            initial_money=1000, initial_quote=0, fee=0, data=self.dataset
+        )
+        vbroker = base.VBroker(config)
+
+        assert vbroker.fast_forward().timestamp == datetime(2024, 1, 2)
+        assert vbroker.fast_forward(until=datetime(2024, 1, 8)).timestamp == datetime(
+            2024, 1, 8
+        )
+
+class TestPendingOrderBook:
+    def _ohlcv(self, low: int, high: int) -> OHLCV:
+        return OHLCV(
+            pair=Pair(base=Currency("BTC"), quote=Currency("USD")),
+            resolution=86400,
+            base_decimals=0,
+            quote_decimals=0,
+            timestamp=datetime(2024, 1, 1),
+            open=low,
+            high=high,
+            low=low,
+            close=low,
+        )
+
+    def test_only_pops_orders_inside_the_candle(self):
+        book = base.PendingOrderBook()
+        time = datetime(2024, 1, 1)
+        orders = [
+            base.LimitOrder(i, time, side, 1, price)
+            for i, (side, price) in enumerate(
+                [(base.Side.buy, 8), (base.Side.buy, 11), (base.Side.sell, 14), (base.Side.sell, 16)]
+            )
+        ]
+        market = base.MarketOrder(4, time, base.Side.buy, 1)
+        for order in [*orders, market]:
+            book.add(order)
+
+        triggered = book.triggered(self._ohlcv(10, 15))
+
+        assert [order for _, order in triggered] == [orders[1], orders[2], market]
+
+    def test_given_back_and_discarded_orders(self):
+        book = base.PendingOrderBook()
+        order = base.LimitOrder(0, datetime(2024, 1, 1), base.Side.sell, 1, 5)
+        book.add(order)
+
+        [(sequence, popped)] = book.triggered(self._ohlcv(1, 5))
+        book.add(popped, sequence)
+        assert book.triggered(self._ohlcv(1, 5)) == [(sequence, order)]
+
+        book.add(order, sequence)
+        book.discard(order)
+        assert book.triggered(self._ohlcv(1, 5)) == []
+        assert len(book) == 0
+
+    def test_bounds_skip_discarded_orders(self):
+        book = base.PendingOrderBook()
+        time = datetime(2024, 1, 1)
+        best_buy = base.LimitOrder(0, time, base.Side.buy, 1, 9)
+        book.add(best_buy)
+        book.add(base.LimitOrder(1, time, base.Side.buy, 1, 7))
+        book.add(base.LimitOrder(2, time, base.Side.sell, 1, 12))
+
+        assert book.bounds() == (9, 12)
+        book.discard(best_buy)
+        assert book.bounds() == (7, 12)
+        assert book.only_indexed_orders()
+
+    def test_stops_are_indexed_on_the_opposite_side(self):
+        book = base.PendingOrderBook()
+        time = datetime(2024, 1, 1)
+        sell_stop = base.StopOrder(0, time, base.Side.sell, 1, 9)
+        buy_stop = base.StopOrder(1, time, base.Side.buy, 1, 12)
+        book.add(sell_stop)
+        book.add(buy_stop)
+
+        assert book.bounds() == (9, 12)
+        assert book.triggered(self._ohlcv(10, 11)) == []
+        assert [order for _, order in book.triggered(self._ohlcv(9, 11))] == [sell_stop]
+
+
+class TestTriggeredOrders:
+    def _broker(self, candles: list[tuple[int, int, int, int]]) -> base.VBroker:
+        open, high, low, close = (list(column) for column in zip(*candles))
+        df = pd.DataFrame(
+            {
+                "time": [datetime(2024, 1, 1) + timedelta(days=x) for x in range(len(candles))],
+                "resolution": 86400,
+                "open": open,
+                "high": high,
+                "low": low,
+                "close": close,
+                "volume": 1000,
+                "quote_volume": 0,
+                "base_decimals": 0,
+                "quote_decimals": 0,
+            }
+        )
+        data = dataset.PandasDataSet(
+            pair=Pair(base=Currency("BTC"), quote=Currency("USD")),
+            resolution=86400,
+            data=df,
+        )
+        config = base.VBrokerConfig(initial_money=1000, initial_quote=10, data=data)
+        return base.VBroker(config)
+
+    def test_stop_order_is_executed_when_triggered(self):
+        vbroker = self._broker([(10, 10, 10, 10), (10, 11, 9, 10), (10, 13, 10, 12)])
+        stop = vbroker.add_stop_order(base.Side.buy, 2, 12)
+
+        vbroker.next_data()
+        assert vbroker.trades == []
+        vbroker.next_data()
+
+        assert [trade.order for trade in vbroker.trades] == [stop]
+        assert vbroker.available_money == 976
+        assert vbroker.executed_orders == {stop.order_id: stop}
+
+    def test_stop_limit_child_is_pending_from_next_candle(self):
+        vbroker = self._broker([(10, 10, 10, 10), (10, 12, 10, 12), (12, 12, 11, 11)])
+        vbroker.add_stop_limit_order(base.Side.buy, 1, 12, 11)
+
+        vbroker.next_data()
+        [child] = vbroker.pending_orders.values()
+        assert isinstance(child, base.LimitOrder)
+        assert vbroker.trades == []
+
+        vbroker.next_data()
+
+        assert [trade.order for trade in vbroker.trades] == [child]
+        assert vbroker.trades[0].executed_price == 11
+
+    def test_bracket_stop_loss_cancels_take_profit(self):
+        vbroker = self._broker(
+            [(10, 10, 10, 10), (10, 10, 9, 10), (10, 11, 10, 11), (10, 10, 7, 8)]
+        )
+        entry = vbroker.add_limit_order(
+            base.Side.buy, 2, 10, take_profit=Decimal(15), stop_loss=Decimal(8)
+        )
+
+        vbroker.next_data()
+        take_profit, stop_loss = vbroker.pending_orders.values()
+        assert take_profit.parent is stop_loss.parent
+        assert (take_profit.side, take_profit.price) == (base.Side.sell, 15)
+        assert (stop_loss.side, stop_loss.stop_price) == (base.Side.sell, 8)
+
+        vbroker.next_data()
+        vbroker.next_data()
+
+        assert [trade.order for trade in vbroker.trades] == [entry, stop_loss]
+        assert vbroker.trades[1].executed_price == 8
+        assert take_profit.is_canceled()
+        assert vbroker.pending_orders == {}
+        assert len(vbroker.order_book) == 0
+        assert vbroker.open_position is None
+        assert vbroker.closed_positions[0].quantity == 0
+
+    def test_cancel_order(self):
+        vbroker = self._broker([(10, 10, 10, 10), (10, 13, 10, 12)])
+        stop = vbroker.add_stop_order(base.Side.buy, 1, 12)
+
+        assert vbroker.cancel_order(stop.order_id)
+        assert not vbroker.cancel_order(stop.order_id)
+        vbroker.next_data()
+
+        assert vbroker.trades == []
+        assert vbroker.canceled_orders == {stop.order_id: stop}